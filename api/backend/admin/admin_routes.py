@@ -1,9 +1,26 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
 from mysql.connector import Error
+from backend.background.chunked_sweeper import sweepers
+from backend.admin.review_queue import claim_pending, parse_claim_args
+from backend.admin.report_queue import report_queue
+from backend.admin.report_dedup import report_deduplicator
+from backend.throttle.sliding_window import report_throttle, throttles
+from backend.announcements.announcement_feeds import announcement_feeds
+from backend.cache.snapshots import JSONSnapshot
+from backend.compression.response_compression import response_compressor
+from backend.cache.table_versions import table_versions
+from backend.cache.query_cache import query_cache
+from backend.cache.profile_cache import profile_cache
+from backend.cache.shared_cache import shared_cache
+from backend.cache.reference_data import reference_data
 
 admin = Blueprint("admin", __name__)
 
+# Read-mostly tables served from memory; every write below refreshes its snapshot
+guidelines_snapshot = JSONSnapshot("guidelines", "SELECT * FROM community_guideline ORDER BY guideline_id")
+announcements_snapshot = JSONSnapshot("announcements", "SELECT * FROM announcement ORDER BY announcement_id")
+
 # Get all reports with optional filtering by status
 # Streamlit: Use requests.get('http://web-api:4000/reports') to get queue of reports
 #            Add ?status=pending for filtering
@@ -40,6 +57,62 @@ def get_all_reports():
         return jsonify({"error": str(e)}), 500
 
 
+# Claim a batch of pending reports for one admin to review
+# Streamlit: requests.post('http://web-api:4000/reports/claim', params={"n": 10, "admin_id": admin_id})
+#            Shows only reports leased to this admin, so two admins never review the same one
+@admin.route("/reports/claim", methods=["POST"])
+def claim_reports():
+    try:
+        try:
+            admin_id, n, lease_seconds = parse_claim_args(request, current_app.config)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        claimed = claim_pending(db.get_db(), "report", admin_id, n, lease_seconds)
+
+        current_app.logger.info(f'Admin {admin_id} claimed {len(claimed)} reports')
+        return jsonify(claimed), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in claim_reports: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# Get pending reports grouped by reported user, highest priority first
+# Streamlit: Use requests.get('http://web-api:4000/reports/queue?page=1&per_page=20')
+#            Priority grows with report count, recency and number of distinct reporters
+#            Display each reported user once with their report count
+@admin.route("/reports/queue", methods=["GET"])
+def get_report_queue():
+    try:
+        current_app.logger.info('Starting get_report_queue request')
+        page = request.args.get("page", 1, type=int)
+        per_page = request.args.get("per_page", 20, type=int)
+        if page < 1 or per_page < 1 or per_page > 100:
+            return jsonify({"error": "page must be >= 1 and per_page between 1 and 100"}), 400
+
+        total, groups = report_queue.page(page, per_page)
+
+        return jsonify({"page": page, "per_page": per_page, "total_groups": total, "groups": groups}), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_report_queue: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# Get clusters of recent near-duplicate reports (e.g. brigading)
+# Streamlit: Use requests.get('http://web-api:4000/reports/clusters')
+#            Add ?min_size=5 to only show larger clusters
+#            Display each cluster once with its report ids so they can be triaged together
+@admin.route("/reports/clusters", methods=["GET"])
+def get_report_clusters():
+    try:
+        min_size = request.args.get("min_size", 2, type=int)
+        clusters = report_deduplicator.clusters(min_size=max(min_size, 1))
+        return jsonify(clusters), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_report_clusters: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
 # Get specific report by ID
 # Streamlit: Use requests.get(f'http://web-api:4000/reports/{report_id}')
 #            Display report details for admin review
@@ -81,28 +154,52 @@ def create_report():
         for field in required_fields:
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
+
+        try:
+            reporter_id = int(data["reporter_id"])
+        except (TypeError, ValueError):
+            return jsonify({"error": "reporter_id must be an integer"}), 400
+
+        allowed, retry_after = report_throttle.check((data["reporter_type"], reporter_id))
+        if not allowed:
+            current_app.logger.warning(f'Throttled reports from {data["reporter_type"]} {data["reporter_id"]}')
+            return jsonify({"error": "Too many reports, try again later",
+                            "retry_after": retry_after}), 429, {"Retry-After": str(retry_after)}
         
         cursor = db.get_db().cursor()
-        
-        query = """
-        INSERT INTO report (reporter_id, reporter_type, reported_user_id, reported_user_type, reason, status, admin_id)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute(query, (
-            data["reporter_id"],
-            data["reporter_type"],
-            data["reported_user_id"],
-            data["reported_user_type"],
-            data["reason"],
-            data.get("status", "pending"),
-            data.get("admin_id")
-        ))
-        
-        db.get_db().commit()
-        new_report_id = cursor.lastrowid
+
+        def insert(cluster_id):
+            query = """
+            INSERT INTO report (reporter_id, reporter_type, reported_user_id, reported_user_type, reason, status, admin_id, cluster_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            cursor.execute(query, (
+                data["reporter_id"],
+                data["reporter_type"],
+                data["reported_user_id"],
+                data["reported_user_type"],
+                data["reason"],
+                data.get("status", "pending"),
+                data.get("admin_id"),
+                cluster_id
+            ))
+            report_id = cursor.lastrowid
+            if cluster_id is not None:
+                # The cluster's first report is its own cluster root
+                cursor.execute("UPDATE report SET cluster_id = report_id WHERE report_id = %s AND cluster_id IS NULL", (cluster_id,))
+            db.get_db().commit()
+            return report_id
+
+        # Near-duplicate of a recent report? Then it joins that report's cluster.
+        # Matching and indexing happen under one lock, around the insert
+        new_report_id, cluster_id = report_deduplicator.find_or_add(data["reason"], insert)
         cursor.close()
 
-        return jsonify({"message": "Report created successfully", "report_id": new_report_id}), 201
+        if data.get("status", "pending") == "pending":
+            report_queue.report_added(new_report_id, data["reporter_type"], data["reporter_id"],
+                                      data["reported_user_type"], data["reported_user_id"])
+
+        return jsonify({"message": "Report created successfully", "report_id": new_report_id, "cluster_id": cluster_id}), 201
 
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -121,7 +218,8 @@ def update_report(report_id):
 
         # Check if report exists
         cursor.execute("SELECT * FROM report WHERE report_id = %s", (report_id,))
-        if not cursor.fetchone():
+        existing = cursor.fetchone()
+        if not existing:
             return jsonify({"error": "Report not found"}), 404
 
         # Build dynamic update query
@@ -144,27 +242,30 @@ def update_report(report_id):
         db.get_db().commit()
         cursor.close()
 
+        # Keep the triage queue in step with pending/non-pending transitions
+        new_status = data.get("status", existing["status"])
+        if existing["status"] == "pending" and new_status != "pending":
+            report_queue.report_closed(report_id, existing["reported_user_type"], existing["reported_user_id"])
+        elif existing["status"] != "pending" and new_status == "pending":
+            report_queue.report_reopened(report_id, existing["reporter_type"], existing["reporter_id"],
+                                         existing["reported_user_type"], existing["reported_user_id"],
+                                         existing["date_reported"])
+
         return jsonify({"message": "Report updated successfully"}), 200
 
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
 
-# Get all community guidelines
+# Get all community guidelines (served from an in-memory, pre-compressed snapshot)
 # Streamlit: Use requests.get('http://web-api:4000/guidelines')
 #            Display guidelines list for users
+#            requests sends Accept-Encoding and decompresses automatically
 @admin.route("/guidelines", methods=["GET"])
 def get_all_guidelines():
     try:
         current_app.logger.info('Starting get_all_guidelines request')
-        cursor = db.get_db().cursor()
-        
-        cursor.execute("SELECT * FROM community_guideline")
-        guidelines = cursor.fetchall()
-        cursor.close()
-        
-        current_app.logger.info(f'Successfully retrieved {len(guidelines)} guidelines')
-        return jsonify(guidelines), 200
+        return guidelines_snapshot.response(request)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_guidelines: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -215,6 +316,7 @@ def create_guideline():
         db.get_db().commit()
         new_guideline_id = cursor.lastrowid
         cursor.close()
+        guidelines_snapshot.refresh()
 
         return jsonify({"message": "Guideline created successfully", "guideline_id": new_guideline_id}), 201
 
@@ -244,6 +346,7 @@ def update_guideline(guideline_id):
                       (data["guideline_text"], guideline_id))
         db.get_db().commit()
         cursor.close()
+        guidelines_snapshot.refresh()
 
         return jsonify({"message": "Guideline updated successfully"}), 200
 
@@ -266,37 +369,28 @@ def delete_guideline(guideline_id):
         cursor.execute("DELETE FROM community_guideline WHERE guideline_id = %s", (guideline_id,))
         db.get_db().commit()
         cursor.close()
+        guidelines_snapshot.refresh()
         
         return jsonify({"message": "Guideline deleted successfully"}), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
 
-# Get all announcements
+# Get all announcements (served from an in-memory, pre-compressed snapshot)
 # Streamlit: Use requests.get('http://web-api:4000/announcements')
+#            Add ?target_audience=students to filter
 #            Display announcements for all users
 @admin.route("/announcements", methods=["GET"])
 def get_all_announcements():
     try:
         current_app.logger.info('Starting get_all_announcements request')
-        cursor = db.get_db().cursor()
         
         # Optional filter by target audience
         target_audience = request.args.get("target_audience")
         
-        query = "SELECT * FROM announcement WHERE 1=1"
-        params = []
-        
         if target_audience:
-            query += " AND target_audience = %s"
-            params.append(target_audience)
-        
-        cursor.execute(query, params)
-        announcements = cursor.fetchall()
-        cursor.close()
-        
-        current_app.logger.info(f'Successfully retrieved {len(announcements)} announcements')
-        return jsonify(announcements), 200
+            return announcements_snapshot.response(request, "target_audience", target_audience)
+        return announcements_snapshot.response(request)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_announcements: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -352,6 +446,8 @@ def create_announcement():
         db.get_db().commit()
         new_announcement_id = cursor.lastrowid
         cursor.close()
+        announcements_snapshot.refresh()
+        announcement_feeds.announcement_added(data.get("target_audience", "all"))
 
         return jsonify({"message": "Announcement created successfully", "announcement_id": new_announcement_id}), 201
 
@@ -390,6 +486,9 @@ def update_announcement(announcement_id):
         cursor.execute(query, params)
         db.get_db().commit()
         cursor.close()
+        announcements_snapshot.refresh()
+        if "target_audience" in data:
+            announcement_feeds.invalidate()
 
         return jsonify({"message": "Announcement updated successfully"}), 200
 
@@ -411,6 +510,8 @@ def delete_announcement(announcement_id):
         cursor.execute("DELETE FROM announcement WHERE announcement_id = %s", (announcement_id,))
         db.get_db().commit()
         cursor.close()
+        announcements_snapshot.refresh()
+        announcement_feeds.invalidate()
         
         return jsonify({"message": "Announcement deleted successfully"}), 200
     except Error as e:
@@ -423,37 +524,113 @@ def delete_announcement(announcement_id):
 @admin.route("/admin/dashboard", methods=["GET"])
 def get_dashboard():
     try:
-        cursor = db.get_db().cursor()
-        
         # Get various metrics
-        metrics = {}
-        
-        # Count active students
-        cursor.execute("SELECT COUNT(*) as count FROM student")
-        metrics['total_students'] = cursor.fetchone()['count']
-        
-        # Count active alumni
-        cursor.execute("SELECT COUNT(*) as count FROM alumni")
-        metrics['total_alumni'] = cursor.fetchone()['count']
-        
-        # Count pending applications
-        cursor.execute("SELECT COUNT(*) as count FROM application WHERE status = 'pending'")
-        metrics['pending_applications'] = cursor.fetchone()['count']
-        
-        # Count pending reports
-        cursor.execute("SELECT COUNT(*) as count FROM report WHERE status = 'pending'")
-        metrics['pending_reports'] = cursor.fetchone()['count']
-        
-        # Count total connections
-        cursor.execute("SELECT COUNT(*) as count FROM connection")
-        metrics['total_connections'] = cursor.fetchone()['count']
-        
-        # Count active sessions
-        cursor.execute("SELECT COUNT(*) as count FROM session WHERE status = 'scheduled'")
-        metrics['active_sessions'] = cursor.fetchone()['count']
-        
-        cursor.close()
+        def load():
+            cursor = db.get_db().cursor()
+            counts = {}
+
+            # Count active students
+            cursor.execute("SELECT COUNT(*) as count FROM student")
+            counts['total_students'] = cursor.fetchone()['count']
+
+            # Count active alumni
+            cursor.execute("SELECT COUNT(*) as count FROM alumni")
+            counts['total_alumni'] = cursor.fetchone()['count']
+
+            # Count pending applications
+            cursor.execute("SELECT COUNT(*) as count FROM application WHERE status = 'pending'")
+            counts['pending_applications'] = cursor.fetchone()['count']
+
+            # Count pending reports
+            cursor.execute("SELECT COUNT(*) as count FROM report WHERE status = 'pending'")
+            counts['pending_reports'] = cursor.fetchone()['count']
+
+            # Count total connections
+            cursor.execute("SELECT COUNT(*) as count FROM connection")
+            counts['total_connections'] = cursor.fetchone()['count']
+
+            # Count active sessions
+            cursor.execute("SELECT COUNT(*) as count FROM session WHERE status = 'scheduled'")
+            counts['active_sessions'] = cursor.fetchone()['count']
+
+            cursor.close()
+            return counts
+
+        # Shared by every worker; any write to a counted table invalidates it
+        metrics = shared_cache.fetch(
+            "admin-dashboard",
+            ("student", "alumni", "application", "report", "connection", "session"),
+            load, ttl=60)
+
+        # Requests rejected by the in-process write throttles (since API start)
+        metrics['throttles'] = {name: throttle.stats() for name, throttle in throttles.items()}
+        # Conditional GETs answered with 304 vs full responses, and current table versions
+        metrics['table_versions'] = table_versions.stats()
         
         return jsonify(metrics), 200
     except Error as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+# Get background sweeper progress (in-process counters plus persisted checkpoints)
+# Streamlit: Use requests.get('http://web-api:4000/admin/sweepers')
+#            Display each sweeper's rows updated and last completed pass
+@admin.route("/admin/sweepers", methods=["GET"])
+def get_sweeper_metrics():
+    try:
+        cursor = db.get_db().cursor()
+
+        cursor.execute("SELECT * FROM sweeper_checkpoint")
+        checkpoints = {row['sweeper_name']: row for row in cursor.fetchall()}
+        cursor.close()
+
+        result = []
+        for name, sweeper in sweepers.items():
+            entry = {"name": name, "running": sweeper.is_running()}
+            entry.update(sweeper.metrics)
+            entry["checkpoint"] = checkpoints.get(name)
+            result.append(entry)
+
+        return jsonify(result), 200
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Get response compression stats per endpoint (since API start)
+# Streamlit: Use requests.get('http://web-api:4000/admin/compression')
+#            Display each endpoint's compression ratio and CPU seconds spent compressing
+@admin.route("/admin/compression", methods=["GET"])
+def get_compression_metrics():
+    return jsonify(response_compressor.stats()), 200
+
+
+# Get query result cache stats (since API start)
+# Streamlit: Use requests.get('http://web-api:4000/admin/query-cache')
+#            Display hit rate, bytes used and invalidations
+@admin.route("/admin/query-cache", methods=["GET"])
+def get_query_cache_metrics():
+    return jsonify(query_cache.stats()), 200
+
+
+# Get student/alumni profile cache hit rates (since API start)
+# Streamlit: Use requests.get('http://web-api:4000/admin/profile-cache')
+#            Display entries and hit rate per profile kind
+@admin.route("/admin/profile-cache", methods=["GET"])
+def get_profile_cache_metrics():
+    return jsonify(profile_cache.stats()), 200
+
+
+# Get cross-worker shared cache stats (hits/misses for this worker, size and evictions for the host)
+# Streamlit: Use requests.get('http://web-api:4000/admin/shared-cache')
+#            Display entries, bytes used and hit rate
+@admin.route("/admin/shared-cache", methods=["GET"])
+def get_shared_cache_metrics():
+    return jsonify(shared_cache.stats()), 200
+
+
+# Get reference data snapshot sizes and rebuild counts (since API start)
+# Streamlit: Use requests.get('http://web-api:4000/admin/reference-data')
+#            Display rows per reference table and how often each was rebuilt
+@admin.route("/admin/reference-data", methods=["GET"])
+def get_reference_data_metrics():
+    return jsonify(reference_data.stats()), 200
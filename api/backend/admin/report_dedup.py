@@ -0,0 +1,204 @@
+#------------------------------------------------------------
+# Near-duplicate detection for report reasons (MinHash + LSH)
+#------------------------------------------------------------
+import re
+import time
+import zlib
+import threading
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+from backend.db_connection import db
+
+# Mersenne prime 2^31 - 1 keeps (a * x + b) inside int64 for x < 2^31
+_PRIME = (1 << 31) - 1
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def shingle_hashes(text, k=4):
+    # Character k-grams of the normalized text, hashed to ints below _PRIME
+    text = _SPACES.sub(" ", _NON_WORD.sub(" ", text.lower())).strip()
+    if len(text) < k:
+        text = text.ljust(k)
+    grams = {text[i:i + k] for i in range(len(text) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode()) % _PRIME for g in grams), dtype=np.int64, count=len(grams))
+
+
+class ReportDeduplicator:
+    """
+    Clusters recent reports whose reasons are near-duplicates.
+
+    Each reason is reduced to a `bands * rows` MinHash signature (one
+    vectorized numpy expression over its shingles). Signatures are split
+    into bands and bucketed. Buckets point at clusters rather than reports,
+    so a brigade of hundreds of identical reasons still yields a single
+    candidate; the new report joins the candidate cluster whose latest
+    signature has estimated Jaccard similarity >= `threshold`.
+
+    Only reports from the last `window_hours` (and at most `max_entries`)
+    are indexed; older ones are evicted in arrival order, so memory stays
+    bounded. Clusters are named by their first report's id, which is also
+    stored in report.cluster_id.
+    """
+
+    def __init__(self, bands=16, rows=4, threshold=0.6, window_hours=24, max_entries=50000, seed=3200):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        self.window_seconds = window_hours * 3600
+        self.max_entries = max_entries
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=bands * rows, dtype=np.int64)
+        self._b = rng.integers(0, _PRIME, size=bands * rows, dtype=np.int64)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._entries = {}      # report_id -> (timestamp, bucket keys, cluster_id)
+        self._buckets = {}      # (band, band bytes) -> {cluster_id: member count}
+        self._arrivals = deque()
+        self._clusters = {}     # cluster_id -> {"members": deque, "signature": latest, ...}
+
+    def init_app(self, app):
+        self.threshold = float(app.config.get("REPORT_DUPLICATE_THRESHOLD", self.threshold))
+        self.window_seconds = float(app.config.get("REPORT_DUPLICATE_WINDOW_HOURS", 24)) * 3600
+
+    def signature(self, text):
+        hashes = shingle_hashes(text)
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _bucket_keys(self, signature):
+        bands = signature.reshape(self.bands, self.rows)
+        return [(i, bands[i].tobytes()) for i in range(self.bands)]
+
+    def _evict(self, now):
+        while self._arrivals and (
+            len(self._entries) > self.max_entries or self._arrivals[0][0] < now - self.window_seconds
+        ):
+            _, report_id = self._arrivals.popleft()
+            entry = self._entries.pop(report_id, None)
+            if entry is None:
+                continue
+            _, keys, cluster_id = entry
+            for key in keys:
+                bucket = self._buckets[key]
+                bucket[cluster_id] -= 1
+                if not bucket[cluster_id]:
+                    del bucket[cluster_id]
+                    if not bucket:
+                        del self._buckets[key]
+            # Members join and leave in arrival order, so this is the oldest one
+            cluster = self._clusters[cluster_id]
+            cluster["members"].popleft()
+            if not cluster["members"]:
+                del self._clusters[cluster_id]
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        conn = db.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT report_id, reason, date_reported, cluster_id FROM report "
+                "WHERE date_reported >= NOW() - INTERVAL %s SECOND ORDER BY report_id",
+                (int(self.window_seconds),)
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            conn.close()
+        for row in rows:
+            ts = row['date_reported'].timestamp() if isinstance(row['date_reported'], datetime) else time.time()
+            self._add(row['report_id'], row['reason'], ts, row['cluster_id'])
+        # Only now: a failed read leaves the index unloaded, to be retried on next use
+        self._loaded = True
+
+    def _match(self, signature, keys):
+        # Returns the best matching cluster id, or None
+        candidates = set()
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket:
+                candidates.update(bucket)
+        if not candidates:
+            return None
+        candidates = list(candidates)
+        stacked = np.stack([self._clusters[c]["signature"] for c in candidates])
+        similarity = (stacked == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        return candidates[best] if similarity[best] >= self.threshold else None
+
+    def _add(self, report_id, reason, ts, cluster_id=None, signature=None):
+        if signature is None:
+            signature = self.signature(reason)
+        keys = self._bucket_keys(signature)
+        if cluster_id is None:
+            cluster_id = self._match(signature, keys) or report_id
+
+        cluster = self._clusters.get(cluster_id)
+        if cluster is None:
+            cluster = self._clusters[cluster_id] = {
+                "cluster_id": cluster_id, "reason": reason, "members": deque(),
+                "first_seen": ts, "last_seen": ts,
+            }
+        cluster["members"].append(report_id)
+        cluster["signature"] = signature
+        cluster["last_seen"] = max(cluster["last_seen"], ts)
+
+        self._entries[report_id] = (ts, keys, cluster_id)
+        for key in keys:
+            bucket = self._buckets.setdefault(key, {})
+            bucket[cluster_id] = bucket.get(cluster_id, 0) + 1
+        self._arrivals.append((ts, report_id))
+        return cluster_id
+
+    def find_or_add(self, reason, insert):
+        """
+        Match a new report's reason to a cluster and index it, in one step
+        under the lock, so near-duplicates submitted together can't both
+        miss and start separate clusters.
+
+        insert(cluster_id) writes and commits the report, with cluster_id
+        the cluster (a report_id) it joins or None if it starts a new one,
+        and returns the new report_id. Returns (report_id, cluster_id). If
+        insert() raises, nothing is indexed.
+        """
+        signature = self.signature(reason)
+        with self._lock:
+            self._ensure_loaded()
+            now = time.time()
+            self._evict(now)
+            cluster_id = self._match(signature, self._bucket_keys(signature))
+            report_id = insert(cluster_id)
+            self._add(report_id, reason, now, cluster_id or report_id, signature)
+            return report_id, cluster_id
+
+    def add(self, report_id, reason, cluster_id=None, signature=None):
+        with self._lock:
+            self._ensure_loaded()
+            now = time.time()
+            self._evict(now)
+            return self._add(report_id, reason, now, cluster_id, signature)
+
+    def clusters(self, min_size=2):
+        with self._lock:
+            self._ensure_loaded()
+            self._evict(time.time())
+            result = [
+                {
+                    "cluster_id": c["cluster_id"],
+                    "size": len(c["members"]),
+                    "report_ids": list(c["members"]),
+                    "sample_reason": c["reason"],
+                    "first_seen": datetime.fromtimestamp(c["first_seen"]).strftime("%Y-%m-%d %H:%M:%S"),
+                    "last_seen": datetime.fromtimestamp(c["last_seen"]).strftime("%Y-%m-%d %H:%M:%S"),
+                }
+                for c in self._clusters.values() if len(c["members"]) >= min_size
+            ]
+        result.sort(key=lambda c: (-c["size"], c["cluster_id"]))
+        return result
+
+
+report_deduplicator = ReportDeduplicator()
@@ -0,0 +1,149 @@
+#------------------------------------------------------------
+# Pending reports grouped by reported user, kept in priority order
+#------------------------------------------------------------
+import math
+import bisect
+import threading
+import time
+from datetime import datetime
+
+from backend.db_connection import db
+
+
+class ReportQueue:
+    """
+    Priority-ordered groups of pending reports, one group per
+    (reported_user_type, reported_user_id).
+
+    A group's priority is  (1 + ln(distinct reporters)) * sum(exp(-age / tau))
+    over its reports, i.e. report count weighted by recency and boosted by
+    reporter diversity. Because every report decays at the same rate, the
+    order of groups never changes just because time passes, so the score is
+    stored in "forward decay" form (ages measured from a fixed epoch, kept in
+    log space) and the sorted list only changes when a report is added or
+    leaves the pending state.
+
+    Args:
+        decay_hours: tau, the recency time constant
+    """
+
+    def __init__(self, decay_hours=72):
+        self.decay_seconds = decay_hours * 3600
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._epoch = time.time()
+        self._groups = {}      # key -> {report_id: (timestamp, reporter)}
+        self._scores = {}      # key -> log-space priority
+        self._order = []       # sorted [(-score, key)], highest priority first
+
+    def init_app(self, app):
+        self.decay_seconds = float(app.config.get("REPORT_QUEUE_DECAY_HOURS", 72)) * 3600
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        conn = db.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT report_id, reporter_type, reporter_id, reported_user_type, reported_user_id, date_reported "
+                "FROM report WHERE status = 'pending'"
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            conn.close()
+
+        self._groups = {}
+        self._scores = {}
+        self._order = []
+        for row in rows:
+            key = (row['reported_user_type'], row['reported_user_id'])
+            self._groups.setdefault(key, {})[row['report_id']] = (
+                self._timestamp(row['date_reported']), (row['reporter_type'], row['reporter_id'])
+            )
+        for key in self._groups:
+            self._rescore(key)
+        self._loaded = True
+
+    @staticmethod
+    def _timestamp(value):
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return time.time()
+
+    def _rescore(self, key):
+        old = self._scores.pop(key, None)
+        if old is not None:
+            i = bisect.bisect_left(self._order, (-old, key))
+            del self._order[i]
+
+        reports = self._groups.get(key)
+        if not reports:
+            self._groups.pop(key, None)
+            return
+        # log(sum(exp(x))) computed stably
+        exponents = [(ts - self._epoch) / self.decay_seconds for ts, _ in reports.values()]
+        peak = max(exponents)
+        log_sum = peak + math.log(sum(math.exp(x - peak) for x in exponents))
+        diversity = 1 + math.log(len({reporter for _, reporter in reports.values()}))
+        score = log_sum + math.log(diversity)
+
+        self._scores[key] = score
+        bisect.insort(self._order, (-score, key))
+
+    def report_added(self, report_id, reporter_type, reporter_id, reported_user_type, reported_user_id):
+        with self._lock:
+            if not self._loaded:
+                return
+            key = (reported_user_type, int(reported_user_id))
+            self._groups.setdefault(key, {})[report_id] = (time.time(), (reporter_type, int(reporter_id)))
+            self._rescore(key)
+
+    def report_closed(self, report_id, reported_user_type, reported_user_id):
+        # The report is no longer pending (reviewed, solved, ...)
+        with self._lock:
+            if not self._loaded:
+                return
+            key = (reported_user_type, int(reported_user_id))
+            if report_id in self._groups.get(key, {}):
+                del self._groups[key][report_id]
+                self._rescore(key)
+
+    def report_reopened(self, report_id, reporter_type, reporter_id, reported_user_type, reported_user_id, date_reported):
+        with self._lock:
+            if not self._loaded:
+                return
+            key = (reported_user_type, int(reported_user_id))
+            self._groups.setdefault(key, {})[report_id] = (self._timestamp(date_reported), (reporter_type, int(reporter_id)))
+            self._rescore(key)
+
+    def page(self, page, per_page):
+        """Return (total_groups, groups) for one page, highest priority first."""
+        with self._lock:
+            self._ensure_loaded()
+            total = len(self._order)
+            window = self._order[(page - 1) * per_page: page * per_page]
+            now = time.time()
+            groups = []
+            for neg_score, key in window:
+                reports = self._groups[key]
+                timestamps = [ts for ts, _ in reports.values()]
+                groups.append({
+                    "reported_user_type": key[0],
+                    "reported_user_id": key[1],
+                    "report_count": len(reports),
+                    "distinct_reporters": len({reporter for _, reporter in reports.values()}),
+                    "latest_report": datetime.fromtimestamp(max(timestamps)).strftime("%Y-%m-%d %H:%M:%S"),
+                    "report_ids": sorted(reports),
+                    # Current (decayed) priority, comparable between groups at this moment
+                    "priority": round(math.exp(-neg_score - (now - self._epoch) / self.decay_seconds), 4),
+                })
+        return total, groups
+
+
+report_queue = ReportQueue()
@@ -0,0 +1,75 @@
+#------------------------------------------------------------
+# Lease-based claiming of pending review items (applications,
+# reports) so concurrent admins never work the same row
+#------------------------------------------------------------
+
+# table -> primary key column; names are fixed here, never taken from the request
+REVIEW_TABLES = {
+    "application": "application_id",
+    "report": "report_id",
+}
+
+
+def claim_pending(conn, table, admin_id, n, lease_seconds):
+    """
+    Lease up to `n` pending rows of `table` to `admin_id` and return them.
+
+    Rows already leased to this admin are returned again (and their lease
+    extended), so re-rendering a page is idempotent. Other admins' live
+    leases are skipped, and SKIP LOCKED means a reviewer never waits on
+    rows another reviewer is claiming at the same moment.
+    """
+    id_column = REVIEW_TABLES[table]
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"""
+            SELECT {id_column} FROM {table}
+            WHERE status = 'pending'
+              AND (claimed_by = %s OR claim_expires_at IS NULL OR claim_expires_at < NOW())
+            ORDER BY {id_column}
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (admin_id, n)
+        )
+        ids = [row[id_column] for row in cursor.fetchall()]
+        if ids:
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(
+                f"UPDATE {table} SET claimed_by = %s, claim_expires_at = NOW() + INTERVAL %s SECOND "
+                f"WHERE {id_column} IN ({placeholders})",
+                [admin_id, lease_seconds] + ids
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if not ids:
+        cursor.close()
+        return []
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(f"SELECT * FROM {table} WHERE {id_column} IN ({placeholders}) ORDER BY {id_column}", ids)
+    claimed = cursor.fetchall()
+    cursor.close()
+    return claimed
+
+
+def parse_claim_args(request, config):
+    # admin_id may come from the query string or a JSON body
+    data = request.get_json(silent=True) or {}
+    admin_id = request.args.get("admin_id", data.get("admin_id"))
+    n = request.args.get("n", data.get("n", 10))
+    lease_seconds = request.args.get("lease_seconds", data.get("lease_seconds", config.get("CLAIM_LEASE_SECONDS", 900)))
+    if admin_id is None:
+        raise ValueError("Missing required field: admin_id")
+    try:
+        admin_id, n, lease_seconds = int(admin_id), int(n), int(lease_seconds)
+    except (TypeError, ValueError):
+        raise ValueError("admin_id, n and lease_seconds must be integers")
+    if n < 1 or n > 100:
+        raise ValueError("n must be between 1 and 100")
+    if lease_seconds < 1:
+        raise ValueError("lease_seconds must be positive")
+    return admin_id, n, lease_seconds
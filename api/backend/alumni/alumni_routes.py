@@ -1,6 +1,12 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
 from mysql.connector import Error
+from backend.formats.columnar import rows_response
+from backend.cache.table_versions import conditional
+from backend.cache.profile_cache import profile_cache
+from backend.graph.mentorship_graph import mentorship_graph
+from datetime import timedelta
+from backend.students.connection_map import invalidate_all_connection_maps
 
 alumni = Blueprint("alumni", __name__)
 
@@ -8,7 +14,9 @@ alumni = Blueprint("alumni", __name__)
 # Streamlit: Use requests.get('http://web-api:4000/alumni') to get all alumni
 #            Add ?field=Technology for filtering
 #            Display in a table or dropdown for selection
+#            Add ?format=arrow or ?format=parquet (or an Accept header) for columnar output
 @alumni.route("/alumni", methods=["GET"])
+@conditional("alumni")
 def get_all_alumni():
     try:
         current_app.logger.info('Starting get_all_alumni request')
@@ -39,10 +47,11 @@ def get_all_alumni():
         current_app.logger.debug(f'Executing query: {query} with params: {params}')
         cursor.execute(query, params)
         alumni_list = cursor.fetchall()
+        description = cursor.description
         cursor.close()
         
         current_app.logger.info(f'Successfully retrieved {len(alumni_list)} alumni')
-        return jsonify(alumni_list), 200
+        return rows_response(alumni_list, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_alumni: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -53,25 +62,20 @@ def get_all_alumni():
 #            to get detailed info including bio, experience
 #            Display profile with company and location details
 @alumni.route("/alumni/<int:alumni_id>", methods=["GET"])
+@conditional("alumni", "company", "location")
 def get_alumni(alumni_id):
     try:
         current_app.logger.info('Starting get_alumni request')
-        cursor = db.get_db().cursor()
 
-        query = """
-            SELECT a.*, c.company_name, c.industry, l.city, l.state, l.country
-            FROM alumni a
-            LEFT JOIN company c ON a.company_id = c.company_id
-            LEFT JOIN location l ON a.location_id = l.location_id
-            WHERE a.alumni_id = %s
-        """
-        cursor.execute(query, (alumni_id,))
-        alumni = cursor.fetchone()
+        # Served from the profile cache when possible; company and location come from the reference snapshots
+        alumni = profile_cache.get("alumni", alumni_id)
+        if alumni is None:
+            cursor = db.get_db().cursor()
+            alumni = profile_cache.load(cursor, "alumni", alumni_id)
+            cursor.close()
 
         if not alumni:
             return jsonify({"error": "Alumni not found"}), 404
-        
-        cursor.close()
 
         current_app.logger.info("Successfully retrieved alumni")
         return jsonify(alumni), 200
@@ -160,6 +164,7 @@ def update_alumni(alumni_id):
         query = f"UPDATE alumni SET {', '.join(update_fields)} WHERE alumni_id = %s"
         cursor.execute(query, params)
         db.get_db().commit()
+        profile_cache.refresh(cursor, "alumni", alumni_id)
         cursor.close()
 
         return jsonify({"message": "Alumni updated successfully"}), 200
@@ -184,6 +189,10 @@ def delete_alumni(alumni_id):
         cursor.execute("DELETE FROM alumni WHERE alumni_id = %s", (alumni_id,))
         db.get_db().commit()
         cursor.close()
+        profile_cache.evict("alumni", alumni_id)
+        invalidate_all_connection_maps()
+        # Cascading delete removes connections the graph can't see individually
+        mentorship_graph.invalidate()
         
         return jsonify({"message": "Alumni deleted successfully"}), 200
     except Error as e:
@@ -206,13 +215,6 @@ def get_alumni_availability(alumni_id):
         schedule = cursor.fetchall()  # ← INDENT THIS
         cursor.close()  # ← INDENT THIS
 
-        # Convert timedelta objects to strings for JSON serialization
-        for slot in schedule:  # ← INDENT THIS
-            if 'start_time' in slot and slot['start_time'] is not None:  # ← INDENT THIS
-                slot['start_time'] = str(slot['start_time'])  # ← INDENT THIS
-            if 'end_time' in slot and slot['end_time'] is not None:  # ← INDENT THIS
-                slot['end_time'] = str(slot['end_time'])  # ← INDENT THIS
-
         return jsonify(schedule), 200  # ← INDENT THIS
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -256,6 +258,121 @@ def create_availability(alumni_id):
         return jsonify({"error": str(e)}), 500
 
 
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _parse_time(value):
+    # "HH:MM" or "HH:MM:SS" -> timedelta, the type pymysql uses for TIME columns
+    try:
+        parts = [int(p) for p in str(value).split(":")]
+    except ValueError:
+        raise ValueError(f"Invalid time: {value}")
+    if len(parts) == 2:
+        parts.append(0)
+    if len(parts) != 3:
+        raise ValueError(f"Invalid time: {value}")
+    hours, minutes, seconds = parts
+    if not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60):
+        raise ValueError(f"Invalid time: {value}")
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def _merge_intervals(slots):
+    # Sort each day's (start, end) pairs and fold overlapping or touching ones together
+    merged = []
+    for day in DAYS_OF_WEEK:
+        intervals = sorted((s, e) for d, s, e in slots if d == day)
+        for start, end in intervals:
+            if merged and merged[-1][0] == day and start <= merged[-1][2]:
+                merged[-1] = (day, merged[-1][1], max(merged[-1][2], end))
+            else:
+                merged.append((day, start, end))
+    return merged
+
+
+# Replace the whole weekly availability schedule in one request
+# Streamlit: requests.put(f'http://web-api:4000/alumni/{alumni_id}/availability', json={
+#                "slots": [{"day_of_week": "Monday", "start_time": "09:00", "end_time": "12:00"}, ...]
+#            })
+#            Overlapping slots on the same day are merged; returns the saved schedule
+@alumni.route("/alumni/<int:alumni_id>/availability", methods=["PUT"])
+def replace_availability(alumni_id):
+    try:
+        data = request.get_json()
+        slots = data.get("slots") if isinstance(data, dict) else data
+        if not isinstance(slots, list):
+            return jsonify({"error": "Request body must contain a list of slots"}), 400
+
+        requested = []
+        for slot in slots:
+            if not isinstance(slot, dict):
+                return jsonify({"error": "Each slot must be an object with day_of_week, start_time and end_time"}), 400
+            for field in ["day_of_week", "start_time", "end_time"]:
+                if field not in slot:
+                    return jsonify({"error": f"Missing required field: {field}"}), 400
+            if slot["day_of_week"] not in DAYS_OF_WEEK:
+                return jsonify({"error": f"Invalid day_of_week: {slot['day_of_week']}"}), 400
+            try:
+                start_time = _parse_time(slot["start_time"])
+                end_time = _parse_time(slot["end_time"])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            if start_time >= end_time:
+                return jsonify({"error": "end_time must be after start_time"}), 400
+            requested.append((slot["day_of_week"], start_time, end_time))
+
+        desired = set(_merge_intervals(requested))
+
+        conn = db.get_db()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT alumni_id FROM alumni WHERE alumni_id = %s", (alumni_id,))
+        if not cursor.fetchone():
+            return jsonify({"error": "Alumni not found"}), 404
+
+        # Lock this alumni's rows so two concurrent saves can't interleave
+        cursor.execute(
+            "SELECT schedule_id, day_of_week, start_time, end_time FROM availability_schedule WHERE alumni_id = %s FOR UPDATE",
+            (alumni_id,)
+        )
+        existing = {}
+        to_delete = []
+        for row in cursor.fetchall():
+            key = (row['day_of_week'], row['start_time'], row['end_time'])
+            if key in desired and key not in existing:
+                existing[key] = row['schedule_id']
+            else:
+                to_delete.append((row['schedule_id'],))
+        to_insert = [(alumni_id, day, str(start), str(end)) for day, start, end in desired if (day, start, end) not in existing]
+
+        try:
+            if to_delete:
+                cursor.executemany("DELETE FROM availability_schedule WHERE schedule_id = %s", to_delete)
+            if to_insert:
+                cursor.executemany(
+                    "INSERT INTO availability_schedule (alumni_id, day_of_week, start_time, end_time) VALUES (%s, %s, %s, %s)",
+                    to_insert
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        cursor.execute("SELECT * FROM availability_schedule WHERE alumni_id = %s", (alumni_id,))
+        schedule = cursor.fetchall()
+        cursor.close()
+
+        return jsonify({
+            "message": "Availability replaced successfully",
+            "inserted": len(to_insert),
+            "deleted": len(to_delete),
+            "schedule": schedule
+        }), 200
+
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
 # Update availability slots
 # Streamlit: requests.put(f'http://web-api:4000/alumni/{alumni_id}/availability/{schedule_id}', json=...)
 @alumni.route("/alumni/<int:alumni_id>/availability/<int:schedule_id>", methods=["PUT"])
@@ -1,6 +1,12 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
 from mysql.connector import Error
+from backend.formats.columnar import rows_response
+from backend.cache.table_versions import conditional
+from backend.cache.shared_cache import shared_cache
+from backend.cache.reference_data import reference_data
+from backend.analytics.grouped_stats import grouped_percentiles
+import math
 
 analytics = Blueprint("analytics", __name__)
 
@@ -8,17 +14,17 @@ analytics = Blueprint("analytics", __name__)
 # Streamlit: Use requests.get('http://web-api:4000/majors')
 #            Display list of majors for filtering or analysis
 @analytics.route("/majors", methods=["GET"])
+@conditional("major")
 def get_all_majors():
     try:
         current_app.logger.info('Starting get_all_majors request')
-        cursor = db.get_db().cursor()
-        
-        cursor.execute("SELECT * FROM major")
-        majors = cursor.fetchall()
-        cursor.close()
+
+        # Served from the in-memory reference snapshot, rebuilt only after a write
+        snapshot = reference_data.table("major")
+        majors, description = snapshot.all_rows(), snapshot.description
         
         current_app.logger.info(f'Successfully retrieved {len(majors)} majors')
-        return jsonify(majors), 200
+        return rows_response(majors, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_majors: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -28,17 +34,16 @@ def get_all_majors():
 # Streamlit: Use requests.get('http://web-api:4000/companies')
 #            Display list of companies for analysis
 @analytics.route("/companies", methods=["GET"])
+@conditional("company")
 def get_all_companies():
     try:
         current_app.logger.info('Starting get_all_companies request')
-        cursor = db.get_db().cursor()
-        
-        cursor.execute("SELECT * FROM company")
-        companies = cursor.fetchall()
-        cursor.close()
+
+        snapshot = reference_data.table("company")
+        companies, description = snapshot.all_rows(), snapshot.description
         
         current_app.logger.info(f'Successfully retrieved {len(companies)} companies')
-        return jsonify(companies), 200
+        return rows_response(companies, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_companies: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -49,10 +54,10 @@ def get_all_companies():
 #            Display geographic distribution with counts
 #            Create map visualization
 @analytics.route("/locations", methods=["GET"])
+@conditional("location", "student", "alumni")
 def get_all_locations():
     try:
         current_app.logger.info('Starting get_all_locations request')
-        cursor = db.get_db().cursor()
         
         query = """
             SELECT 
@@ -68,13 +73,19 @@ def get_all_locations():
             LEFT JOIN alumni a ON l.location_id = a.location_id
             GROUP BY l.location_id, l.city, l.state, l.country
         """
-        
-        cursor.execute(query)
-        locations = cursor.fetchall()
-        cursor.close()
+
+        def load():
+            cursor = db.get_db().cursor()
+            cursor.execute(query)
+            result = (cursor.fetchall(), cursor.description)
+            cursor.close()
+            return result
+
+        locations, description = shared_cache.fetch(
+            "locations", ("location", "student", "alumni"), load)
         
         current_app.logger.info(f'Successfully retrieved {len(locations)} locations')
-        return jsonify(locations), 200
+        return rows_response(locations, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_locations: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -147,10 +158,9 @@ def get_match_statistics():
 def get_top_mentors():
     try:
         current_app.logger.info('Starting get_top_mentors request')
-        cursor = db.get_db().cursor()
-        
+
         # Get optional limit parameter
-        limit = request.args.get("limit", 10)
+        limit = request.args.get("limit", 10, type=int)
         
         query = """
             SELECT 
@@ -170,13 +180,79 @@ def get_top_mentors():
             ORDER BY completed_sessions DESC, total_connections DESC
             LIMIT %s
         """
-        
-        cursor.execute(query, (limit,))
-        top_mentors = cursor.fetchall()
-        cursor.close()
+
+        def load():
+            cursor = db.get_db().cursor()
+            cursor.execute(query, (limit,))
+            result = (cursor.fetchall(), cursor.description)
+            cursor.close()
+            return result
+
+        # The aggregation scans every connection and session; share it across workers
+        top_mentors, description = shared_cache.fetch(
+            f"top-mentors:{limit}", ("alumni", "connection", "session"), load)
         
         current_app.logger.info(f'Successfully retrieved {len(top_mentors)} top mentors')
-        return jsonify(top_mentors), 200
+        return rows_response(top_mentors, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_top_mentors: {str(e)}')
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+# Get time-to-accept / time-to-reject percentiles from the connection event log
+# Streamlit: Use requests.get('http://web-api:4000/analytics/connections/latency')
+#            Add ?percentiles=50,90,99 to choose percentiles
+#            Display response times (in hours) per field, major and mentor
+@analytics.route("/analytics/connections/latency", methods=["GET"])
+def get_connection_latency():
+    try:
+        current_app.logger.info('Starting get_connection_latency request')
+        cursor = db.get_db().cursor()
+
+        try:
+            percentiles = [float(p) for p in request.args.get("percentiles", "50,90,99").split(",")]
+        except ValueError:
+            return jsonify({"error": "percentiles must be a comma-separated list of numbers"}), 400
+        if not percentiles or any(not math.isfinite(p) or p < 0 or p > 100 for p in percentiles):
+            return jsonify({"error": "percentiles must be between 0 and 100"}), 400
+
+        # One row per first response to a pending request; the request time is
+        # the connection's creation event, falling back to date_connected for
+        # connections created before the log existed
+        query = """
+            SELECT
+                e.new_status,
+                TIMESTAMPDIFF(SECOND, COALESCE(r.event_time, c.date_connected), e.event_time) / 3600 AS hours,
+                COALESCE(a.field, 'Unknown') AS field,
+                COALESCE(m.major_name, 'Unknown') AS major,
+                CONCAT(e.alumni_id, ': ', COALESCE(a.name, 'Unknown')) AS mentor
+            FROM connection_event e
+            LEFT JOIN connection_event r ON r.connection_id = e.connection_id AND r.old_status IS NULL
+            LEFT JOIN connection c ON c.connection_id = e.connection_id
+            LEFT JOIN alumni a ON a.alumni_id = e.alumni_id
+            LEFT JOIN student s ON s.student_id = e.student_id
+            LEFT JOIN major m ON m.major_id = s.major_id
+            WHERE e.old_status = 'pending' AND e.new_status IN ('accepted', 'rejected')
+        """
+        cursor.execute(query)
+        events = cursor.fetchall()
+        cursor.close()
+
+        events = [e for e in events if e['hours'] is not None]
+
+        latency = {}
+        for outcome, key in (("accepted", "time_to_accept"), ("rejected", "time_to_reject")):
+            rows = [e for e in events if e['new_status'] == outcome]
+            hours = [float(e['hours']) for e in rows]
+            latency[key] = {
+                "overall": grouped_percentiles(["all"] * len(rows), hours, percentiles),
+                "by_field": grouped_percentiles([e['field'] for e in rows], hours, percentiles),
+                "by_major": grouped_percentiles([e['major'] for e in rows], hours, percentiles),
+                "by_mentor": grouped_percentiles([e['mentor'] for e in rows], hours, percentiles),
+            }
+
+        current_app.logger.info(f'Successfully computed latency over {len(events)} connection events')
+        return jsonify({"unit": "hours", **latency}), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_connection_latency: {str(e)}')
+        return jsonify({"error": str(e)}), 500
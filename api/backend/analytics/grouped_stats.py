@@ -0,0 +1,55 @@
+#------------------------------------------------------------
+# Vectorized per-group statistics over flat query results
+#------------------------------------------------------------
+import numpy as np
+
+
+def grouped_percentiles(keys, values, percentiles):
+    """
+    Compute percentiles of `values` for every distinct key in one pass.
+
+    Rows are sorted once by (group, value); each group's percentile
+    positions are then computed as array offsets into the sorted values and
+    linearly interpolated, matching numpy.percentile's default method,
+    without a Python loop per group.
+
+    Args:
+        keys: sequence of group labels, one per value
+        values: sequence of numbers
+        percentiles: sequence of percentiles in [0, 100]
+
+    Returns:
+        list of dicts: {"group", "count", "mean", "p<N>" ...}, largest group first
+    """
+    if len(values) == 0:
+        return []
+
+    labels, codes = np.unique(np.asarray(keys, dtype=str), return_inverse=True)
+    values = np.asarray(values, dtype=float)
+
+    order = np.lexsort((values, codes))
+    codes = codes[order]
+    values = values[order]
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(values)])
+
+    q = np.asarray(percentiles, dtype=float) / 100.0
+    positions = starts[:, None] + q[None, :] * (counts[:, None] - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    weight = positions - lower
+    results = values[lower] * (1 - weight) + values[upper] * weight
+    means = np.add.reduceat(values, starts) / counts
+
+    groups = []
+    for i in np.argsort(-counts, kind="stable"):
+        group = {
+            "group": str(labels[codes[starts[i]]]),
+            "count": int(counts[i]),
+            "mean": round(float(means[i]), 1),
+        }
+        for p, value in zip(percentiles, results[i]):
+            group[f"p{p:g}"] = round(float(value), 1)
+        groups.append(group)
+    return groups
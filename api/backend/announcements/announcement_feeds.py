@@ -0,0 +1,118 @@
+#------------------------------------------------------------
+# Per-audience announcement feeds and per-user read cursors
+#------------------------------------------------------------
+import threading
+import time
+
+from backend.db_connection import db
+
+# Which target_audience values each role's feed is made of
+ROLE_AUDIENCES = {
+    "student": ("students", "all"),
+    "alumni": ("alumni", "all"),
+}
+
+
+def audiences_for(role):
+    return ROLE_AUDIENCES.get(role)
+
+
+class AnnouncementFeeds:
+    """
+    Announcement counts per target_audience, used to answer unread counts
+    in O(1). They are loaded with one GROUP BY and reloaded after any
+    change.
+
+    A user's read cursor (announcement_cursor) stores the (date_sent,
+    announcement_id) of the newest item they have read plus `read_count`,
+    how many items of their feed were at or before the cursor when it was
+    saved. New announcements always land after every cursor, so
+    unread = sum(totals of the role's audiences) - read_count.
+
+    Deleting or retargeting an announcement can change what lies behind a
+    cursor; those (rare) changes bump `version`, and a cursor whose
+    `counted_version` no longer matches recounts read_count with one
+    indexed range count before it is trusted again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = None
+        # Start-time based so cursors counted by an earlier process are rechecked
+        self.version = int(time.time() * 1000) % 2_000_000_000
+
+    def _ensure_loaded(self):
+        if self._totals is not None:
+            return
+        conn = db.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT target_audience, COUNT(*) AS count FROM announcement GROUP BY target_audience")
+            self._totals = {row['target_audience']: row['count'] for row in cursor.fetchall()}
+            cursor.close()
+        finally:
+            conn.close()
+
+    def total(self, role):
+        with self._lock:
+            self._ensure_loaded()
+            return sum(self._totals.get(audience, 0) for audience in ROLE_AUDIENCES[role])
+
+    def announcement_added(self, target_audience):
+        # Called after the insert commits. Adding 1 by hand could double-count
+        # the row if total() reloaded between the commit and this call, so the
+        # totals are just reloaded (one GROUP BY) on next use. Cursors stay
+        # valid: a new announcement never lands behind one, so no version bump
+        with self._lock:
+            self._totals = None
+
+    def invalidate(self):
+        # An announcement was deleted or moved between audiences
+        with self._lock:
+            self._totals = None
+            self.version += 1
+
+
+announcement_feeds = AnnouncementFeeds()
+
+
+def count_through(cursor, role, last_date, last_id):
+    # Feed items at or before (last_date, last_id); a range scan on idx_announcement_feed
+    audiences = ROLE_AUDIENCES[role]
+    cursor.execute(
+        """
+        SELECT COUNT(*) AS count FROM announcement
+        WHERE target_audience IN (%s, %s)
+          AND date_sent <= %s
+          AND (date_sent < %s OR announcement_id <= %s)
+        """,
+        (audiences[0], audiences[1], last_date, last_date, last_id)
+    )
+    return cursor.fetchone()['count']
+
+
+def load_cursor(cursor, role, user_id):
+    """
+    The user's read cursor, with read_count brought up to date if the feeds
+    changed underneath it. Returns None if the user has never read anything.
+    """
+    cursor.execute(
+        "SELECT * FROM announcement_cursor WHERE user_role = %s AND user_id = %s",
+        (role, user_id)
+    )
+    row = cursor.fetchone()
+    if row is None or row['counted_version'] == announcement_feeds.version:
+        return row
+    version = announcement_feeds.version
+    row['read_count'] = count_through(cursor, role, row['last_date_sent'], row['last_announcement_id'])
+    row['counted_version'] = version
+    cursor.execute(
+        "UPDATE announcement_cursor SET read_count = %s, counted_version = %s WHERE user_role = %s AND user_id = %s",
+        (row['read_count'], version, role, user_id)
+    )
+    return row
+
+
+def unread_count(role, cursor_row):
+    read = cursor_row['read_count'] if cursor_row else 0
+    return max(announcement_feeds.total(role) - read, 0)
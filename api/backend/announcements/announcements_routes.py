@@ -0,0 +1,149 @@
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request, current_app
+from backend.db_connection import db
+from backend.announcements.announcement_feeds import (
+    announcement_feeds, audiences_for, count_through, load_cursor, unread_count
+)
+from mysql.connector import Error
+
+announcements = Blueprint("announcements", __name__)
+
+
+def _parse_since(value):
+    # Accept ISO-8601 (what jsonify emits) / "YYYY-MM-DD HH:MM:SS", or the
+    # older HTTP date format clients may still have saved
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%a, %d %b %Y %H:%M:%S GMT")
+
+
+# Get a user's unseen announcements (their role's audience plus "all")
+# Streamlit: Use requests.get(f'http://web-api:4000/users/student/{student_id}/announcements')
+#            Without ?since= only items after the user's read cursor come back;
+#            pass ?since=<date_sent>&since_id=<announcement_id> to page further.
+#            Then mark them read with PUT .../announcements/cursor
+@announcements.route("/users/<role>/<int:user_id>/announcements", methods=["GET"])
+def get_user_announcements(role, user_id):
+    try:
+        current_app.logger.info('Starting get_user_announcements request')
+        audiences = audiences_for(role)
+        if audiences is None:
+            return jsonify({"error": "role must be 'student' or 'alumni'"}), 400
+        limit = min(max(request.args.get("limit", 50, type=int), 1), 200)
+
+        cursor = db.get_db().cursor()
+        read_cursor = load_cursor(cursor, role, user_id)
+
+        since = request.args.get("since")
+        if since:
+            try:
+                since_date = _parse_since(since)
+            except ValueError:
+                return jsonify({"error": "since must be a date/time"}), 400
+            since_id = request.args.get("since_id", 0, type=int)
+        elif read_cursor:
+            since_date, since_id = read_cursor['last_date_sent'], read_cursor['last_announcement_id']
+        else:
+            since_date, since_id = None, 0
+
+        # Range scan on idx_announcement_feed (target_audience, date_sent)
+        query = "SELECT * FROM announcement WHERE target_audience IN (%s, %s)"
+        params = list(audiences)
+        if since_date is not None:
+            query += " AND date_sent >= %s AND (date_sent > %s OR announcement_id > %s)"
+            params += [since_date, since_date, since_id]
+        query += " ORDER BY date_sent, announcement_id LIMIT %s"
+        params.append(limit)
+
+        cursor.execute(query, params)
+        items = cursor.fetchall()
+        db.get_db().commit()
+        cursor.close()
+
+        return jsonify({
+            "announcements": items,
+            "unread_count": unread_count(role, read_cursor),
+            "has_more": len(items) == limit,
+        }), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_user_announcements: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# Get a user's unread announcement count (cheap enough to poll on every page render)
+# Streamlit: Use requests.get(f'http://web-api:4000/users/alumni/{alumni_id}/announcements/unread-count')
+#            Display as a badge, e.g. st.metric("New Announcements", count)
+@announcements.route("/users/<role>/<int:user_id>/announcements/unread-count", methods=["GET"])
+def get_unread_count(role, user_id):
+    try:
+        if audiences_for(role) is None:
+            return jsonify({"error": "role must be 'student' or 'alumni'"}), 400
+
+        cursor = db.get_db().cursor()
+        read_cursor = load_cursor(cursor, role, user_id)
+        db.get_db().commit()
+        cursor.close()
+
+        return jsonify({"unread_count": unread_count(role, read_cursor)}), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_unread_count: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# Mark a user's announcements read up to and including one announcement
+# Streamlit: requests.put(f'http://web-api:4000/users/student/{student_id}/announcements/cursor', json={
+#                "announcement_id": newest_shown_id
+#            })
+#            The cursor never moves backwards.
+@announcements.route("/users/<role>/<int:user_id>/announcements/cursor", methods=["PUT"])
+def update_read_cursor(role, user_id):
+    try:
+        audiences = audiences_for(role)
+        if audiences is None:
+            return jsonify({"error": "role must be 'student' or 'alumni'"}), 400
+        data = request.get_json()
+        if not data or "announcement_id" not in data:
+            return jsonify({"error": "Missing required field: announcement_id"}), 400
+
+        cursor = db.get_db().cursor()
+        cursor.execute(
+            "SELECT announcement_id, date_sent, target_audience FROM announcement WHERE announcement_id = %s",
+            (data["announcement_id"],)
+        )
+        target = cursor.fetchone()
+        if not target or target['target_audience'] not in audiences:
+            return jsonify({"error": "Announcement not found"}), 404
+
+        cursor.execute(
+            "SELECT * FROM announcement_cursor WHERE user_role = %s AND user_id = %s FOR UPDATE",
+            (role, user_id)
+        )
+        current = cursor.fetchone()
+        if current and (current['last_date_sent'], current['last_announcement_id']) >= (target['date_sent'], target['announcement_id']):
+            db.get_db().commit()
+            cursor.close()
+            return jsonify({"message": "Cursor already past this announcement"}), 200
+
+        version = announcement_feeds.version
+        read_count = count_through(cursor, role, target['date_sent'], target['announcement_id'])
+        cursor.execute(
+            """
+            INSERT INTO announcement_cursor (user_role, user_id, last_date_sent, last_announcement_id, read_count, counted_version)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                last_date_sent = VALUES(last_date_sent),
+                last_announcement_id = VALUES(last_announcement_id),
+                read_count = VALUES(read_count),
+                counted_version = VALUES(counted_version)
+            """,
+            (role, user_id, target['date_sent'], target['announcement_id'], read_count, version)
+        )
+        db.get_db().commit()
+        cursor.close()
+
+        return jsonify({"message": "Read cursor updated", "read_count": read_count}), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in update_read_cursor: {str(e)}')
+        return jsonify({"error": str(e)}), 500
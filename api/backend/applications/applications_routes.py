@@ -1,9 +1,30 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
 from mysql.connector import Error
+from backend.admin.review_queue import claim_pending, parse_claim_args
 
 applications = Blueprint("applications", __name__)
 
+
+def _enriched_applications(cursor, application_ids):
+    # Applications joined with the student details the review page shows, in one query
+    if not application_ids:
+        return []
+    placeholders = ", ".join(["%s"] * len(application_ids))
+    cursor.execute(
+        f"""
+        SELECT ap.*, s.name as student_name, s.email as student_email,
+               s.graduation_year, s.profile_summary, m.major_name
+        FROM application ap
+        LEFT JOIN student s ON ap.student_id = s.student_id
+        LEFT JOIN major m ON s.major_id = m.major_id
+        WHERE ap.application_id IN ({placeholders})
+        ORDER BY ap.application_id
+        """,
+        application_ids
+    )
+    return cursor.fetchall()
+
 # Get all applications with optional filtering by status
 # Streamlit: Use requests.get('http://web-api:4000/applications') to get all applications
 #            Add ?status=pending for filtering
@@ -40,6 +61,31 @@ def get_all_applications():
         return jsonify({"error": str(e)}), 500
 
 
+# Claim a batch of pending applications for one admin to review
+# Streamlit: requests.post('http://web-api:4000/applications/claim', params={"n": 10, "admin_id": admin_id})
+#            Shows only applications leased to this admin, so two admins never review the same one
+@applications.route("/applications/claim", methods=["POST"])
+def claim_applications():
+    try:
+        try:
+            admin_id, n, lease_seconds = parse_claim_args(request, current_app.config)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        claimed = claim_pending(db.get_db(), "application", admin_id, n, lease_seconds)
+
+        # Include student details so the page doesn't fetch each student separately
+        cursor = db.get_db().cursor()
+        claimed = _enriched_applications(cursor, [app['application_id'] for app in claimed])
+        cursor.close()
+
+        current_app.logger.info(f'Admin {admin_id} claimed {len(claimed)} applications')
+        return jsonify(claimed), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in claim_applications: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
 # Get specific application by ID
 # Streamlit: Use requests.get(f'http://web-api:4000/applications/{application_id}')
 #            Display application details for admin review
@@ -149,4 +195,92 @@ def update_application(application_id):
         return jsonify({"message": "Application updated successfully"}), 200
 
     except Error as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+# Approve or reject many applications in one transaction
+# Streamlit: requests.post('http://web-api:4000/applications/bulk-decision', json={
+#                "application_ids": [1, 2, 3], "status": "approved", "admin_id": admin_id
+#            })
+#            Returns per-ID results and the updated applications with student details
+@applications.route("/applications/bulk-decision", methods=["POST"])
+def bulk_decide_applications():
+    try:
+        data = request.get_json()
+
+        required_fields = ["application_ids", "status", "admin_id"]
+        for field in required_fields:
+            if field not in data:
+                return jsonify({"error": f"Missing required field: {field}"}), 400
+
+        if data["status"] not in ["approved", "rejected"]:
+            return jsonify({"error": "status must be 'approved' or 'rejected'"}), 400
+
+        application_ids = data["application_ids"]
+        if not isinstance(application_ids, list) or not application_ids:
+            return jsonify({"error": "application_ids must be a non-empty list"}), 400
+        try:
+            application_ids = list(dict.fromkeys(int(aid) for aid in application_ids))
+        except (TypeError, ValueError):
+            return jsonify({"error": "application_ids must be integers"}), 400
+
+        conn = db.get_db()
+        cursor = conn.cursor()
+        placeholders = ", ".join(["%s"] * len(application_ids))
+        try:
+            # Rows under another admin's live claim lease are left alone
+            cursor.execute(
+                f"""
+                SELECT application_id, status,
+                       (claimed_by IS NULL OR claimed_by = %s
+                        OR claim_expires_at IS NULL OR claim_expires_at < NOW()) AS claimable
+                FROM application
+                WHERE application_id IN ({placeholders})
+                FOR UPDATE
+                """,
+                [data["admin_id"]] + application_ids
+            )
+            rows = cursor.fetchall()
+            found = {row['application_id']: row['status'] for row in rows}
+            claimed_by_other = {row['application_id'] for row in rows if not row['claimable']}
+            pending_ids = [aid for aid in application_ids
+                           if found.get(aid) == 'pending' and aid not in claimed_by_other]
+
+            if pending_ids:
+                pending_placeholders = ", ".join(["%s"] * len(pending_ids))
+                cursor.execute(
+                    f"""
+                    UPDATE application
+                    SET status = %s, admin_id = %s, claimed_by = NULL, claim_expires_at = NULL
+                    WHERE application_id IN ({pending_placeholders}) AND status = 'pending'
+                    """,
+                    [data["status"], data["admin_id"]] + pending_ids
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        results = []
+        for aid in application_ids:
+            if aid not in found:
+                result = "not_found"
+            elif found[aid] != 'pending':
+                result = "already_decided"
+            elif aid in claimed_by_other:
+                result = "claimed_by_other"
+            else:
+                result = "updated"
+            results.append({"application_id": aid, "result": result})
+
+        updated = _enriched_applications(cursor, pending_ids)
+        cursor.close()
+
+        return jsonify({
+            "message": f"{len(pending_ids)} of {len(application_ids)} applications {data['status']}",
+            "results": results,
+            "applications": updated
+        }), 200
+
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
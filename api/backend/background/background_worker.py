@@ -0,0 +1,106 @@
+#------------------------------------------------------------
+# Shared plumbing for background threads that run inside the
+# API process (reminders, sweepers, etc.)
+#------------------------------------------------------------
+import os
+import threading
+import logging
+
+from backend.db_connection import db
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWorker:
+    """
+    Base class for a daemon thread that calls run_once() every `interval`
+    seconds, or sooner if wake() is called.
+
+    Each worker owns its own DB connection (db.connect()) because the
+    request-scoped db.get_db() connection is not available off the
+    request thread.
+
+    Args:
+        name: thread name, also used in log messages
+        interval: seconds to wait between run_once() calls
+    """
+
+    def __init__(self, name, interval=60):
+        self.name = name
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._conn = None
+
+    def get_conn(self):
+        # Lazily (re)open the worker's private connection
+        if self._conn is None:
+            self._conn = db.connect()
+        else:
+            self._conn.ping(reconnect=True)
+        return self._conn
+
+    def setup(self):
+        """Called once on the worker thread before the first run_once()."""
+        pass
+
+    def run_once(self):
+        raise NotImplementedError
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        logger.info(f'{self.name}: starting')
+        try:
+            self.setup()
+        except Exception as e:
+            logger.error(f'{self.name}: setup failed: {str(e)}')
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f'{self.name}: run_once failed: {str(e)}')
+                # Drop the connection so the next pass starts clean
+                if self._conn is not None:
+                    try:
+                        self._conn.close()
+                    except Exception:
+                        pass
+                    self._conn = None
+            self._wake.wait(self.interval)
+            self._wake.clear()
+        logger.info(f'{self.name}: stopped')
+
+
+def start_on_first_request(app, worker):
+    """
+    Start `worker` when the app serves its first request.
+
+    Starting threads directly in create_app() would also start them in the
+    Werkzeug reloader's parent process (backend_app.py runs with debug=True),
+    doubling every background job. Deferring to the first request guarantees
+    they only run in the process that actually serves traffic.
+    """
+    if os.getenv("DISABLE_BACKGROUND_WORKERS"):
+        app.logger.info(f'start_on_first_request(): background workers disabled, skipping {worker.name}')
+        return
+
+    @app.before_request
+    def _start_worker():
+        if not worker.is_running():
+            worker.start()
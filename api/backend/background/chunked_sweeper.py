@@ -0,0 +1,119 @@
+#------------------------------------------------------------
+# Resumable, primary-key-ordered batch updater built on
+# BackgroundWorker (used by the session and job posting sweepers)
+#------------------------------------------------------------
+import time
+import logging
+
+from backend.background.background_worker import BackgroundWorker, start_on_first_request
+
+logger = logging.getLogger(__name__)
+
+# Registry of every sweeper so their metrics can be reported in one place
+sweepers = {}
+
+
+class ChunkedSweeper(BackgroundWorker):
+    """
+    Walks a table in primary-key order, `chunk_size` rows at a time,
+    committing after every chunk so no lock is held for longer than one
+    small UPDATE. The last processed key is saved in `sweeper_checkpoint`
+    in the same transaction as the chunk, so a crashed sweep resumes where
+    it left off instead of starting over.
+
+    Subclasses implement select_chunk() and apply_chunk().
+
+    Args:
+        name: unique sweeper name, also the checkpoint row key
+        interval: seconds between sweeps
+        chunk_size: rows per chunk/transaction
+    """
+
+    def __init__(self, name, interval=300, chunk_size=500):
+        super().__init__(name, interval=interval)
+        self.chunk_size = chunk_size
+        self.metrics = {
+            "passes_completed": 0,
+            "chunks_processed": 0,
+            "rows_scanned": 0,
+            "rows_updated": 0,
+            "last_id": 0,
+            "last_pass_seconds": None,
+            "last_pass_finished_at": None,
+        }
+        sweepers[name] = self
+
+    def init_app(self, app):
+        start_on_first_request(app, self)
+
+    def select_chunk(self, cursor, last_id, limit):
+        """Return up to `limit` rows with primary key > last_id, in key order."""
+        raise NotImplementedError
+
+    def apply_chunk(self, cursor, rows):
+        """Update the given rows; return the number of rows changed."""
+        raise NotImplementedError
+
+    def row_id(self, row):
+        raise NotImplementedError
+
+    def _load_checkpoint(self, cursor):
+        cursor.execute(
+            "SELECT last_id FROM sweeper_checkpoint WHERE sweeper_name = %s",
+            (self.name,)
+        )
+        row = cursor.fetchone()
+        return row['last_id'] if row else 0
+
+    def _save_checkpoint(self, cursor, last_id, rows_updated, pass_done=False):
+        cursor.execute(
+            """
+            INSERT INTO sweeper_checkpoint (sweeper_name, last_id, rows_updated, passes_completed)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                last_id = VALUES(last_id),
+                rows_updated = rows_updated + VALUES(rows_updated),
+                passes_completed = passes_completed + VALUES(passes_completed)
+            """,
+            (self.name, last_id, rows_updated, 1 if pass_done else 0)
+        )
+
+    def run_once(self):
+        conn = self.get_conn()
+        cursor = conn.cursor()
+        started = time.monotonic()
+
+        last_id = self._load_checkpoint(cursor)
+        if last_id:
+            logger.info(f'{self.name}: resuming after id {last_id}')
+
+        while not self._stop.is_set():
+            rows = self.select_chunk(cursor, last_id, self.chunk_size)
+            if not rows:
+                break
+            updated = self.apply_chunk(cursor, rows)
+            last_id = self.row_id(rows[-1])
+            self._save_checkpoint(cursor, last_id, updated)
+            conn.commit()
+
+            self.metrics["chunks_processed"] += 1
+            self.metrics["rows_scanned"] += len(rows)
+            self.metrics["rows_updated"] += updated
+            self.metrics["last_id"] = last_id
+
+            if len(rows) < self.chunk_size:
+                break
+
+        if self._stop.is_set():
+            cursor.close()
+            return
+
+        # Finished the table: next sweep starts from the beginning
+        self._save_checkpoint(cursor, 0, 0, pass_done=True)
+        conn.commit()
+        cursor.close()
+
+        self.metrics["passes_completed"] += 1
+        self.metrics["last_id"] = 0
+        self.metrics["last_pass_seconds"] = round(time.monotonic() - started, 3)
+        self.metrics["last_pass_finished_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
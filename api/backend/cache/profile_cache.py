@@ -0,0 +1,115 @@
+#------------------------------------------------------------
+# Write-through cache of enriched student / alumni profiles
+# (the rows behind GET /students/<id> and GET /alumni/<id>)
+#------------------------------------------------------------
+import time
+import threading
+
+from backend.cache.lru_cache import LRUCache
+from backend.cache.reference_data import reference_data
+
+PROFILE_QUERIES = {
+    "student": "SELECT * FROM student WHERE student_id = %s",
+    "alumni": "SELECT * FROM alumni WHERE alumni_id = %s",
+}
+
+# Columns each profile takes from the reference snapshots, in response order:
+# kind -> ((foreign key, reference table, (columns...)), ...)
+PROFILE_REFERENCES = {
+    "student": (
+        ("major_id", "major", ("major_name",)),
+        ("location_id", "location", ("city", "state", "country")),
+    ),
+    "alumni": (
+        ("company_id", "company", ("company_name", "industry")),
+        ("location_id", "location", ("city", "state", "country")),
+    ),
+}
+
+
+def resolve_references(kind, row):
+    """The profile row with major/company/location columns filled in from the reference snapshots."""
+    profile = dict(row)
+    for foreign_key, table, columns in PROFILE_REFERENCES[kind]:
+        referenced = reference_data.table(table).row(row[foreign_key]) or {}
+        for column in columns:
+            profile[column] = referenced.get(column)
+    return profile
+
+
+class ProfileCache:
+    """
+    Bounded LRU of student and alumni rows, one per kind, so the profile
+    reads the Streamlit pages make per card are dictionary lookups. The
+    major, company and location columns aren't joined or cached with the
+    row: every read resolves them from the reference snapshots
+    (reference_data.py), so a reference edit never stales a profile.
+
+    - Reads try get(), which never opens a DB connection; on a miss the
+      route calls load(), which reads the row and stores it.
+    - update routes call refresh() after committing (write-through): the
+      row is re-read once and replaces the cached copy.
+    - delete routes call evict().
+
+    A miss that raced with a refresh/evict of the same kind isn't stored,
+    so a slow reader can't put back a row older than the write. Entries
+    also expire after `ttl` seconds as a backstop for edits made outside
+    the API.
+    """
+
+    def __init__(self):
+        self.ttl = 300.0
+        self._lock = threading.Lock()
+        self._caches = {kind: LRUCache(max_entries=5000) for kind in PROFILE_QUERIES}
+        self._generation = dict.fromkeys(PROFILE_QUERIES, 0)
+
+    def init_app(self, app):
+        max_entries = int(app.config.get("PROFILE_CACHE_MAX_ENTRIES", 5000))
+        self.ttl = float(app.config.get("PROFILE_CACHE_TTL_SECONDS", self.ttl))
+        self._caches = {kind: LRUCache(max_entries=max_entries) for kind in PROFILE_QUERIES}
+
+    def _bump(self, kind):
+        with self._lock:
+            self._generation[kind] += 1
+
+    def _query(self, cursor, kind, entity_id):
+        cursor.execute(PROFILE_QUERIES[kind], (entity_id,))
+        return cursor.fetchone()
+
+    def get(self, kind, entity_id):
+        """The cached profile, or None on a miss. Only touches the database to rebuild a stale reference snapshot."""
+        cached = self._caches[kind].get(entity_id)
+        if cached is not None and cached[1] > time.monotonic():
+            return resolve_references(kind, cached[0])
+        return None
+
+    def load(self, cursor, kind, entity_id):
+        """Read the row after a miss and cache it; the profile, or None if there is no such entity."""
+        generation = self._generation[kind]
+        row = self._query(cursor, kind, entity_id)
+        if row is None:
+            return None
+        with self._lock:
+            if self._generation[kind] == generation:
+                self._caches[kind].set(entity_id, (row, time.monotonic() + self.ttl))
+        return resolve_references(kind, row)
+
+    def refresh(self, cursor, kind, entity_id):
+        """Write-through after a committed update: re-read and replace the cached row."""
+        self._bump(kind)
+        row = self._query(cursor, kind, entity_id)
+        if row is None:
+            self._caches[kind].delete(entity_id)
+            return None
+        self._caches[kind].set(entity_id, (row, time.monotonic() + self.ttl))
+        return resolve_references(kind, row)
+
+    def evict(self, kind, entity_id):
+        self._bump(kind)
+        self._caches[kind].delete(entity_id)
+
+    def stats(self):
+        return {kind: cache.stats() for kind, cache in self._caches.items()}
+
+
+profile_cache = ProfileCache()
@@ -0,0 +1,443 @@
+#------------------------------------------------------------
+# Process-wide cache of SELECT results, invalidated by the
+# tables each statement writes
+#------------------------------------------------------------
+import re
+import time
+import logging
+import threading
+import functools
+from collections import OrderedDict
+
+from pymysql import cursors
+from pymysql.connections import Connection
+
+from backend.cache.table_versions import table_versions
+
+logger = logging.getLogger(__name__)
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+`?([A-Za-z_][\w$]*)`?", re.IGNORECASE)
+_INSERT_TARGET = re.compile(r"^\s*(?:INSERT|REPLACE)\b[^(]*?\bINTO\s+`?([A-Za-z_][\w$]*)`?", re.IGNORECASE)
+_UPDATE_TARGETS = re.compile(r"^\s*UPDATE\s+(?:LOW_PRIORITY\s+|IGNORE\s+)*(.*?)\bSET\b", re.IGNORECASE | re.DOTALL)
+_DELETE_HEAD = re.compile(r"^\s*DELETE\b(.*?)(?:\bWHERE\b|$)", re.IGNORECASE | re.DOTALL)
+_DDL_TARGET = re.compile(
+    r"^\s*(?:ALTER|DROP|TRUNCATE|CREATE|RENAME)\b.*?\bTABLE\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?`?([A-Za-z_][\w$]*)`?",
+    re.IGNORECASE | re.DOTALL,
+)
+_IDENTIFIER = re.compile(r"`?([A-Za-z_][\w$]*)`?")
+_WRITE_VERBS = ("INSERT", "REPLACE", "UPDATE", "DELETE", "ALTER", "DROP", "TRUNCATE", "CREATE", "RENAME")
+
+# Reads whose result depends on more than the tables' contents, or that take locks.
+# Functions only count when called, so columns like connection_id don't match;
+# the SQL-standard keywords that need no parentheses are matched as bare words.
+_UNCACHEABLE = re.compile(
+    r"\bFOR\s+(?:UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\binformation_schema\b|@"
+    r"|\b(?:CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP|CURRENT_USER|LOCALTIME|LOCALTIMESTAMP"
+    r"|UTC_DATE|UTC_TIME|UTC_TIMESTAMP)\b"
+    r"|\b(?:NOW|SYSDATE|CURDATE|CURTIME|UNIX_TIMESTAMP|RAND|UUID|UUID_SHORT|LAST_INSERT_ID|FOUND_ROWS"
+    r"|ROW_COUNT|CONNECTION_ID|GET_LOCK|RELEASE_LOCK|IS_FREE_LOCK|SLEEP|DATABASE|SCHEMA|USER"
+    r"|SESSION_USER|SYSTEM_USER)\s*\(",
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=2048)
+def read_plan(query):
+    """
+    (normalized SQL, tables read) for a cacheable SELECT template, else None.
+
+    >>> read_plan("SELECT * FROM connection WHERE connection_id = %s")[1]
+    frozenset({'connection'})
+    >>> read_plan("SELECT * FROM job_posting WHERE expires_at > NOW()") is None
+    True
+    """
+    normalized = " ".join(query.split())
+    if not normalized[:6].upper() == "SELECT" or _UNCACHEABLE.search(normalized):
+        return None
+    tables = frozenset(name.lower() for name in _TABLE_REF.findall(normalized))
+    return (normalized, tables) if tables else None
+
+
+def written_tables(sql):
+    """
+    (tables the statement modifies, whether foreign-key cascades apply),
+    or None for anything that isn't a write.
+    """
+    if isinstance(sql, (bytes, bytearray)):
+        sql = bytes(sql[:4096]).decode("utf8", "ignore")
+    verb = sql.lstrip()[:8].upper()
+    if not verb.startswith(_WRITE_VERBS):
+        return None
+    if verb.startswith(("INSERT", "REPLACE")):
+        match = _INSERT_TARGET.match(sql)
+        names = [match.group(1)] if match else []
+    elif verb.startswith("UPDATE"):
+        # Everything between UPDATE and SET: one table, or a multi-table JOIN
+        match = _UPDATE_TARGETS.match(sql)
+        head = match.group(1) if match else ""
+        names = _TABLE_REF.findall(head) + _IDENTIFIER.findall(head)[:1]
+    elif verb.startswith("DELETE"):
+        match = _DELETE_HEAD.match(sql)
+        names = _TABLE_REF.findall(match.group(1)) if match else []
+    else:
+        match = _DDL_TARGET.match(sql)
+        names = [match.group(1)] if match else []
+    # Only UPDATE/DELETE (and REPLACE's delete, DDL) can touch rows in referencing tables
+    return frozenset(name.lower() for name in names), not verb.startswith("INSERT")
+
+
+def _freeze(args):
+    if args is None:
+        return None
+    if isinstance(args, dict):
+        return tuple(sorted((key, _freeze(value)) for key, value in args.items()))
+    if isinstance(args, (list, tuple)):
+        return tuple(_freeze(value) for value in args)
+    return args
+
+
+def _estimate_size(rows):
+    # Rough payload size: string/bytes lengths plus a flat cost per value and row
+    size = 128
+    for row in rows:
+        size += 64
+        for value in row.values():
+            size += len(value) if isinstance(value, (str, bytes)) else 24
+    return size
+
+
+class _Entry:
+    __slots__ = ("rows", "description", "rowcount", "tables", "size", "expires_at")
+
+    def __init__(self, rows, description, rowcount, tables, size, expires_at):
+        self.rows = rows
+        self.description = description
+        self.rowcount = rowcount
+        self.tables = tables
+        self.size = size
+        self.expires_at = expires_at
+
+
+class _Flight:
+    """One in-progress load that concurrent identical reads wait on."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.done = threading.Event()
+        self.entry = None
+
+
+class QueryCache:
+    """
+    Results of SELECT statements run through the API's DictCursors, keyed
+    by whitespace-normalized SQL plus parameters and tagged with the tables
+    the statement reads.
+
+    - Every write on any API connection (request or background worker, any
+      cursor class) is seen by CachingConnection.query(): the tables it
+      modifies, plus tables that reference them through foreign keys (for
+      UPDATE/DELETE cascades), are invalidated when the write runs and
+      again when it commits. Results loaded while a write is uncommitted,
+      or that overlap an invalidation, are not stored.
+    - A connection with uncommitted writes bypasses the cache, so a route
+      always reads its own writes.
+    - Connections aren't autocommit, so a transaction keeps reading the
+      REPEATABLE READ snapshot taken at its first statement. Each
+      CachingConnection records the invalidation clock when its
+      transaction starts, and a result is only stored if none of its
+      tables were invalidated since then: an old snapshot's rows are
+      served to that transaction but never cached for everyone else.
+    - Entries expire after `default_ttl` seconds unless the cursor sets
+      cache_ttl (0 skips the cache for that cursor). The TTL only matters
+      for writes made outside the API, e.g. by hand in MySQL.
+    - Total size is bounded by `max_bytes` (estimated payload bytes), least
+      recently used first.
+    - Identical misses arriving together run the query once (single
+      flight); the rest wait for that result.
+    - Statements that lock rows, use user variables or depend on the clock
+      or session (NOW(), RAND(), LAST_INSERT_ID(), ...) are never cached.
+
+    Each invalidation also bumps the table's version in table_versions, so
+    ETags for conditional GETs follow the same writes.
+    """
+
+    def __init__(self):
+        self.max_bytes = 32 * 1024 * 1024
+        self.default_ttl = 60.0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._by_table = {}
+        self._inflight = {}
+        self._generation = {}
+        self._writers = {}
+        self._dependents = None
+        self._listeners = []
+        # Invalidation clock, and the clock value of each table's latest invalidation
+        self._clock = 0
+        self._changed_at = {}
+        self.bytes = 0
+        self.metrics = {"hits": 0, "misses": 0, "coalesced": 0, "stores": 0, "evictions": 0,
+                        "expired": 0, "invalidations": 0, "bypassed": 0, "old_snapshot": 0}
+
+    def init_app(self, app):
+        self.max_bytes = int(app.config.get("QUERY_CACHE_MAX_BYTES", self.max_bytes))
+        self.default_ttl = float(app.config.get("QUERY_CACHE_TTL_SECONDS", self.default_ttl))
+        app.logger.info(f'query cache: {self.max_bytes} bytes, default TTL {self.default_ttl}s')
+
+    def add_listener(self, callback):
+        """callback(tables) runs after every invalidation, e.g. to drop entity caches built on those tables."""
+        self._listeners.append(callback)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @property
+    def clock(self):
+        return self._clock
+
+    # --- writes ------------------------------------------------------
+
+    def _load_dependents(self, conn):
+        # child table -> parent via foreign keys, turned into parent -> all descendants
+        children = {}
+        try:
+            cursor = conn.cursor(cursors.Cursor)
+            cursor.execute(
+                "SELECT TABLE_NAME, REFERENCED_TABLE_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+                "WHERE CONSTRAINT_SCHEMA = DATABASE()"
+            )
+            for child, parent in cursor.fetchall():
+                children.setdefault(parent.lower(), set()).add(child.lower())
+            cursor.close()
+        except Exception as e:
+            logger.warning(f'query cache: could not read foreign keys, cascades not tracked: {e}')
+
+        dependents = {}
+        for parent in children:
+            seen, stack = set(), [parent]
+            while stack:
+                for child in children.get(stack.pop(), ()):
+                    if child not in seen:
+                        seen.add(child)
+                        stack.append(child)
+            dependents[parent] = frozenset(seen)
+        self._dependents = dependents
+
+    def begin_write(self, conn, tables, cascades):
+        if self._dependents is None:
+            self._load_dependents(conn)
+        if cascades:
+            tables = tables.union(*(self._dependents.get(t, ()) for t in tables))
+        pending = conn.cache_pending_tables
+        with self._lock:
+            for table in tables - pending:
+                self._writers[table] = self._writers.get(table, 0) + 1
+        conn.cache_pending_tables = pending | tables
+        self.invalidate(tables)
+
+    def end_write(self, conn, committed):
+        pending = conn.cache_pending_tables
+        if not pending:
+            return
+        conn.cache_pending_tables = frozenset()
+        with self._lock:
+            for table in pending:
+                self._writers[table] -= 1
+        if committed:
+            self.invalidate(pending)
+
+    def invalidate(self, tables):
+        if not tables:
+            return
+        with self._lock:
+            self._clock += 1
+            for table in tables:
+                self._generation[table] = self._generation.get(table, 0) + 1
+                self._changed_at[table] = self._clock
+                for key in self._by_table.pop(table, ()):
+                    self._remove(key)
+            # Requests arriving from now on must not join loads that started earlier
+            for key in [k for k, flight in self._inflight.items() if flight.tables & tables]:
+                del self._inflight[key]
+            self.metrics["invalidations"] += 1
+        table_versions.bump(*tables)
+        for callback in self._listeners:
+            callback(tables)
+
+    def count(self, metric):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self.bytes = 0
+
+    # --- reads -------------------------------------------------------
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def _store(self, key, entry):
+        if entry.size > self.max_bytes // 4:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self.bytes += entry.size
+        for table in entry.tables:
+            self._by_table.setdefault(table, set()).add(key)
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.metrics["evictions"] += 1
+        self.metrics["stores"] += 1
+
+    def fetch(self, key, tables, ttl, load, conn=None):
+        """
+        Cached entry for `key`, or the result of load() -> (rows, description,
+        rowcount) run on `conn`. Concurrent callers with the same key share
+        one load().
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.metrics["hits"] += 1
+                    return entry
+                self._remove(key)
+                self.metrics["expired"] += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight(tables)
+                generations = [self._generation.get(t, 0) for t in tables]
+                self.metrics["misses"] += 1
+            else:
+                self.metrics["coalesced"] += 1
+
+        if not leader:
+            if flight.done.wait(timeout=30) and flight.entry is not None:
+                return flight.entry
+            rows, description, rowcount = load()
+            return _Entry(rows, description, rowcount, tables, 0, 0)
+
+        try:
+            rows, description, rowcount = load()
+            entry = _Entry(rows, description, rowcount, tables, _estimate_size(rows) + len(key[0]),
+                           time.monotonic() + ttl)
+            flight.entry = entry
+            # Clock value when conn's transaction (and so its read snapshot) began
+            snapshot = getattr(conn, "cache_snapshot", None)
+            with self._lock:
+                unchanged = generations == [self._generation.get(t, 0) for t in tables]
+                quiet = not any(self._writers.get(t) for t in tables)
+                current = snapshot is None or all(self._changed_at.get(t, 0) <= snapshot for t in tables)
+                if not current:
+                    self.metrics["old_snapshot"] += 1
+                elif unchanged and quiet:
+                    self._store(key, entry)
+            return entry
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            total = self.metrics["hits"] + self.metrics["misses"]
+            return dict(
+                self.metrics,
+                entries=len(self._entries),
+                bytes=self.bytes,
+                max_bytes=self.max_bytes,
+                default_ttl=self.default_ttl,
+                hit_rate=round(self.metrics["hits"] / total, 4) if total else None,
+            )
+
+
+query_cache = QueryCache()
+
+
+class CachingConnection(Connection):
+    """pymysql Connection that reports writes, commits and rollbacks to the query cache."""
+
+    cache_pending_tables = frozenset()
+    # query_cache.clock when the current transaction started (None between transactions)
+    cache_snapshot = None
+
+    def query(self, sql, unbuffered=False):
+        if self.cache_snapshot is None or self.autocommit_mode:
+            # Read before the statement runs, so the snapshot it takes is at least this new
+            self.cache_snapshot = query_cache.clock
+        write = written_tables(sql)
+        if write and write[0]:
+            query_cache.begin_write(self, *write)
+        result = super().query(sql, unbuffered)
+        if write and write[0] and self.autocommit_mode:
+            query_cache.end_write(self, committed=True)
+        return result
+
+    def commit(self):
+        super().commit()
+        self.cache_snapshot = None
+        query_cache.end_write(self, committed=True)
+
+    def rollback(self):
+        try:
+            super().rollback()
+        finally:
+            self.cache_snapshot = None
+            query_cache.end_write(self, committed=False)
+
+    def close(self):
+        # Closing with uncommitted writes discards them
+        self.cache_snapshot = None
+        query_cache.end_write(self, committed=False)
+        super().close()
+
+
+class CachingDictCursor(cursors.DictCursor):
+    """
+    DictCursor whose SELECTs go through the query cache. Set `cache_ttl`
+    on a cursor to override the default TTL for its queries (0 = don't cache).
+    """
+
+    cache_ttl = None
+
+    def execute(self, query, args=None):
+        plan = read_plan(query) if query_cache.enabled and self.cache_ttl != 0 else None
+        if plan is None:
+            return super().execute(query, args)
+        if getattr(self.connection, "cache_pending_tables", None):
+            query_cache.count("bypassed")
+            return super().execute(query, args)
+        try:
+            key = (plan[0], _freeze(args))
+            hash(key)
+        except TypeError:
+            return super().execute(query, args)
+
+        def load():
+            super(CachingDictCursor, self).execute(query, args)
+            return (self._rows if self._rows is not None else []), self.description, self.rowcount
+
+        ttl = self.cache_ttl if self.cache_ttl is not None else query_cache.default_ttl
+        entry = query_cache.fetch(key, plan[1], ttl, load, self.connection)
+
+        # Each caller gets its own row dicts; routes are free to modify them
+        self._clear_result()
+        self._rows = [dict(row) for row in entry.rows]
+        self.description = entry.description
+        self.rowcount = entry.rowcount
+        self._executed = query
+        return self.rowcount
@@ -0,0 +1,158 @@
+#------------------------------------------------------------
+# Immutable in-memory snapshots of the reference tables
+# (major, company, location), with O(1) lookup by id
+#------------------------------------------------------------
+import logging
+import threading
+
+import numpy as np
+
+from backend.db_connection import db
+from backend.cache.query_cache import query_cache
+from backend.cache.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+# table -> primary key column
+REFERENCE_TABLES = {
+    "major": "major_id",
+    "company": "company_id",
+    "location": "location_id",
+}
+
+# Largest id range (relative to the row count) still indexed by a dense array
+_DENSE_SLACK = 4096
+
+
+class ReferenceTable:
+    """
+    One table's rows, frozen: column names, a tuple of row tuples, and an
+    int32 array mapping id -> row position (-1 for gaps), so lookups are
+    a bounds check and an array read. Ids far too sparse for an array
+    fall back to a read-only dict.
+
+    Never modified after construction; a change builds a new instance.
+    """
+
+    def __init__(self, name, key, description, rows, version):
+        self.name = name
+        self.key = key
+        self.version = version
+        self.description = description
+        self.columns = tuple(column[0] for column in description)
+        self._column_at = {column: i for i, column in enumerate(self.columns)}
+        self.rows = tuple(tuple(row[column] for column in self.columns) for row in rows)
+
+        ids = [row[key] for row in rows]
+        max_id = max(ids, default=-1)
+        if max_id < 4 * len(ids) + _DENSE_SLACK:
+            index = np.full(max_id + 1, -1, dtype=np.int32)
+            index[ids] = np.arange(len(ids), dtype=np.int32)
+            index.setflags(write=False)
+            self._index, self._sparse = index, None
+        else:
+            self._index, self._sparse = None, {entity_id: i for i, entity_id in enumerate(ids)}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def position(self, entity_id):
+        if entity_id is None:
+            return -1
+        if self._sparse is not None:
+            return self._sparse.get(entity_id, -1)
+        if 0 <= entity_id < len(self._index):
+            return int(self._index[entity_id])
+        return -1
+
+    def get(self, entity_id, column):
+        """One column of the row with this id, or None (as a LEFT JOIN would give)."""
+        i = self.position(entity_id)
+        return self.rows[i][self._column_at[column]] if i >= 0 else None
+
+    def row(self, entity_id):
+        i = self.position(entity_id)
+        return dict(zip(self.columns, self.rows[i])) if i >= 0 else None
+
+    def all_rows(self):
+        """Every row as a fresh dict, in table order, for list endpoints."""
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+class ReferenceData:
+    """
+    Snapshots of major, company and location, loaded by create_app() and
+    read by /majors, /companies and the profile endpoints instead of
+    querying or joining those tables.
+
+    - Each snapshot is immutable. A write to a reference table (seen by
+      the query cache, or by any worker through the shared cache's table
+      counters) only marks it out of date; the next read builds a
+      replacement and swaps it in with a single assignment, so readers
+      see either the old snapshot or the new one, never a mix.
+    - A rebuild that raced with another write isn't installed, so a
+      snapshot is never older than a committed write it could have seen.
+    - If the database isn't reachable at startup, the first read loads it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._generation = dict.fromkeys(REFERENCE_TABLES, 0)
+        self.metrics = {"reloads": 0, "discarded": 0}
+
+    def init_app(self, app):
+        query_cache.add_listener(self.tables_changed)
+        try:
+            for name in REFERENCE_TABLES:
+                self.table(name)
+        except Exception as e:
+            app.logger.warning(f'reference data: not loaded at startup, will load on first use: {e}')
+            return
+        sizes = ", ".join(f"{name}={len(table)}" for name, table in self._snapshots.items())
+        app.logger.info(f'reference data: loaded {sizes}')
+
+    def _version(self, name):
+        # Local generation for this worker's writes, shared counter for other workers'
+        return self._generation[name], shared_cache.stamp((name,))
+
+    def tables_changed(self, tables):
+        with self._lock:
+            for name in REFERENCE_TABLES.keys() & tables:
+                self._generation[name] += 1
+
+    def table(self, name):
+        """The current snapshot of `name`, rebuilt first if a write made it stale."""
+        version = self._version(name)
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        return self._reload(name, version)
+
+    def _reload(self, name, version):
+        conn = db.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.cache_ttl = 0
+            cursor.execute(f"SELECT * FROM {name} ORDER BY {REFERENCE_TABLES[name]}")
+            snapshot = ReferenceTable(name, REFERENCE_TABLES[name], cursor.description, cursor.fetchall(), version)
+            cursor.close()
+        finally:
+            conn.close()
+
+        with self._lock:
+            if self._version(name) == version:
+                self._snapshots = {**self._snapshots, name: snapshot}
+                self.metrics["reloads"] += 1
+            else:
+                self.metrics["discarded"] += 1
+        logger.info(f'reference data: {name} snapshot rebuilt, {len(snapshot)} rows')
+        return snapshot
+
+    def stats(self):
+        result = dict(self.metrics)
+        result["tables"] = {name: len(table) for name, table in self._snapshots.items()}
+        return result
+
+
+reference_data = ReferenceData()
@@ -0,0 +1,386 @@
+#------------------------------------------------------------
+# Host-wide cache tier in an mmap'ed file, shared by every API
+# worker process without IPC round trips
+#------------------------------------------------------------
+import os
+import json
+import mmap
+import stat
+import time
+import zlib
+import fcntl
+import base64
+import struct
+import decimal
+import hashlib
+import datetime
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is the fallback
+    orjson = None
+
+from backend.cache.query_cache import query_cache
+
+MAGIC = b"NUCSHM02"
+
+# magic, slot count, arena size, write cursor, publishes, evictions (padded to 64 bytes)
+_HEADER = struct.Struct("<8sIxxxxQQQQ")
+_HEADER_SIZE = 64
+
+# Shared per-table write counters: name, counter
+_TABLE = struct.Struct("<40sQ")
+_TABLE_COUNT = 64
+
+# Slot: seqlock sequence, key hash, version, data offset, data length, crc32,
+#       stored at, expires at (0 = never), key
+_SLOT = struct.Struct("<QQQQIIdd64s")
+
+
+def _key_bytes(key):
+    raw = key.encode()
+    return raw if len(raw) <= 64 else hashlib.blake2b(raw, digest_size=32).hexdigest().encode()
+
+
+def _key_hash(raw):
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little") or 1
+
+
+# Values are stored as JSON, never pickle: the file is only data, so even a
+# tampered cache can't run code. Types JSON lacks are written as
+# {"$t": type, "v": text} and restored on load, so cached rows come back
+# with the same Python types a cursor returns. Tuples come back as lists.
+def _tag(o):
+    if isinstance(o, decimal.Decimal):
+        return {"$t": "decimal", "v": str(o)}
+    if isinstance(o, datetime.datetime):
+        return {"$t": "datetime", "v": o.isoformat()}
+    if isinstance(o, datetime.date):
+        return {"$t": "date", "v": o.isoformat()}
+    if isinstance(o, datetime.time):
+        return {"$t": "time", "v": o.isoformat()}
+    if isinstance(o, datetime.timedelta):
+        return {"$t": "timedelta", "v": o // datetime.timedelta(microseconds=1)}
+    if isinstance(o, (bytes, bytearray)):
+        return {"$t": "bytes", "v": base64.b64encode(o).decode()}
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} can't be stored in the shared cache")
+
+
+_UNTAG = {
+    "decimal": decimal.Decimal,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "time": datetime.time.fromisoformat,
+    "timedelta": lambda v: datetime.timedelta(microseconds=v),
+    "bytes": base64.b64decode,
+}
+
+
+def _untag(obj):
+    if len(obj) == 2 and "$t" in obj and obj["$t"] in _UNTAG:
+        return _UNTAG[obj["$t"]](obj["v"])
+    return obj
+
+
+def encode_value(value):
+    if orjson is not None:
+        # Pass dates and times through to _tag so they keep their type on load
+        return orjson.dumps(value, default=_tag, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(value, default=_tag, separators=(",", ":")).encode()
+
+
+def decode_value(payload):
+    return json.loads(payload, object_hook=_untag)
+
+
+class SharedCache:
+    """
+    Values shared by all worker processes on a host through one mmap'ed
+    file (by default under /dev/shm), for hot reference and aggregate data
+    that would otherwise be loaded and held once per worker.
+
+    Layout: a header, a table of per-table write counters, a fixed table of
+    slots, and a data arena used as a ring buffer.
+
+    - Versioned entries: each entry is stamped with the shared write
+      counters of the tables it was built from. Every write any worker
+      makes (reported by the query cache) bumps those counters, so stale
+      entries stop matching everywhere at once.
+    - Lock-free reads: a slot is guarded by a seqlock (odd = being
+      written) and its bytes by a crc32, so readers retry instead of
+      locking, and never see a half-written value.
+    - Atomic publish: writers serialise on flock(), append the JSON-encoded
+      value to the arena, then flip the slot to it under the seqlock.
+    - Bounded size: when the arena wraps, entries whose bytes are about to
+      be overwritten are dropped first (oldest-first eviction), and a full
+      probe window evicts its oldest slot.
+
+    The file is opened without following symlinks and only used if it is a
+    regular file owned by this user with no group/other permissions;
+    otherwise (or if SHARED_CACHE_BYTES is 0) the cache is disabled and
+    fetch() just calls the loader, so callers don't need a fallback path.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.slots = 0
+        self.arena_size = 0
+        self.default_ttl = 300.0
+        self._mm = None
+        self._fd = None
+        self._local_lock = threading.Lock()
+        self._table_index = {}
+        self.metrics = {"hits": 0, "misses": 0, "stale": 0, "publishes": 0, "skipped": 0, "retries": 0}
+
+    # --- setup -------------------------------------------------------
+
+    def init_app(self, app):
+        query_cache.add_listener(self.bump_tables)
+        size = int(app.config.get("SHARED_CACHE_BYTES", 8 * 1024 * 1024))
+        if size <= 0:
+            app.logger.info('shared cache: disabled')
+            return
+        self.slots = int(app.config.get("SHARED_CACHE_SLOTS", 512))
+        # The layout is part of the default name, so workers started with
+        # different settings (or an older format) never share a file
+        default_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        default_name = f"nu-connect-api-{os.getuid()}-{MAGIC[-2:].decode()}-{self.slots}x{size}.cache"
+        self.path = app.config.get("SHARED_CACHE_PATH") or os.path.join(default_dir, default_name)
+        self.default_ttl = float(app.config.get("SHARED_CACHE_TTL_SECONDS", self.default_ttl))
+        try:
+            self._open(size)
+        except OSError as e:
+            app.logger.warning(f'shared cache: could not map {self.path}, disabled: {e}')
+            self._mm = None
+            return
+        app.logger.info(f'shared cache: {self.path}, {self.arena_size} byte arena, {self.slots} slots')
+
+    def _open(self, arena_size):
+        self._slots_at = _HEADER_SIZE + _TABLE.size * _TABLE_COUNT
+        self._arena_at = self._slots_at + _SLOT.size * self.slots
+        total = self._arena_at + arena_size
+
+        # /dev/shm is world-writable: refuse symlinks, and files someone else
+        # created or could write to
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC, 0o600)
+        try:
+            info = os.fstat(fd)
+            if not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+                raise PermissionError(f"{self.path} must be a regular file owned by uid {os.getuid()} "
+                                      f"with mode 0600")
+        except BaseException:
+            os.close(fd)
+            raise
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size == 0:
+                # First worker on this host: size and stamp the new file
+                os.ftruncate(fd, total)
+                os.pwrite(fd, _HEADER.pack(MAGIC, self.slots, arena_size, 0, 0, 0), 0)
+            # Never resize a file that may be in use: shrinking it under
+            # another worker's mapping would SIGBUS that worker
+            header = os.pread(fd, _HEADER.size, 0)
+            ok = (os.fstat(fd).st_size == total and len(header) == _HEADER.size
+                  and _HEADER.unpack(header)[:3] == (MAGIC, self.slots, arena_size))
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        if not ok:
+            os.close(fd)
+            raise OSError(f"{self.path} has a different layout; remove it or change SHARED_CACHE_PATH")
+        self._fd = fd
+        self._mm = mmap.mmap(fd, total)
+        self.arena_size = arena_size
+
+    @property
+    def enabled(self):
+        return self._mm is not None
+
+    # --- shared table counters ---------------------------------------
+
+    def _table_slot(self, table, create=False):
+        index = self._table_index.get(table)
+        if index is not None:
+            return index
+        name = table.encode()[:40]
+        for i in range(_TABLE_COUNT):
+            offset = _HEADER_SIZE + i * _TABLE.size
+            stored, _ = _TABLE.unpack_from(self._mm, offset)
+            stored = stored.rstrip(b"\0")
+            if stored == name:
+                self._table_index[table] = offset
+                return offset
+            if not stored:
+                if not create:
+                    return None
+                _TABLE.pack_into(self._mm, offset, name, 0)
+                self._table_index[table] = offset
+                return offset
+        return None
+
+    def bump_tables(self, tables):
+        """Mark `tables` as written, for every worker. Called for each write the query cache sees."""
+        if not self.enabled:
+            return
+        with self._locked():
+            for table in tables:
+                offset = self._table_slot(table, create=True)
+                if offset is not None:
+                    name, counter = _TABLE.unpack_from(self._mm, offset)
+                    _TABLE.pack_into(self._mm, offset, name, counter + 1)
+
+    def stamp(self, tables):
+        """Version for data built from `tables` right now (always 0 when disabled)."""
+        if not self.enabled:
+            return 0
+        digest = hashlib.blake2b(digest_size=8)
+        for table in sorted(tables):
+            offset = self._table_slot(table)
+            counter = _TABLE.unpack_from(self._mm, offset)[1] if offset is not None else 0
+            digest.update(f"{table}:{counter};".encode())
+        return int.from_bytes(digest.digest(), "little")
+
+    # --- slots -------------------------------------------------------
+
+    @contextmanager
+    def _locked(self):
+        # flock() excludes other processes; the thread lock, other threads of this one
+        with self._local_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _probe(self, key_hash):
+        start = key_hash % self.slots
+        for i in range(8):
+            yield self._slots_at + ((start + i) % self.slots) * _SLOT.size
+
+    def _read(self, raw_key, key_hash):
+        """(version, expires_at, payload) for the key, or None; retries while a writer is mid-publish."""
+        for offset in self._probe(key_hash):
+            for _ in range(16):
+                seq, h, version, data_at, length, crc, stored_at, expires_at, key = _SLOT.unpack_from(self._mm, offset)
+                if seq & 1:
+                    self.metrics["retries"] += 1
+                    continue
+                if h != key_hash or key.rstrip(b"\0") != raw_key or not length:
+                    break
+                payload = self._mm[self._arena_at + data_at:self._arena_at + data_at + length]
+                if _SLOT.unpack_from(self._mm, offset)[0] == seq and zlib.crc32(payload) == crc:
+                    return version, expires_at, payload
+                self.metrics["retries"] += 1
+            else:
+                return None
+            if h == key_hash and key.rstrip(b"\0") == raw_key:
+                return None
+        return None
+
+    def _write_slot(self, offset, *fields):
+        seq = _SLOT.unpack_from(self._mm, offset)[0]
+        # Round up to even first: a writer that died mid-publish left the slot
+        # odd, and adding 1 and 2 to that would never make it readable again
+        base = seq + (seq & 1)
+        struct.pack_into("<Q", self._mm, offset, base + 1)          # odd: readers back off
+        _SLOT.pack_into(self._mm, offset, base + 1, *fields)
+        struct.pack_into("<Q", self._mm, offset, base + 2)          # even: published
+
+    def _clear_slot(self, offset):
+        self._write_slot(offset, 0, 0, 0, 0, 0, 0.0, 0.0, b"")
+
+    def _allocate(self, length):
+        # Ring buffer: wrap to the start when the tail is too short, and drop
+        # every entry whose bytes overlap the region about to be reused
+        magic, slots, arena, cursor, publishes, evictions = _HEADER.unpack_from(self._mm, 0)
+        if cursor + length > arena:
+            cursor = 0
+        end = cursor + length
+        for i in range(self.slots):
+            offset = self._slots_at + i * _SLOT.size
+            _, h, _, data_at, data_len, *_ = _SLOT.unpack_from(self._mm, offset)
+            if data_len and data_at < end and cursor < data_at + data_len:
+                self._clear_slot(offset)
+                evictions += 1
+        _HEADER.pack_into(self._mm, 0, magic, slots, arena, end, publishes, evictions)
+        return cursor
+
+    def _publish(self, raw_key, key_hash, version, payload, ttl):
+        with self._locked():
+            target, oldest = None, None
+            for offset in self._probe(key_hash):
+                _, h, _, _, length, _, stored_at, _, key = _SLOT.unpack_from(self._mm, offset)
+                if (h == key_hash and key.rstrip(b"\0") == raw_key) or not length:
+                    target = offset
+                    break
+                if oldest is None or stored_at < oldest[1]:
+                    oldest = (offset, stored_at)
+            target = target if target is not None else oldest[0]
+
+            data_at = self._allocate(len(payload))
+            start = self._arena_at + data_at
+            self._mm[start:start + len(payload)] = payload
+            now = time.time()
+            self._write_slot(target, key_hash, version, data_at, len(payload), zlib.crc32(payload),
+                             now, now + ttl if ttl else 0.0, raw_key)
+            header = list(_HEADER.unpack_from(self._mm, 0))
+            header[4] += 1
+            _HEADER.pack_into(self._mm, 0, *header)
+
+    # --- public API --------------------------------------------------
+
+    def fetch(self, key, tables, load, ttl=None):
+        """
+        The value cached under `key` if it was built from the current
+        versions of `tables` and hasn't expired; otherwise load(), publish
+        the result for every worker, and return it. Each call returns a
+        fresh copy, so callers may modify it. The value must be JSON data,
+        optionally containing Decimal, date/time, timedelta or bytes values.
+        """
+        if not self.enabled:
+            return load()
+        raw_key = _key_bytes(key)
+        key_hash = _key_hash(raw_key)
+        stamp = self.stamp(tables)
+
+        found = self._read(raw_key, key_hash)
+        if found is not None:
+            version, expires_at, payload = found
+            if version == stamp and (not expires_at or expires_at > time.time()):
+                self.metrics["hits"] += 1
+                return decode_value(payload)
+            self.metrics["stale"] += 1
+        self.metrics["misses"] += 1
+
+        value = load()
+        payload = encode_value(value)
+        # Don't publish data that a concurrent write has already made stale,
+        # or that would take up more than half the arena
+        if self.stamp(tables) != stamp or len(payload) > self.arena_size // 2:
+            self.metrics["skipped"] += 1
+            return value
+        self._publish(raw_key, key_hash, stamp, payload, self.default_ttl if ttl is None else ttl)
+        self.metrics["publishes"] += 1
+        return value
+
+    def stats(self):
+        result = dict(self.metrics, enabled=self.enabled, path=self.path)
+        if self.enabled:
+            _, slots, arena, cursor, publishes, evictions = _HEADER.unpack_from(self._mm, 0)
+            used = [_SLOT.unpack_from(self._mm, self._slots_at + i * _SLOT.size) for i in range(slots)]
+            result.update(
+                slots=slots,
+                entries=sum(1 for slot in used if slot[4]),
+                bytes=sum(slot[4] for slot in used),
+                arena_bytes=arena,
+                host_publishes=publishes,
+                host_evictions=evictions,
+            )
+        return result
+
+
+shared_cache = SharedCache()
@@ -0,0 +1,112 @@
+#------------------------------------------------------------
+# Pre-rendered, pre-compressed JSON snapshots of small,
+# read-mostly tables, served from memory with strong ETags
+#------------------------------------------------------------
+import gzip
+import hashlib
+import threading
+
+from flask import Response, current_app
+
+from backend.cache.lru_cache import LRUCache
+from backend.db_connection import db
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+class RenderedBody:
+    """One JSON body in every encoding we serve, each with its own strong ETag (unquoted)."""
+
+    def __init__(self, body):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.encodings = {None: (body, digest)}
+        self.encodings["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f"{digest}-gz")
+        if brotli is not None:
+            self.encodings["br"] = (brotli.compress(body, quality=11), f"{digest}-br")
+
+    def pick(self, accept_encodings):
+        # Smallest encoding the client accepts; identity otherwise
+        for encoding in ("br", "gzip"):
+            if encoding in self.encodings and accept_encodings[encoding]:
+                return encoding
+        return None
+
+
+class JSONSnapshot:
+    """
+    In-memory copy of `query`'s rows, rendered to the same JSON jsonify
+    would produce and compressed with gzip (and brotli, when installed)
+    once per change rather than once per request.
+
+    Writers call refresh() after committing, which re-reads the rows
+    and re-renders the unfiltered body straight away. Refreshes run one at
+    a time, so of two overlapping writes the later refresh (which read
+    both) is always the one left installed. Filtered variants
+    (e.g. ?target_audience=students) are rendered on first use and kept in
+    a small LRU until the next refresh. Reads never touch the database
+    once the snapshot has been loaded.
+
+    Args:
+        name: label used in logs
+        query: SELECT producing the full, ordered row list
+    """
+
+    def __init__(self, name, query):
+        self.name = name
+        self.query = query
+        self.version = 0
+        self._lock = threading.Lock()
+        # Held from SELECT to swap, so overlapping refreshes install in query order
+        self._refresh_lock = threading.Lock()
+        self._rows = None
+        self._variants = LRUCache(max_entries=32)
+
+    def refresh(self):
+        with self._refresh_lock:
+            cursor = db.get_db().cursor()
+            cursor.execute(self.query)
+            rows = cursor.fetchall()
+            cursor.close()
+            full = self._render(rows)
+            with self._lock:
+                self._rows = rows
+                self.version += 1
+                self._variants = LRUCache(max_entries=32)
+                self._variants.set(None, full)
+        current_app.logger.debug(f'snapshot {self.name}: v{self.version}, {len(rows)} rows')
+
+    @staticmethod
+    def _render(rows):
+        # Exactly the bytes jsonify(rows) would send
+        return RenderedBody(current_app.json.response(rows).get_data())
+
+    def _body(self, column, value):
+        if self._rows is None:
+            self.refresh()
+        key = None if column is None else (column, value)
+        with self._lock:
+            variants, rows = self._variants, self._rows
+        rendered = variants.get(key)
+        if rendered is None:
+            rendered = self._render([row for row in rows if row.get(column) == value])
+            variants.set(key, rendered)
+        return rendered
+
+    def response(self, request, column=None, value=None):
+        """
+        Serve the snapshot (optionally filtered to rows where column == value),
+        honouring Accept-Encoding and If-None-Match.
+        """
+        rendered = self._body(column, value)
+        encoding = rendered.pick(request.accept_encodings)
+        body, etag = rendered.encodings[encoding]
+
+        headers = {"ETag": f'"{etag}"', "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+        return Response(body, status=200, mimetype="application/json", headers=headers)
@@ -0,0 +1,106 @@
+#------------------------------------------------------------
+# Per-table change versions, and conditional GET (ETag / 304)
+# for routes whose output depends only on those tables
+#------------------------------------------------------------
+import os
+import time
+import hashlib
+import functools
+import threading
+
+from flask import Response, current_app, request
+
+
+class TableVersions:
+    """
+    A monotonically increasing version per table. The query cache bumps a
+    table whenever a statement writes to it, and again on commit (see
+    query_cache.py); read routes derive their ETag from the versions of
+    the tables they read.
+
+    Versions live in process memory and start at 0, so every ETag also
+    includes an epoch chosen at startup: tags handed out before a restart
+    never match afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self.epoch = f"{int(time.time()):x}{os.getpid():x}"
+        self.metrics = {"bumps": 0, "not_modified": 0, "full_responses": 0}
+
+    def bump(self, *tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            self.metrics["bumps"] += 1
+
+    def count(self, metric):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def get(self, table):
+        return self._versions.get(table, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._versions)
+
+    def etag(self, tables, *extra):
+        """Strong ETag (unquoted) for a representation built from `tables`."""
+        with self._lock:
+            versions = ",".join(f"{table}:{self._versions.get(table, 0)}" for table in tables)
+        key = "|".join((self.epoch, versions) + extra)
+        return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+    def stats(self):
+        with self._lock:
+            return dict(self.metrics, epoch=self.epoch, versions=dict(self._versions))
+
+
+table_versions = TableVersions()
+
+
+def _matching_tag(if_none_match, etag):
+    # The compression layer serves "<etag>-gzip" etc., so accept those too
+    if if_none_match.star_tag:
+        return etag
+    for tag in if_none_match:
+        if tag == etag or tag.startswith(etag + "-"):
+            return tag
+    return None
+
+
+def conditional(*tables):
+    """
+    Decorator for GET routes whose response depends only on `tables` (and
+    the URL and Accept header). Answers If-None-Match with 304 Not Modified
+    before the view runs, so an unchanged refresh costs no query at all;
+    otherwise runs the view and tags a 200 response with the ETag.
+
+    The ETag is computed before the view queries, so a write landing in
+    between can only make the tag older than the data, never newer: the
+    next request simply gets a full response.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = table_versions.etag(tables, request.full_path, request.headers.get("Accept", ""))
+            matched = _matching_tag(request.if_none_match, etag)
+            if matched is not None:
+                table_versions.count("not_modified")
+                response = Response(status=304)
+                response.set_etag(matched)
+                response.headers["Cache-Control"] = "no-cache"
+                response.vary.update(("Accept", "Accept-Encoding"))
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                table_versions.count("full_responses")
+                response.set_etag(etag)
+                response.headers["Cache-Control"] = "no-cache"
+                response.vary.add("Accept")
+            return response
+        return wrapper
+    return decorator
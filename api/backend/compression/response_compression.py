@@ -0,0 +1,205 @@
+#------------------------------------------------------------
+# Compresses API responses (zstd / brotli / gzip) on the way
+# out, with per-endpoint ratio and CPU accounting
+#------------------------------------------------------------
+import gzip
+import time
+import zlib
+import threading
+
+from flask import request
+
+from backend.cache.lru_cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional too
+    zstandard = None
+
+# Bodies worth compressing. Parquet is left alone: it is compressed internally
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/vnd.apache.arrow.stream",
+    "application/javascript",
+    "image/svg+xml",
+}
+
+# Tried in this order when the client rates several encodings equally
+ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+
+class Encoder:
+    """One-shot and streaming compression for a single Content-Encoding."""
+
+    def __init__(self, name, level):
+        self.name = name
+        self.level = level
+
+    def compress(self, body):
+        if self.name == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(body)
+        if self.name == "br":
+            return brotli.compress(body, quality=self.level)
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    def streaming(self):
+        """
+        (feed, finish) for compressing a body chunk by chunk. feed() flushes
+        after every chunk so the client sees rows as they are produced.
+        """
+        if self.name == "zstd":
+            compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+            return (lambda chunk: compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+                    compressor.flush)
+        if self.name == "br":
+            compressor = brotli.Compressor(quality=self.level)
+            return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+        # wbits=31: deflate with a gzip header and trailer
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+
+class ResponseCompressor:
+    """
+    after_request hook that compresses JSON / NDJSON / Arrow responses
+    with the best encoding the client accepts.
+
+    - Bodies under `min_size` bytes go out as-is; the framing overhead
+      isn't worth it.
+    - Streamed responses (e.g. the NDJSON exports) are compressed chunk by
+      chunk with a flush after each, so they keep streaming.
+    - Responses carrying an ETag are cacheable: their compressed bytes are
+      kept in an LRU keyed by (path, ETag, encoding), so the same representation
+      is only compressed once. The ETag itself gets an encoding suffix,
+      since the compressed bytes are a different representation.
+    - Responses that already have a Content-Encoding (the pre-compressed
+      snapshots) or ask for Cache-Control: no-transform are left alone.
+
+    Per-endpoint bytes in/out, CPU seconds spent compressing and cache
+    hits are kept in `metrics` and served by GET /admin/compression.
+    """
+
+    def __init__(self):
+        self.min_size = 1024
+        self.encoders = {}
+        self._variants = LRUCache(max_entries=256)
+        self._lock = threading.Lock()
+        self.metrics = {}
+
+    def init_app(self, app):
+        self.min_size = int(app.config.get("COMPRESSION_MIN_SIZE", 1024))
+        self.encoders = {"gzip": Encoder("gzip", int(app.config.get("COMPRESSION_GZIP_LEVEL", 6)))}
+        if brotli is not None:
+            self.encoders["br"] = Encoder("br", int(app.config.get("COMPRESSION_BROTLI_QUALITY", 5)))
+        if zstandard is not None:
+            self.encoders["zstd"] = Encoder("zstd", int(app.config.get("COMPRESSION_ZSTD_LEVEL", 3)))
+        self._variants = LRUCache(max_entries=int(app.config.get("COMPRESSION_CACHE_ENTRIES", 256)))
+        app.after_request(self.compress)
+        app.logger.info(f'response compression: {", ".join(self.encoders)}, min size {self.min_size} bytes')
+
+    def choose_encoding(self, accept_encodings):
+        best, best_quality = None, 0
+        for name in ENCODING_PREFERENCE:
+            quality = accept_encodings[name]
+            if name in self.encoders and quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def _record(self, endpoint, **counts):
+        with self._lock:
+            entry = self.metrics.setdefault(endpoint or "<unmatched>", {
+                "responses": 0, "compressed": 0, "below_min_size": 0, "streamed": 0, "cache_hits": 0,
+                "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0,
+            })
+            entry["responses"] += 1
+            for key, value in counts.items():
+                entry[key] += value
+
+    def stats(self):
+        with self._lock:
+            result = {}
+            for endpoint, entry in self.metrics.items():
+                entry = dict(entry, cpu_seconds=round(entry["cpu_seconds"], 6))
+                entry["ratio"] = round(entry["bytes_out"] / entry["bytes_in"], 4) if entry["bytes_in"] else None
+                result[endpoint] = entry
+        return {"min_size": self.min_size, "encodings": list(self.encoders),
+                "variant_cache": self._variants.stats(), "endpoints": result}
+
+    def compress(self, response):
+        if (response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough
+                or "Content-Encoding" in response.headers
+                or "no-transform" in response.headers.get("Cache-Control", "")):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = self.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        encoder = self.encoders[encoding]
+        endpoint = request.endpoint
+
+        if response.is_streamed:
+            response.response = self._stream(endpoint, encoder, response.response, response.iter_encoded())
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                self._record(endpoint, bytes_in=len(body), bytes_out=len(body), below_min_size=1)
+                return response
+
+            etag, weak = response.get_etag()
+            key = (request.full_path, etag, weak, encoding) if etag else None
+            compressed = self._variants.get(key) if key else None
+            if compressed is not None:
+                self._record(endpoint, bytes_in=len(body), bytes_out=len(compressed), compressed=1, cache_hits=1)
+            else:
+                started = time.thread_time()
+                compressed = encoder.compress(body)
+                self._record(endpoint, bytes_in=len(body), bytes_out=len(compressed), compressed=1,
+                             cpu_seconds=time.thread_time() - started)
+                if key:
+                    self._variants.set(key, compressed)
+            response.set_data(compressed)
+            if etag:
+                response.set_etag(f"{etag}-{encoding}", weak=weak)
+
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _stream(self, endpoint, encoder, source, chunks):
+        # Runs as the body is sent, after the view has returned; only the
+        # compressor calls are timed, not producing the chunks
+        feed, finish = encoder.streaming()
+        bytes_in = bytes_out = 0
+        cpu = 0.0
+        try:
+            for chunk in chunks:
+                started = time.thread_time()
+                out = feed(chunk)
+                cpu += time.thread_time() - started
+                bytes_in += len(chunk)
+                bytes_out += len(out)
+                if out:
+                    yield out
+            started = time.thread_time()
+            out = finish()
+            cpu += time.thread_time() - started
+            bytes_out += len(out)
+            yield out
+        finally:
+            # Release the wrapped generator (e.g. an export's DB connection) if the client left early
+            if hasattr(source, "close"):
+                source.close()
+            self._record(endpoint, bytes_in=bytes_in, bytes_out=bytes_out, compressed=1, streamed=1,
+                         cpu_seconds=cpu)
+
+
+response_compressor = ResponseCompressor()
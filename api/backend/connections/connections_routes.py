@@ -1,13 +1,33 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
 from mysql.connector import Error
+from backend.formats.columnar import rows_response
+from backend.students.connection_map import invalidate_connection_map
+from backend.graph.mentorship_graph import mentorship_graph
+from backend.throttle.sliding_window import connection_throttle
 
 connections = Blueprint("connections", __name__)
 
+
+def log_status_changes(cursor, changes):
+    # Append (connection_id, student_id, alumni_id, old_status, new_status) rows to
+    # connection_event. Callers run this before their commit so the log and
+    # the status change land in the same transaction.
+    if changes:
+        cursor.executemany(
+            """
+            INSERT INTO connection_event (connection_id, student_id, alumni_id, old_status, new_status)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            changes
+        )
+
+
 # Get all connections with optional filtering by status, student, or alumni
 # Streamlit: Use requests.get('http://web-api:4000/connections') to get all connections
 #            Add ?status=pending&student_id=5 for filtering
 #            Display in a table showing student-alumni pairs
+#            Add ?format=arrow or ?format=parquet (or an Accept header) for columnar output
 @connections.route("/connections", methods=["GET"])
 def get_all_connections():
     try:
@@ -39,10 +59,11 @@ def get_all_connections():
         current_app.logger.debug(f'Executing query: {query} with params: {params}')
         cursor.execute(query, params)
         connections = cursor.fetchall()
+        description = cursor.description
         cursor.close()
         
         current_app.logger.info(f'Successfully retrieved {len(connections)} connections')
-        return jsonify(connections), 200
+        return rows_response(connections, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_connections: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -86,6 +107,7 @@ def get_connection(connection_id):
 #                "student_id": student_id, "alumni_id": alumni_id
 #            })
 #            Show success message with st.success()
+#            A 429 means the student sent too many requests recently (see Retry-After)
 @connections.route("/connections", methods=["POST"])
 def create_connection():
     try:
@@ -96,6 +118,17 @@ def create_connection():
         for field in required_fields:
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
+
+        try:
+            student_id = int(data["student_id"])
+        except (TypeError, ValueError):
+            return jsonify({"error": "student_id must be an integer"}), 400
+
+        allowed, retry_after = connection_throttle.check(student_id)
+        if not allowed:
+            current_app.logger.warning(f'Throttled connection requests from student {data["student_id"]}')
+            return jsonify({"error": "Too many connection requests, try again later",
+                            "retry_after": retry_after}), 429, {"Retry-After": str(retry_after)}
         
         cursor = db.get_db().cursor()
         
@@ -103,15 +136,19 @@ def create_connection():
         INSERT INTO connection (student_id, alumni_id, status)
         VALUES (%s, %s, %s)
         """
+        status = data.get("status", "pending")
         cursor.execute(query, (
             data["student_id"],
             data["alumni_id"],
-            data.get("status", "pending")
+            status
         ))
+        new_connection_id = cursor.lastrowid
+        log_status_changes(cursor, [(new_connection_id, data["student_id"], data["alumni_id"], None, status)])
         
         db.get_db().commit()
-        new_connection_id = cursor.lastrowid
         cursor.close()
+        invalidate_connection_map(data["student_id"])
+        mentorship_graph.set_edge(data["student_id"], data["alumni_id"], status == "accepted")
 
         return jsonify({"message": "Connection request created successfully", "connection_id": new_connection_id}), 201
 
@@ -131,9 +168,10 @@ def update_connection(connection_id):
         data = request.get_json()
         cursor = db.get_db().cursor()
 
-        # Check if connection exists
-        cursor.execute("SELECT * FROM connection WHERE connection_id = %s", (connection_id,))
-        if not cursor.fetchone():
+        # Check if connection exists (locked so the logged old_status is accurate)
+        cursor.execute("SELECT * FROM connection WHERE connection_id = %s FOR UPDATE", (connection_id,))
+        existing = cursor.fetchone()
+        if not existing:
             return jsonify({"error": "Connection not found"}), 404
 
         # Only status can be updated
@@ -153,8 +191,13 @@ def update_connection(connection_id):
 
         query = f"UPDATE connection SET {', '.join(update_fields)} WHERE connection_id = %s"
         cursor.execute(query, params)
+        if data.get("status") is not None and data["status"] != existing["status"]:
+            log_status_changes(cursor, [(connection_id, existing["student_id"], existing["alumni_id"], existing["status"], data["status"])])
         db.get_db().commit()
         cursor.close()
+        invalidate_connection_map(existing["student_id"])
+        if "status" in data:
+            mentorship_graph.set_edge(existing["student_id"], existing["alumni_id"], data["status"] == "accepted")
 
         return jsonify({"message": "Connection updated successfully"}), 200
 
@@ -162,6 +205,85 @@ def update_connection(connection_id):
         return jsonify({"error": str(e)}), 500
 
 
+# Accept/decline many connection requests at once
+# Streamlit: requests.post('http://web-api:4000/connections/bulk-update', json={
+#                "alumni_id": alumni_id, "connection_ids": [1, 2, 3], "status": "accepted"
+#            })
+#            Returns one result per ID: updated, unchanged, not_found or forbidden
+@connections.route("/connections/bulk-update", methods=["POST"])
+def bulk_update_connections():
+    try:
+        data = request.get_json()
+
+        required_fields = ["alumni_id", "connection_ids", "status"]
+        for field in required_fields:
+            if field not in data:
+                return jsonify({"error": f"Missing required field: {field}"}), 400
+
+        connection_ids = data["connection_ids"]
+        if not isinstance(connection_ids, list) or not connection_ids:
+            return jsonify({"error": "connection_ids must be a non-empty list"}), 400
+        try:
+            connection_ids = list(dict.fromkeys(int(cid) for cid in connection_ids))
+        except (TypeError, ValueError):
+            return jsonify({"error": "connection_ids must be integers"}), 400
+
+        alumni_id = data["alumni_id"]
+        status = data["status"]
+        conn = db.get_db()
+        cursor = conn.cursor()
+
+        # Lock the requested rows so ownership and old_status can't change under us
+        placeholders = ", ".join(["%s"] * len(connection_ids))
+        cursor.execute(
+            f"SELECT connection_id, student_id, alumni_id, status FROM connection "
+            f"WHERE connection_id IN ({placeholders}) FOR UPDATE",
+            connection_ids
+        )
+        found = {row['connection_id']: row for row in cursor.fetchall()}
+
+        results = {}
+        changes = []
+        for connection_id in connection_ids:
+            row = found.get(connection_id)
+            if row is None:
+                results[connection_id] = "not_found"
+            elif str(row['alumni_id']) != str(alumni_id):
+                results[connection_id] = "forbidden"
+            elif row['status'] == status:
+                results[connection_id] = "unchanged"
+            else:
+                results[connection_id] = "updated"
+                changes.append((connection_id, row['student_id'], row['alumni_id'], row['status'], status))
+
+        try:
+            if changes:
+                update_ids = [change[0] for change in changes]
+                placeholders = ", ".join(["%s"] * len(update_ids))
+                cursor.execute(
+                    f"UPDATE connection SET status = %s "
+                    f"WHERE connection_id IN ({placeholders}) AND alumni_id = %s",
+                    [status] + update_ids + [alumni_id]
+                )
+                log_status_changes(cursor, changes)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        cursor.close()
+        invalidate_connection_map(*{change[1] for change in changes})
+        for change in changes:
+            mentorship_graph.set_edge(change[1], change[2], status == "accepted")
+
+        return jsonify({
+            "message": f"Updated {len(changes)} of {len(connection_ids)} connections",
+            "results": [{"connection_id": cid, "result": results[cid]} for cid in connection_ids]
+        }), 200
+
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
 # Delete/remove connection
 # Streamlit: Add a confirmation dialog, then:
 #            requests.delete(f'http://web-api:4000/connections/{connection_id}')
@@ -172,12 +294,15 @@ def delete_connection(connection_id):
         cursor = db.get_db().cursor()
 
         cursor.execute("SELECT * FROM connection WHERE connection_id = %s", (connection_id,))
-        if not cursor.fetchone():
+        existing = cursor.fetchone()
+        if not existing:
             return jsonify({"error": "Connection not found"}), 404
         
         cursor.execute("DELETE FROM connection WHERE connection_id = %s", (connection_id,))
         db.get_db().commit()
         cursor.close()
+        invalidate_connection_map(existing["student_id"])
+        mentorship_graph.set_edge(existing["student_id"], existing["alumni_id"], False)
         
         return jsonify({"message": "Connection deleted successfully"}), 200
     except Error as e:
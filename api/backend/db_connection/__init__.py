@@ -2,9 +2,39 @@
 # This file creates a shared DB connection resource
 #------------------------------------------------------------
 from flaskext.mysql import MySQL
-from pymysql import cursors
 
+from backend.cache.query_cache import CachingConnection, CachingDictCursor
 
-# the parameter instructs the connection to return data 
-# as a dictionary object. 
-db = MySQL(cursorclass=cursors.DictCursor)
\ No newline at end of file
+
+class CachingMySQL(MySQL):
+    """
+    flaskext.mysql's MySQL, but every connection (db.get_db() and
+    db.connect()) is a CachingConnection, so the query cache sees each
+    write, commit and rollback.
+    """
+
+    # app.config key -> pymysql.connect() argument, as in MySQL.connect()
+    CONFIG_ARGS = (
+        ("MYSQL_DATABASE_HOST", "host"),
+        ("MYSQL_DATABASE_PORT", "port"),
+        ("MYSQL_DATABASE_USER", "user"),
+        ("MYSQL_DATABASE_PASSWORD", "password"),
+        ("MYSQL_DATABASE_DB", "db"),
+        ("MYSQL_DATABASE_CHARSET", "charset"),
+        ("MYSQL_USE_UNICODE", "use_unicode"),
+        ("MYSQL_DATABASE_SOCKET", "unix_socket"),
+        ("MYSQL_SQL_MODE", "sql_mode"),
+        ("MYSQL_CURSORCLASS", "cursorclass"),
+        ("MYSQL_SSL_CA", "ssl"),
+    )
+
+    def connect(self):
+        for key, arg in self.CONFIG_ARGS:
+            if self.app.config[key]:
+                self.connect_args[arg] = self.app.config[key]
+        return CachingConnection(**self.connect_args)
+
+
+# the parameter instructs the connection to return data
+# as a dictionary object. SELECTs through it use the query cache
+db = CachingMySQL(cursorclass=CachingDictCursor)
@@ -0,0 +1,119 @@
+from flask import Blueprint, Response, jsonify, request, current_app
+from backend.db_connection import db
+from mysql.connector import Error
+from pymysql import cursors, MySQLError
+
+export = Blueprint("export", __name__)
+
+# resource -> (table, primary key, columns that may be filtered on with ?column=value)
+# Names are fixed here and never taken from the request
+EXPORTS = {
+    "students": ("student", "student_id", ("major_id", "location_id", "graduation_year")),
+    "alumni": ("alumni", "alumni_id", ("company_id", "location_id", "field")),
+    "connections": ("connection", "connection_id", ("student_id", "alumni_id", "status")),
+    "connection-events": ("connection_event", "event_id", ("connection_id", "student_id", "alumni_id", "new_status")),
+    "sessions": ("session", "session_id", ("student_id", "alumni_id", "status", "session_date")),
+    "applications": ("application", "application_id", ("student_id", "status")),
+    "reports": ("report", "report_id", ("reporter_type", "reported_user_type", "status")),
+    "job-postings": ("job_posting", "posting_id", ("alumni_id", "status", "preferred_major")),
+}
+
+# Rows serialized per chunk handed to the WSGI server
+ROWS_PER_CHUNK = 500
+
+
+def export_query(resource, args):
+    """(query, params) for one resource with the request's filters applied."""
+    table, key, filterable = EXPORTS[resource]
+    query = f"SELECT * FROM {table} WHERE 1=1"
+    params = []
+    for column in filterable:
+        value = args.get(column)
+        if value is not None:
+            query += f" AND {column} = %s"
+            params.append(value)
+    return query + f" ORDER BY {key}", params
+
+
+def open_rows(query, params):
+    """
+    Run the query on a private connection and read its first row, so SQL
+    errors surface before the response starts. Returns (conn, cursor,
+    first row or None) for stream_rows(), which closes the connection.
+
+    Uses an unbuffered SSDictCursor, so MySQL streams rows as they are
+    read. The request's db.get_db() connection is gone by the time the
+    response body is produced.
+    """
+    conn = db.connect()
+    try:
+        cursor = conn.cursor(cursors.SSDictCursor)
+        cursor.execute(query, params)
+        return conn, cursor, cursor.fetchone()
+    except BaseException:
+        conn.close()
+        raise
+
+
+def close_rows(conn):
+    """Close open_rows()'s connection; safe to call more than once."""
+    if conn.open:
+        conn.close()
+
+
+def stream_rows(conn, cursor, first, encode_row):
+    """
+    Yield the rows from open_rows() as encoded chunks without ever holding
+    more than ROWS_PER_CHUNK of them.
+    """
+    try:
+        # First row on its own so the client sees bytes right away
+        batch = [first] if first is not None else []
+        while batch:
+            yield "".join(encode_row(item) for item in batch)
+            batch = cursor.fetchmany(ROWS_PER_CHUNK)
+        cursor.close()
+    finally:
+        # If the client went away mid-stream this drops the unread result
+        # with the connection instead of draining it
+        close_rows(conn)
+
+
+# Stream a whole table as newline-delimited JSON (one object per line)
+# Streamlit / analysts: requests.get('http://web-api:4000/export/sessions.ndjson', stream=True)
+#            then for line in response.iter_lines(): json.loads(line)
+#            Same optional filters as the list endpoints, e.g. ?status=completed
+#            Resources: students, alumni, connections, connection-events, sessions,
+#            applications, reports, job-postings
+@export.route("/export/<resource>.ndjson", methods=["GET"])
+def export_ndjson(resource):
+    try:
+        if resource not in EXPORTS:
+            return jsonify({"error": f"Unknown resource: {resource}",
+                            "resources": sorted(EXPORTS)}), 404
+        current_app.logger.info(f'Starting NDJSON export of {resource}')
+
+        query, params = export_query(resource, request.args)
+        dumps = current_app.json.dumps
+
+        def encode_row(row):
+            return dumps(row, separators=(",", ":")) + "\n"
+
+        conn, cursor, first = open_rows(query, params)
+        response = Response(
+            stream_rows(conn, cursor, first, encode_row),
+            mimetype="application/x-ndjson",
+            headers={
+                "Content-Disposition": f'attachment; filename="{resource}.ndjson"',
+                "Cache-Control": "no-store",
+                # Don't let a reverse proxy buffer the stream
+                "X-Accel-Buffering": "no",
+            },
+        )
+        # The body may never be iterated (HEAD, or a wrapper that stops before
+        # the first chunk), and then stream_rows' finally never runs
+        response.call_on_close(lambda: close_rows(conn))
+        return response
+    except (Error, MySQLError) as e:
+        current_app.logger.error(f'Database error in export_ndjson: {str(e)}')
+        return jsonify({"error": str(e)}), 500
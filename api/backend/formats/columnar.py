@@ -0,0 +1,100 @@
+#------------------------------------------------------------
+# Content negotiation for list endpoints: JSON (default),
+# Apache Arrow IPC stream or Parquet
+#------------------------------------------------------------
+import io
+import decimal
+
+from flask import Response, jsonify, request
+from pymysql.constants import FIELD_TYPE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; without it only JSON is served
+    pa = None
+
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MIMETYPE = "application/vnd.apache.parquet"
+FORMAT_MIMETYPES = {"json": "application/json", "arrow": ARROW_MIMETYPE, "parquet": PARQUET_MIMETYPE}
+
+_INT_TYPES = {FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.INT24,
+              FIELD_TYPE.LONGLONG, FIELD_TYPE.YEAR}
+_FLOAT_TYPES = {FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE, FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+_TEXT_TYPES = {FIELD_TYPE.VARCHAR, FIELD_TYPE.VAR_STRING, FIELD_TYPE.STRING, FIELD_TYPE.ENUM,
+               FIELD_TYPE.TINY_BLOB, FIELD_TYPE.MEDIUM_BLOB, FIELD_TYPE.LONG_BLOB, FIELD_TYPE.BLOB}
+
+
+def requested_format():
+    """'json', 'arrow' or 'parquet' from ?format= or, failing that, the Accept header."""
+    fmt = request.args.get("format")
+    if fmt in FORMAT_MIMETYPES:
+        return fmt
+    # Listed JSON-first so "*/*" (what requests sends by default) stays JSON
+    best = request.accept_mimetypes.best_match(
+        [FORMAT_MIMETYPES["json"], ARROW_MIMETYPE, PARQUET_MIMETYPE], default=FORMAT_MIMETYPES["json"]
+    )
+    return {mimetype: name for name, mimetype in FORMAT_MIMETYPES.items()}[best]
+
+
+def _arrow_type(type_code):
+    # Types straight from the MySQL column metadata, so an all-NULL or empty
+    # column still gets the right type; None means "let pyarrow infer"
+    if type_code in _INT_TYPES:
+        return pa.int64()
+    if type_code in _FLOAT_TYPES:
+        return pa.float64()
+    if type_code == FIELD_TYPE.DATE:
+        return pa.date32()
+    if type_code in (FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP):
+        return pa.timestamp("us")
+    if type_code == FIELD_TYPE.TIME:
+        return pa.duration("us")
+    if type_code in _TEXT_TYPES:
+        return pa.string()
+    return None
+
+
+def _coerce(values, arrow_type):
+    if arrow_type == pa.float64():
+        return [float(v) if isinstance(v, decimal.Decimal) else v for v in values]
+    return values
+
+
+def rows_to_table(rows, description=None):
+    """Build an Arrow table column by column, typed from cursor.description where known."""
+    types = {col[0]: _arrow_type(col[1]) for col in (description or ())}
+    names = list(rows[0].keys()) if rows else [col[0] for col in (description or ())]
+    arrays = []
+    for name in names:
+        arrow_type = types.get(name)
+        values = [row.get(name) for row in rows]
+        if arrow_type is None:
+            arrays.append(pa.array(values))
+        else:
+            arrays.append(pa.array(_coerce(values, arrow_type), type=arrow_type))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def rows_response(rows, description=None):
+    """
+    Return `rows` (a list of dicts from a DictCursor) in the format the
+    client asked for. JSON stays the default and is identical to
+    jsonify(rows).
+    """
+    fmt = requested_format()
+    if fmt == "json":
+        return jsonify(rows), 200
+
+    if pa is None:
+        return jsonify({"error": f"{fmt} output needs pyarrow installed on the API server"}), 406
+
+    table = rows_to_table(rows, description)
+    sink = io.BytesIO()
+    if fmt == "arrow":
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, sink)
+    return Response(sink.getvalue(), status=200, mimetype=FORMAT_MIMETYPES[fmt],
+                    headers={"Vary": "Accept"})
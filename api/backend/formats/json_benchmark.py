@@ -0,0 +1,84 @@
+#------------------------------------------------------------
+# Microbenchmark: jsonify of session-like rows through Flask's
+# default provider (plus the old per-row timedelta loop) vs the
+# ISO-8601 providers in json_provider
+#
+#   cd api && python -m backend.formats.json_benchmark [rows] [repeats]
+#------------------------------------------------------------
+import sys
+import timeit
+import datetime
+import decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from backend.formats.json_provider import IsoJSONProvider, OrjsonProvider, orjson
+
+
+def make_rows(n):
+    """Rows shaped like `SELECT s.*, st.name, a.name FROM session ...` through a DictCursor."""
+    base = datetime.datetime(2025, 1, 6, 8, 0)
+    return [
+        {
+            "session_id": i,
+            "student_id": i % 500 + 1,
+            "alumni_id": i % 120 + 1,
+            "session_date": (base + datetime.timedelta(days=i % 365)).date(),
+            "session_time": datetime.timedelta(hours=9 + i % 8, minutes=30 * (i % 2)),
+            "duration_minutes": 30,
+            "topic": f"Resume review #{i}",
+            "status": ("scheduled", "completed", "cancelled")[i % 3],
+            "rating": decimal.Decimal("4.5") if i % 3 == 1 else None,
+            "created_at": base + datetime.timedelta(minutes=i),
+            "student_name": f"Student {i % 500 + 1}",
+            "alumni_name": f"Alumni {i % 120 + 1}",
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_jsonify(app, rows):
+    # What the routes did before: stringify TIME values row by row, then jsonify
+    for row in rows:
+        if row['session_time'] is not None:
+            row['session_time'] = str(row['session_time'])
+    return app.json.response(rows).get_data()
+
+
+def main(n=5000, repeats=20):
+    rows = make_rows(n)
+    cases = []
+
+    app = Flask("bench-default")
+    app.json = DefaultJSONProvider(app)
+    # Fresh copies each time so the loop really has timedeltas to convert
+    cases.append(("default + per-row str()", app,
+                  lambda a: legacy_jsonify(a, [dict(r) for r in rows])))
+
+    app = Flask("bench-iso")
+    app.json = IsoJSONProvider(app)
+    cases.append(("IsoJSONProvider (stdlib)", app, lambda a: a.json.response([dict(r) for r in rows]).get_data()))
+
+    if orjson is not None:
+        app = Flask("bench-orjson")
+        app.json = OrjsonProvider(app)
+        cases.append(("OrjsonProvider", app, lambda a: a.json.response([dict(r) for r in rows]).get_data()))
+    else:
+        print("orjson not installed; skipping OrjsonProvider")
+
+    # Baseline for the row copies every case pays for
+    copy_cost = min(timeit.repeat(lambda: [dict(r) for r in rows], number=1, repeat=repeats))
+
+    print(f"{n} rows, best of {repeats}")
+    baseline = None
+    for label, app, fn in cases:
+        with app.app_context():
+            size = len(fn(app))
+            best = min(timeit.repeat(lambda: fn(app), number=1, repeat=repeats)) - copy_cost
+        baseline = baseline or best
+        print(f"  {label:<26} {best * 1000:8.2f} ms  {size / 1024:8.1f} KiB  x{baseline / best:5.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,98 @@
+#------------------------------------------------------------
+# Flask JSON provider: ISO-8601 dates/times, encoded by orjson
+# when it is installed
+#------------------------------------------------------------
+import datetime
+import decimal
+import json
+import uuid
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is the fallback
+    orjson = None
+
+
+def _time_of_day(value):
+    # MySQL TIME columns arrive from pymysql as timedelta; send them as
+    # ISO-8601 "HH:MM:SS[.ffffff]" (TIME may exceed 24h or be negative, so
+    # hours are not wrapped)
+    micros = (value.days * 86400 + value.seconds) * 1_000_000 + value.microseconds
+    sign = "-" if micros < 0 else ""
+    seconds, micros = divmod(abs(micros), 1_000_000)
+    text = f"{sign}{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{text}.{micros:06d}" if micros else text
+
+
+def _default(o):
+    # Only called for objects the encoder doesn't handle itself
+    if isinstance(o, datetime.timedelta):
+        return _time_of_day(o)
+    if isinstance(o, (datetime.date, datetime.time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if hasattr(o, "tolist"):  # numpy scalars and arrays
+        return o.tolist()
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """
+    Flask's stdlib provider with date, datetime, time and timedelta written
+    as ISO-8601 ("2025-03-01", "2025-03-01T09:30:00", "09:30:00") instead of
+    the RFC 1123 "Sat, 01 Mar 2025 00:00:00 GMT" Flask uses by default.
+    Used when orjson isn't installed.
+    """
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(IsoJSONProvider):
+    """
+    Same output format as IsoJSONProvider, encoded by orjson: date, datetime
+    and time are serialized natively in C, and the default hook only runs
+    for the odd timedelta/Decimal value, so a route can jsonify its
+    DictCursor rows straight away.
+
+    Keys are sorted like Flask's default provider; responses are indented
+    in debug mode unless `compact` is set, also like the default.
+    """
+
+    def _options(self, sort_keys=None, indent=None):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumpb(self, obj, **kwargs):
+        """Serialize to bytes. Only sort_keys and indent are honoured; output is always compact otherwise."""
+        return orjson.dumps(obj, default=_default,
+                            option=self._options(kwargs.get("sort_keys"), kwargs.get("indent")))
+
+    def dumps(self, obj, **kwargs):
+        return self.dumpb(obj, **kwargs).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = not self.compact if self.compact is not None else self._app.debug
+        body = orjson.dumps(obj, default=_default, option=self._options(indent=indent)) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_app(app):
+    """Install the fastest available ISO-8601 provider as app.json."""
+    provider = OrjsonProvider if orjson is not None else IsoJSONProvider
+    app.json = provider(app)
+    app.logger.info(f'JSON provider: {provider.__name__}')
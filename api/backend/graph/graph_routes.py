@@ -0,0 +1,88 @@
+from flask import Blueprint, jsonify, request, current_app
+from backend.db_connection import db
+from backend.graph.mentorship_graph import mentorship_graph
+from mysql.connector import Error
+
+graph = Blueprint("graph", __name__)
+
+
+def _attach_alumni_details(cursor, entries):
+    # Fill in names for a short ranked list with a single query
+    if not entries:
+        return entries
+    ids = [entry["alumni_id"] for entry in entries]
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(
+        f"SELECT alumni_id, name, current_role, field FROM alumni WHERE alumni_id IN ({placeholders})",
+        ids
+    )
+    details = {row['alumni_id']: row for row in cursor.fetchall()}
+    for entry in entries:
+        entry.update(details.get(entry["alumni_id"], {}))
+    return entries
+
+
+# Get suggested mentors: alumni who mentor students that share a mentor with this student
+# Streamlit: Use requests.get(f'http://web-api:4000/graph/students/{student_id}/introductions')
+#            Add ?limit=5 to control how many suggestions come back
+#            Display as "Students like you also connect with..."
+@graph.route("/graph/students/<int:student_id>/introductions", methods=["GET"])
+def get_introductions(student_id):
+    try:
+        current_app.logger.info('Starting get_introductions request')
+        limit = request.args.get("limit", 10, type=int)
+
+        result = mentorship_graph.introductions(student_id, limit=limit)
+
+        cursor = db.get_db().cursor()
+        _attach_alumni_details(cursor, result["introductions"])
+        cursor.close()
+
+        return jsonify(result), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_introductions: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# Get a mentor's reach: direct mentees, co-mentors and second-degree students
+# Streamlit: Use requests.get(f'http://web-api:4000/graph/alumni/{alumni_id}/reach')
+#            Display reach metrics and the most-overlapping co-mentors
+@graph.route("/graph/alumni/<int:alumni_id>/reach", methods=["GET"])
+def get_mentor_reach(alumni_id):
+    try:
+        current_app.logger.info('Starting get_mentor_reach request')
+        limit = request.args.get("limit", 10, type=int)
+
+        result = mentorship_graph.mentor_reach(alumni_id, limit=limit)
+
+        cursor = db.get_db().cursor()
+        _attach_alumni_details(cursor, result["top_overlaps"])
+        cursor.close()
+
+        return jsonify(result), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_mentor_reach: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# Get the mentee overlap between two mentors
+# Streamlit: Use requests.get(f'http://web-api:4000/graph/alumni/{alumni_a}/overlap/{alumni_b}')
+@graph.route("/graph/alumni/<int:alumni_a>/overlap/<int:alumni_b>", methods=["GET"])
+def get_mentor_overlap(alumni_a, alumni_b):
+    try:
+        return jsonify(mentorship_graph.overlap(alumni_a, alumni_b)), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_mentor_overlap: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# Get connected-component sizes of the accepted-connection graph
+# Streamlit: Use requests.get('http://web-api:4000/graph/components')
+#            Display how fragmented the mentorship network is
+@graph.route("/graph/components", methods=["GET"])
+def get_components():
+    try:
+        return jsonify(mentorship_graph.component_sizes()), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_components: {str(e)}')
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,283 @@
+#------------------------------------------------------------
+# In-memory student <-> alumni graph of accepted connections,
+# stored as CSR adjacency arrays for vectorized traversal
+#------------------------------------------------------------
+import threading
+import logging
+
+import numpy as np
+from pymysql import cursors
+
+from backend.db_connection import db
+
+logger = logging.getLogger(__name__)
+
+EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _edge_codes(student_ids, alumni_ids):
+    # Pack a (student, alumni) pair into one int64 so edge sets can use np.isin
+    return (np.asarray(student_ids, dtype=np.int64) << 32) | np.asarray(alumni_ids, dtype=np.int64)
+
+
+def _build_csr(src, dst):
+    # Rows are node ids (dense, 0..max); columns sorted within each row
+    size = int(src.max()) + 1 if len(src) else 0
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=size), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def _gather(indptr, indices, nodes):
+    # All (node, neighbour) pairs for the given nodes, without a Python loop
+    nodes = nodes[(nodes >= 0) & (nodes < len(indptr) - 1)]
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return EMPTY, EMPTY
+    src = np.repeat(nodes, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return src, indices[np.repeat(starts, counts) + offsets]
+
+
+class MentorshipGraph:
+    """
+    Bipartite graph of accepted connections.
+
+    The bulk of the graph is an immutable CSR pair (student -> alumni and
+    alumni -> student). Changes made through the API are applied as a small
+    delta of added/removed edges that every traversal merges in, and the
+    delta is folded into a fresh CSR once it grows past `compact_threshold`
+    edges or when a whole-graph query (components) needs it.
+
+    The graph loads lazily on first use; invalidate() forces a reload,
+    which the routes use for cascading deletes of students/alumni.
+    """
+
+    def __init__(self, compact_threshold=50000):
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._loaded = False
+        self.version = 0
+        self._components = None
+        self._reset(EMPTY, EMPTY)
+
+    def _reset(self, students, alumni):
+        self._codes = np.sort(_edge_codes(students, alumni))
+        self._s_indptr, self._s_indices = _build_csr(students, alumni)
+        self._a_indptr, self._a_indices = _build_csr(alumni, students)
+        self._added = set()
+        self._removed = set()
+        self._delta_arrays = None
+
+    # ---- loading and updates -------------------------------------------
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        conn = db.connect()
+        try:
+            cursor = conn.cursor(cursors.SSCursor)
+            cursor.execute("SELECT student_id, alumni_id FROM connection WHERE status = 'accepted'")
+            edges = np.fromiter(cursor, dtype=[("s", np.int64), ("a", np.int64)])
+            cursor.close()
+        finally:
+            conn.close()
+        self._reset(edges["s"], edges["a"])
+        self._loaded = True
+        self.version += 1
+        self._components = None
+        logger.info(f'mentorship graph: loaded {len(edges)} edges')
+
+    def _in_base(self, code):
+        i = np.searchsorted(self._codes, code)
+        return i < len(self._codes) and self._codes[i] == code
+
+    def set_edge(self, student_id, alumni_id, accepted):
+        """Record that a connection is (or is no longer) accepted."""
+        with self._lock:
+            if not self._loaded:
+                # Nothing to patch; the first query will read current state
+                return
+            code = int(_edge_codes(student_id, alumni_id))
+            in_base = self._in_base(code)
+            if accepted:
+                self._removed.discard(code)
+                if not in_base:
+                    self._added.add(code)
+            else:
+                self._added.discard(code)
+                if in_base:
+                    self._removed.add(code)
+            self._delta_arrays = None
+            self._components = None
+            self.version += 1
+
+    def _compact(self):
+        if not self._added and not self._removed:
+            return
+        codes = self._codes
+        if self._removed:
+            codes = codes[~np.isin(codes, np.fromiter(self._removed, dtype=np.int64))]
+        if self._added:
+            codes = np.concatenate([codes, np.fromiter(self._added, dtype=np.int64)])
+        self._reset(codes >> 32, codes & 0xFFFFFFFF)
+
+    def _prepare(self):
+        self._ensure_loaded()
+        if len(self._added) + len(self._removed) > self.compact_threshold:
+            self._compact()
+        if self._delta_arrays is None:
+            added = np.fromiter(self._added, dtype=np.int64, count=len(self._added))
+            removed = np.fromiter(self._removed, dtype=np.int64, count=len(self._removed))
+            self._delta_arrays = (added >> 32, added & 0xFFFFFFFF, np.sort(removed))
+
+    # ---- traversal -----------------------------------------------------
+
+    def _expand(self, nodes, from_students):
+        """(node, neighbour) pairs for every node, base CSR plus delta."""
+        nodes = np.unique(np.asarray(nodes, dtype=np.int64))
+        added_s, added_a, removed = self._delta_arrays
+        if from_students:
+            src, dst = _gather(self._s_indptr, self._s_indices, nodes)
+            codes = _edge_codes(src, dst)
+            extra = np.isin(added_s, nodes)
+            extra_src, extra_dst = added_s[extra], added_a[extra]
+        else:
+            src, dst = _gather(self._a_indptr, self._a_indices, nodes)
+            codes = _edge_codes(dst, src)
+            extra = np.isin(added_a, nodes)
+            extra_src, extra_dst = added_a[extra], added_s[extra]
+        if len(removed):
+            keep = ~np.isin(codes, removed)
+            src, dst = src[keep], dst[keep]
+        return np.concatenate([src, extra_src]), np.concatenate([dst, extra_dst])
+
+    def mentors_of(self, student_id):
+        with self._lock:
+            self._prepare()
+            return np.unique(self._expand([student_id], True)[1])
+
+    def introductions(self, student_id, limit=10):
+        """
+        Alumni the student isn't connected to but who mentor the student's
+        peers (other students sharing at least one of their mentors),
+        ranked by the number of such peers.
+        """
+        with self._lock:
+            self._prepare()
+            mentors = np.unique(self._expand([student_id], True)[1])
+            peers = np.unique(self._expand(mentors, False)[1])
+            peers = peers[peers != student_id]
+            peer_src, candidates = self._expand(peers, True)
+            keep = ~np.isin(candidates, mentors)
+            pairs = np.unique(_edge_codes(peer_src[keep], candidates[keep]))
+
+        # One row per (peer, candidate) pair, so counts are distinct peers
+        alumni, counts = np.unique(pairs & 0xFFFFFFFF, return_counts=True)
+        top = np.argsort(-counts, kind="stable")[:limit]
+        return {
+            "mentor_count": int(len(mentors)),
+            "peer_count": int(len(peers)),
+            "introductions": [
+                {"alumni_id": int(alumni[i]), "shared_peers": int(counts[i])} for i in top
+            ],
+        }
+
+    def mentor_reach(self, alumni_id, limit=10):
+        """
+        Direct mentees, co-mentors (alumni sharing a mentee) and the
+        students those co-mentors reach, plus the most-overlapping co-mentors.
+        """
+        with self._lock:
+            self._prepare()
+            mentees = np.unique(self._expand([alumni_id], False)[1])
+            _, co_mentors = self._expand(mentees, True)
+            co_mentors = co_mentors[co_mentors != alumni_id]
+            second_degree = np.unique(self._expand(np.unique(co_mentors), False)[1])
+            second_degree = second_degree[~np.isin(second_degree, mentees)]
+
+        # Each (mentee, co-mentor) edge appears once, so counts are shared mentees
+        overlap_ids, shared = np.unique(co_mentors, return_counts=True)
+        top = np.argsort(-shared, kind="stable")[:limit]
+        return {
+            "alumni_id": alumni_id,
+            "direct_mentees": int(len(mentees)),
+            "co_mentors": int(len(overlap_ids)),
+            "second_degree_students": int(len(second_degree)),
+            "total_reach": int(len(mentees) + len(second_degree)),
+            "top_overlaps": [
+                {"alumni_id": int(overlap_ids[i]), "shared_mentees": int(shared[i])} for i in top
+            ],
+        }
+
+    def overlap(self, alumni_a, alumni_b):
+        with self._lock:
+            self._prepare()
+            src, mentees = self._expand([alumni_a, alumni_b], False)
+        a = np.unique(mentees[src == alumni_a])
+        b = np.unique(mentees[src == alumni_b])
+        shared = np.intersect1d(a, b, assume_unique=True)
+        union = len(a) + len(b) - len(shared)
+        return {
+            "alumni_a": alumni_a,
+            "alumni_b": alumni_b,
+            "mentees_a": int(len(a)),
+            "mentees_b": int(len(b)),
+            "shared_mentees": int(len(shared)),
+            "shared_student_ids": shared.tolist(),
+            "jaccard": round(len(shared) / union, 4) if union else 0.0,
+        }
+
+    def component_sizes(self):
+        """
+        Sizes of the connected components among students/alumni that have at
+        least one accepted connection. Computed with vectorized min-label
+        propagation plus pointer jumping, and cached until the graph changes.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._compact()
+            self._delta_arrays = None
+            if self._components is not None:
+                return self._components
+
+            students = self._codes >> 32
+            alumni = self._codes & 0xFFFFFFFF
+            # Alumni nodes are numbered after every student node
+            offset = int(students.max()) + 1 if len(students) else 0
+            u, v = students, alumni + offset
+            labels = np.arange(offset + (int(alumni.max()) + 1 if len(alumni) else 0), dtype=np.int64)
+            while True:
+                before = labels.copy()
+                np.minimum.at(labels, u, labels[v])
+                np.minimum.at(labels, v, labels[u])
+                while True:
+                    jumped = labels[labels]
+                    if np.array_equal(jumped, labels):
+                        break
+                    labels = jumped
+                if np.array_equal(labels, before):
+                    break
+
+            nodes = np.unique(np.concatenate([u, v]))
+            _, sizes = np.unique(labels[nodes], return_counts=True)
+            sizes = np.sort(sizes)[::-1]
+            size_values, size_counts = np.unique(sizes, return_counts=True)
+            self._components = {
+                "component_count": int(len(sizes)),
+                "node_count": int(len(nodes)),
+                "edge_count": int(len(self._codes)),
+                "largest": sizes[:10].tolist(),
+                "size_distribution": {int(s): int(c) for s, c in zip(size_values, size_counts)},
+            }
+            return self._components
+
+
+mentorship_graph = MentorshipGraph()
@@ -0,0 +1,158 @@
+#------------------------------------------------------------
+# Pushes new job postings into the inboxes of students whose
+# major and class year fit the posting
+#------------------------------------------------------------
+import time
+import logging
+import threading
+from datetime import date
+
+import numpy as np
+from pymysql import cursors
+
+from backend.background.background_worker import BackgroundWorker, start_on_first_request
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany() call; pymysql folds each call into multi-row INSERTs
+INSERT_BATCH_SIZE = 5000
+
+
+def graduation_year_for(year_of_study, today=None):
+    """
+    job_posting.preferred_year is a year of study (1 = first-year ... 4 = senior);
+    students store graduation_year. Academic years roll over in September.
+    Values that already look like a calendar year are passed through.
+    """
+    if year_of_study is None or year_of_study > 100:
+        return year_of_study
+    today = today or date.today()
+    current_class_year = today.year + 1 if today.month >= 9 else today.year
+    return current_class_year + 4 - year_of_study
+
+
+class StudentMatchIndex:
+    """
+    student_ids grouped by (major_id, graduation_year), plus major name ->
+    major_id, so matching a posting is a dictionary lookup rather than a
+    student table scan. Built on first use; the student routes call
+    invalidate() when students are added, changed or removed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups = None
+        self._majors = {}
+
+    def invalidate(self):
+        with self._lock:
+            self._groups = None
+
+    def _build(self, conn):
+        cursor = conn.cursor(cursors.SSCursor)
+        cursor.execute("SELECT student_id, COALESCE(major_id, 0), COALESCE(graduation_year, 0) FROM student")
+        rows = np.fromiter(cursor, dtype=[("s", np.int64), ("m", np.int64), ("y", np.int64)])
+        cursor.close()
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT major_id, major_name FROM major")
+        self._majors = {row['major_name'].strip().lower(): row['major_id'] for row in cursor.fetchall()}
+        cursor.close()
+
+        order = np.lexsort((rows["s"], rows["y"], rows["m"]))
+        rows = rows[order]
+        groups = {}
+        if len(rows):
+            keys = np.stack([rows["m"], rows["y"]], axis=1)
+            starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+            for start, end in zip(starts, np.r_[starts[1:], len(rows)]):
+                groups[(int(rows["m"][start]), int(rows["y"][start]))] = rows["s"][start:end]
+        self._groups = groups
+        logger.info(f'job matcher: indexed {len(rows)} students in {len(groups)} (major, year) groups')
+
+    def match(self, conn, preferred_major, preferred_year):
+        """student_ids eligible for a posting; None preferences match everyone."""
+        with self._lock:
+            if self._groups is None:
+                self._build(conn)
+            major_id = None
+            if preferred_major:
+                major_id = self._majors.get(preferred_major.strip().lower())
+                if major_id is None:
+                    return np.empty(0, dtype=np.int64)
+            grad_year = graduation_year_for(preferred_year)
+
+            if major_id is not None and grad_year is not None:
+                return self._groups.get((major_id, grad_year), np.empty(0, dtype=np.int64))
+            parts = [
+                ids for (m, y), ids in self._groups.items()
+                if (major_id is None or m == major_id) and (grad_year is None or y == grad_year)
+            ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+student_match_index = StudentMatchIndex()
+
+
+class JobMatchWorker(BackgroundWorker):
+    """
+    Delivers each new active posting to its matching students.
+
+    job_posting.matched_at doubles as the work queue: create_job_posting
+    leaves it NULL and calls wake(), and this thread picks up every active
+    posting with matched_at IS NULL, writes one job_match_inbox row per
+    student with batched INSERT IGNOREs, and stamps matched_at in the same
+    transaction. A posting interrupted by a restart is simply matched again,
+    and the unique (student_id, posting_id) key drops the duplicates.
+    """
+
+    def __init__(self):
+        super().__init__("job-matcher", interval=60)
+        self.metrics = {"postings_matched": 0, "notifications_written": 0, "last_match_seconds": None}
+
+    def init_app(self, app):
+        start_on_first_request(app, self)
+
+    def run_once(self):
+        conn = self.get_conn()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT posting_id, title, preferred_major, preferred_year FROM job_posting "
+            "WHERE matched_at IS NULL AND status = 'active' ORDER BY posting_id LIMIT 50"
+        )
+        postings = cursor.fetchall()
+        conn.commit()
+        cursor.close()
+        for posting in postings:
+            if self._stop.is_set():
+                return
+            self.deliver(conn, posting)
+
+    def deliver(self, conn, posting):
+        started = time.monotonic()
+        student_ids = student_match_index.match(conn, posting['preferred_major'], posting['preferred_year'])
+        posting_id = posting['posting_id']
+
+        cursor = conn.cursor()
+        try:
+            for i in range(0, len(student_ids), INSERT_BATCH_SIZE):
+                cursor.executemany(
+                    "INSERT IGNORE INTO job_match_inbox (student_id, posting_id) VALUES (%s, %s)",
+                    [(int(s), posting_id) for s in student_ids[i:i + INSERT_BATCH_SIZE]]
+                )
+            cursor.execute("UPDATE job_posting SET matched_at = NOW() WHERE posting_id = %s", (posting_id,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        elapsed = time.monotonic() - started
+        self.metrics["postings_matched"] += 1
+        self.metrics["notifications_written"] += len(student_ids)
+        self.metrics["last_match_seconds"] = round(elapsed, 3)
+        logger.info(f'job matcher: posting {posting_id} -> {len(student_ids)} students in {elapsed:.3f}s')
+
+
+job_matcher = JobMatchWorker()
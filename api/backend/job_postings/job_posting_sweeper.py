@@ -0,0 +1,49 @@
+#------------------------------------------------------------
+# Moves `active` job postings past their expires_at to `expired`
+#------------------------------------------------------------
+from backend.background.chunked_sweeper import ChunkedSweeper
+
+
+class JobPostingExpirySweeper(ChunkedSweeper):
+    """
+    Closes out postings whose expires_at has passed. Candidates are found
+    through idx_job_posting_status_id (status, posting_id, expires_at), so
+    each chunk is a short index range scan over live postings only.
+    """
+
+    def __init__(self):
+        super().__init__("job-posting-expiry-sweeper", interval=600, chunk_size=500)
+
+    def init_app(self, app):
+        self.interval = int(app.config.get("JOB_POSTING_SWEEP_INTERVAL_SECONDS", 600))
+        super().init_app(app)
+
+    def row_id(self, row):
+        return row['posting_id']
+
+    def select_chunk(self, cursor, last_id, limit):
+        cursor.execute(
+            """
+            SELECT posting_id
+            FROM job_posting
+            WHERE status = 'active' AND posting_id > %s AND expires_at <= NOW()
+            ORDER BY posting_id
+            LIMIT %s
+            """,
+            (last_id, limit)
+        )
+        return cursor.fetchall()
+
+    def apply_chunk(self, cursor, rows):
+        ids = [row['posting_id'] for row in rows]
+        placeholders = ", ".join(["%s"] * len(ids))
+        # Re-check status so a posting an alumni just closed or extended is left alone
+        cursor.execute(
+            f"UPDATE job_posting SET status = 'expired' "
+            f"WHERE posting_id IN ({placeholders}) AND status = 'active' AND expires_at <= NOW()",
+            ids
+        )
+        return cursor.rowcount
+
+
+job_posting_sweeper = JobPostingExpirySweeper()
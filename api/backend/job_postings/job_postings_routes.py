@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
 from mysql.connector import Error
+from backend.formats.columnar import rows_response
+from datetime import datetime
+from backend.job_postings.job_matcher import job_matcher
 
 job_postings = Blueprint("job_postings", __name__)
 
@@ -39,15 +42,69 @@ def get_all_job_postings():
         current_app.logger.debug(f'Executing query: {query} with params: {params}')
         cursor.execute(query, params)
         job_postings = cursor.fetchall()
+        description = cursor.description
         cursor.close()
         
         current_app.logger.info(f'Successfully retrieved {len(job_postings)} job postings')
-        return jsonify(job_postings), 200
+        return rows_response(job_postings, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_job_postings: {str(e)}')
         return jsonify({"error": str(e)}), 500
 
 
+# Get the live job board, newest first, one page at a time
+# Streamlit: Use requests.get('http://web-api:4000/job-postings/feed')
+#            Add ?preferred_major=Computer Science for filtering, ?limit=20 for page size
+#            For the next page pass the returned next_cursor back:
+#            ?before=<next_cursor.before>&before_id=<next_cursor.before_id>
+@job_postings.route("/job-postings/feed", methods=["GET"])
+def get_job_posting_feed():
+    try:
+        current_app.logger.info('Starting get_job_posting_feed request')
+        limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+        before = request.args.get("before")
+        before_id = request.args.get("before_id", type=int)
+        preferred_major = request.args.get("preferred_major")
+
+        # Keyset pagination on idx_job_posting_feed (status, date_posted, posting_id):
+        # each page is a backward range scan over active postings only
+        query = "SELECT * FROM job_posting WHERE status = 'active' AND expires_at > NOW()"
+        params = []
+        if before:
+            try:
+                before = datetime.strptime(before, "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                return jsonify({"error": "before must be formatted as YYYY-MM-DD HH:MM:SS"}), 400
+            if before_id is None:
+                return jsonify({"error": "before_id is required with before"}), 400
+            query += " AND date_posted <= %s AND (date_posted < %s OR posting_id < %s)"
+            params += [before, before, before_id]
+        if preferred_major:
+            query += " AND preferred_major = %s"
+            params.append(preferred_major)
+        query += " ORDER BY date_posted DESC, posting_id DESC LIMIT %s"
+        params.append(limit)
+
+        cursor = db.get_db().cursor()
+        cursor.execute(query, params)
+        postings = cursor.fetchall()
+        cursor.close()
+
+        next_cursor = None
+        if len(postings) == limit:
+            last = postings[-1]
+            next_cursor = {
+                "before": last['date_posted'].strftime("%Y-%m-%d %H:%M:%S"),
+                "before_id": last['posting_id'],
+            }
+
+        current_app.logger.info(f'Successfully retrieved {len(postings)} job postings for the feed')
+        return jsonify({"postings": postings, "next_cursor": next_cursor}), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_job_posting_feed: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
 # Get specific job posting by ID
 # Streamlit: Use requests.get(f'http://web-api:4000/job-postings/{posting_id}')
 #            Display full job posting details with alumni info
@@ -86,6 +143,7 @@ def get_job_posting(posting_id):
 #                "alumni_id": alumni_id, "title": "Software Engineer Intern",
 #                "description": "Looking for...", "preferred_major": "Computer Science"
 #            })
+#            Optional "expires_at": "YYYY-MM-DD HH:MM:SS" (defaults to JOB_POSTING_TTL_DAYS from now)
 @job_postings.route("/job-postings", methods=["POST"])
 def create_job_posting():
     try:
@@ -100,8 +158,8 @@ def create_job_posting():
         cursor = db.get_db().cursor()
         
         query = """
-        INSERT INTO job_posting (alumni_id, title, description, preferred_major, preferred_year, status)
-        VALUES (%s, %s, %s, %s, %s, %s)
+        INSERT INTO job_posting (alumni_id, title, description, preferred_major, preferred_year, status, expires_at)
+        VALUES (%s, %s, %s, %s, %s, %s, COALESCE(%s, NOW() + INTERVAL %s DAY))
         """
         cursor.execute(query, (
             data["alumni_id"],
@@ -109,12 +167,16 @@ def create_job_posting():
             data["description"],
             data.get("preferred_major"),
             data.get("preferred_year"),
-            data.get("status", "active")
+            data.get("status", "active"),
+            data.get("expires_at"),
+            current_app.config.get("JOB_POSTING_TTL_DAYS", 60)
         ))
         
         db.get_db().commit()
         new_posting_id = cursor.lastrowid
         cursor.close()
+        # Matching students are notified in the background (see job_matcher.py)
+        job_matcher.wake()
 
         return jsonify({"message": "Job posting created successfully", "posting_id": new_posting_id}), 201
 
@@ -139,7 +201,7 @@ def update_job_posting(posting_id):
             return jsonify({"error": "Job posting not found"}), 404
 
         # Build dynamic update query
-        allowed_fields = ["title", "description", "preferred_major", "preferred_year", "status"]
+        allowed_fields = ["title", "description", "preferred_major", "preferred_year", "status", "expires_at"]
         params = []
         update_fields = []
 
@@ -182,4 +244,64 @@ def delete_job_posting(posting_id):
         
         return jsonify({"message": "Job posting deleted successfully"}), 200
     except Error as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+# Get job postings pushed to a student because they match the student's major/year
+# Streamlit: Use requests.get(f'http://web-api:4000/students/{student_id}/job-matches')
+#            Add ?unread=true to only show new matches
+#            Display as "New postings for you" above the job board
+@job_postings.route("/students/<int:student_id>/job-matches", methods=["GET"])
+def get_job_matches(student_id):
+    try:
+        current_app.logger.info('Starting get_job_matches request')
+        cursor = db.get_db().cursor()
+
+        query = """
+            SELECT i.inbox_id, i.is_read, i.created_at AS matched_at, jp.*
+            FROM job_match_inbox i
+            JOIN job_posting jp ON jp.posting_id = i.posting_id
+            WHERE i.student_id = %s AND jp.status = 'active'
+        """
+        params = [student_id]
+        if request.args.get("unread", "").lower() == "true":
+            query += " AND i.is_read = FALSE"
+        query += " ORDER BY i.inbox_id DESC LIMIT 100"
+
+        cursor.execute(query, params)
+        matches = cursor.fetchall()
+        cursor.close()
+
+        return jsonify(matches), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_job_matches: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
+# Mark a student's job matches as read
+# Streamlit: requests.put(f'http://web-api:4000/students/{student_id}/job-matches/read', json={
+#                "posting_ids": [1, 2]
+#            })
+#            Omit posting_ids to mark everything read
+@job_postings.route("/students/<int:student_id>/job-matches/read", methods=["PUT"])
+def mark_job_matches_read(student_id):
+    try:
+        data = request.get_json(silent=True) or {}
+        posting_ids = data.get("posting_ids")
+
+        cursor = db.get_db().cursor()
+        query = "UPDATE job_match_inbox SET is_read = TRUE WHERE student_id = %s AND is_read = FALSE"
+        params = [student_id]
+        if posting_ids:
+            placeholders = ", ".join(["%s"] * len(posting_ids))
+            query += f" AND posting_id IN ({placeholders})"
+            params += list(posting_ids)
+        cursor.execute(query, params)
+        updated = cursor.rowcount
+        db.get_db().commit()
+        cursor.close()
+
+        return jsonify({"message": "Job matches marked as read", "updated": updated}), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in mark_job_matches_read: {str(e)}')
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,253 @@
+#------------------------------------------------------------
+# Session reminder scheduler: keeps upcoming sessions in a timer
+# wheel and enqueues reminders into the reminder_outbox table
+#------------------------------------------------------------
+import queue
+import logging
+from datetime import datetime, timedelta
+
+from pymysql import cursors
+
+from backend.background.background_worker import BackgroundWorker, start_on_first_request
+from backend.reminders.timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 60
+# Largest number of ids put into a single "IN (...)" list
+BATCH_SIZE = 1000
+
+
+def session_start(session_date, session_time):
+    # session_time comes back from pymysql as a timedelta; a session with
+    # no time set is treated as starting at midnight
+    start = datetime.combine(session_date, datetime.min.time())
+    if session_time is not None:
+        start += session_time
+    return start
+
+
+def to_tick(moment):
+    return int(moment.timestamp()) // TICK_SECONDS
+
+
+class ReminderScheduler(BackgroundWorker):
+    """
+    Loads upcoming `scheduled` sessions once at startup, then tracks changes
+    through notify_session_changed() instead of rescanning the session table.
+
+    Each (session, offset) pair is one timer whose key is
+    session_id * len(offsets) + offset_index, so the wheel only holds ints.
+    When timers fire, the affected sessions are re-read by primary key and
+    one outbox row per recipient is written with INSERT IGNORE, which makes
+    redelivery after a restart harmless.
+    """
+
+    def __init__(self):
+        super().__init__("reminder-scheduler", interval=TICK_SECONDS)
+        self.offsets = []
+        self.wheel = None
+        self.consumer = None
+        self._changes = queue.Queue()
+
+    def init_app(self, app, consumer=None):
+        offsets = app.config.get("REMINDER_OFFSETS_MINUTES", "1440,60")
+        self.offsets = sorted({int(x) for x in str(offsets).split(",") if x.strip()}, reverse=True)
+        self.consumer = consumer
+        start_on_first_request(app, self)
+
+    def notify_session_changed(self, session_id):
+        # Called by the session routes after commit; the scheduler thread
+        # picks the change up on its next pass
+        if not self.is_running():
+            return
+        self._changes.put(int(session_id))
+        self.wake()
+
+    def setup(self):
+        self.wheel = TimerWheel(to_tick(datetime.now()))
+        try:
+            self._load_upcoming()
+        except Exception:
+            # Retry the full load on the next pass rather than run half-loaded
+            self.wheel = None
+            raise
+
+    def _load_upcoming(self):
+        horizon = datetime.now() - timedelta(days=1)
+
+        # Unbuffered cursor so a million sessions never sit in memory at once
+        conn = self.get_conn()
+        cursor = conn.cursor(cursors.SSCursor)
+        cursor.execute(
+            "SELECT session_id, session_date, session_time FROM session "
+            "WHERE status = 'scheduled' AND session_date >= %s",
+            (horizon.date(),)
+        )
+        due = []
+        loaded = 0
+        for session_id, session_date, session_time in cursor:
+            due.extend(self._schedule_session(session_id, session_date, session_time))
+            loaded += 1
+        cursor.close()
+        conn.commit()
+
+        logger.info(f'reminder-scheduler: loaded {loaded} sessions, {len(self.wheel)} timers')
+        self._enqueue(due)
+
+    def run_once(self):
+        if self.wheel is None:
+            self.setup()
+        due = self._apply_changes()
+        due.extend(self.wheel.advance(to_tick(datetime.now())))
+        self._enqueue(due)
+
+    def _schedule_session(self, session_id, session_date, session_time):
+        # Returns the keys whose reminder time has already passed
+        start = session_start(session_date, session_time)
+        now = datetime.now()
+        due = []
+        for index, offset in enumerate(self.offsets):
+            key = session_id * len(self.offsets) + index
+            remind_at = start - timedelta(minutes=offset)
+            if start <= now:
+                self.wheel.cancel(key)
+            elif self.wheel.schedule(key, to_tick(remind_at)):
+                due.append(key)
+        return due
+
+    def _cancel_session(self, session_id):
+        for index in range(len(self.offsets)):
+            self.wheel.cancel(session_id * len(self.offsets) + index)
+
+    def _apply_changes(self):
+        changed = set()
+        while True:
+            try:
+                changed.add(self._changes.get_nowait())
+            except queue.Empty:
+                break
+        if not changed:
+            return []
+
+        conn = self.get_conn()
+        cursor = conn.cursor()
+        due = []
+        changed = list(changed)
+        for i in range(0, len(changed), BATCH_SIZE):
+            batch = changed[i:i + BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"SELECT session_id, session_date, session_time, status FROM session "
+                f"WHERE session_id IN ({placeholders})",
+                batch
+            )
+            rows = {row['session_id']: row for row in cursor.fetchall()}
+            for session_id in batch:
+                row = rows.get(session_id)
+                # Deleted, cancelled or completed sessions lose their timers
+                if row is None or row['status'] != 'scheduled':
+                    self._cancel_session(session_id)
+                else:
+                    due.extend(self._schedule_session(session_id, row['session_date'], row['session_time']))
+        cursor.close()
+        conn.commit()
+        return due
+
+    def _enqueue(self, keys):
+        if not keys:
+            return
+        conn = self.get_conn()
+        cursor = conn.cursor()
+        now = datetime.now()
+        written = 0
+        for i in range(0, len(keys), BATCH_SIZE):
+            batch = keys[i:i + BATCH_SIZE]
+            by_session = {}
+            for key in batch:
+                session_id, index = divmod(key, len(self.offsets))
+                by_session.setdefault(session_id, []).append(self.offsets[index])
+
+            placeholders = ", ".join(["%s"] * len(by_session))
+            cursor.execute(
+                f"SELECT session_id, student_id, alumni_id, session_date, session_time, topic, status "
+                f"FROM session WHERE session_id IN ({placeholders})",
+                list(by_session)
+            )
+            rows = []
+            for session in cursor.fetchall():
+                if session['status'] != 'scheduled':
+                    continue
+                start = session_start(session['session_date'], session['session_time'])
+                if start <= now:
+                    continue
+                topic = session['topic'] or 'your mentorship session'
+                message = f"Reminder: {topic} on {start.strftime('%Y-%m-%d %H:%M')}"
+                # If several offsets are overdue at once (e.g. a session booked
+                # an hour out), only the closest reminder is worth sending
+                offset = min(by_session[session['session_id']])
+                remind_at = start - timedelta(minutes=offset)
+                rows.append((session['session_id'], 'student', session['student_id'], offset, remind_at, message))
+                rows.append((session['session_id'], 'alumni', session['alumni_id'], offset, remind_at, message))
+
+            if rows:
+                cursor.executemany(
+                    """
+                    INSERT IGNORE INTO reminder_outbox
+                        (session_id, recipient_type, recipient_id, offset_minutes, remind_at, message)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    """,
+                    rows
+                )
+                written += cursor.rowcount
+        conn.commit()
+        cursor.close()
+
+        if written:
+            logger.info(f'reminder-scheduler: enqueued {written} reminders')
+            if self.consumer is not None:
+                self.consumer.wake()
+
+
+class OutboxConsumer(BackgroundWorker):
+    """
+    Stub delivery side of the outbox: logs each pending reminder and marks
+    it sent. Reads go through the (status, outbox_id) index, oldest first.
+    """
+
+    def __init__(self, interval=30):
+        super().__init__("reminder-outbox-consumer", interval=interval)
+
+    def init_app(self, app):
+        start_on_first_request(app, self)
+
+    def run_once(self):
+        conn = self.get_conn()
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(
+                "SELECT * FROM reminder_outbox WHERE status = 'pending' "
+                "ORDER BY outbox_id LIMIT %s",
+                (BATCH_SIZE,)
+            )
+            pending = cursor.fetchall()
+            if not pending:
+                break
+            for reminder in pending:
+                logger.info(
+                    f"reminder-outbox-consumer: to {reminder['recipient_type']} "
+                    f"{reminder['recipient_id']}: {reminder['message']}"
+                )
+            ids = [reminder['outbox_id'] for reminder in pending]
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(
+                f"UPDATE reminder_outbox SET status = 'sent', sent_at = NOW() "
+                f"WHERE outbox_id IN ({placeholders})",
+                ids
+            )
+            conn.commit()
+        cursor.close()
+
+
+outbox_consumer = OutboxConsumer()
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,49 @@
+from flask import Blueprint, jsonify, request, current_app
+from backend.db_connection import db
+from mysql.connector import Error
+
+reminders = Blueprint("reminders", __name__)
+
+# Get queued/sent session reminders with optional filtering by recipient or status
+# Streamlit: Use requests.get('http://web-api:4000/reminders?recipient_type=student&recipient_id=5')
+#            Display upcoming reminders in a notification list
+@reminders.route("/reminders", methods=["GET"])
+def get_reminders():
+    try:
+        current_app.logger.info('Starting get_reminders request')
+        cursor = db.get_db().cursor()
+
+        # Get optional query parameters for filtering
+        recipient_type = request.args.get("recipient_type")
+        recipient_id = request.args.get("recipient_id")
+        status = request.args.get("status")
+
+        current_app.logger.debug(f'Query parameters - recipient_type: {recipient_type}, recipient_id: {recipient_id}, status: {status}')
+
+        # Base query
+        query = "SELECT * FROM reminder_outbox WHERE 1=1"
+        params = []
+
+        # Add filters if provided
+        if recipient_type:
+            query += " AND recipient_type = %s"
+            params.append(recipient_type)
+        if recipient_id:
+            query += " AND recipient_id = %s"
+            params.append(recipient_id)
+        if status:
+            query += " AND status = %s"
+            params.append(status)
+
+        query += " ORDER BY remind_at DESC"
+
+        current_app.logger.debug(f'Executing query: {query} with params: {params}')
+        cursor.execute(query, params)
+        reminder_list = cursor.fetchall()
+        cursor.close()
+
+        current_app.logger.info(f'Successfully retrieved {len(reminder_list)} reminders')
+        return jsonify(reminder_list), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_reminders: {str(e)}')
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,123 @@
+#------------------------------------------------------------
+# Hierarchical timer wheel used by the session reminder scheduler
+#------------------------------------------------------------
+
+
+class TimerWheel:
+    """
+    Hierarchical hashed timer wheel keyed by integer tick.
+
+    Level 0 has one slot per tick; each higher level covers `slots` times
+    the span of the level below it. A timer lives in the lowest level whose
+    span contains both "now" and its deadline, and is cascaded down a level
+    each time the wheel below it wraps. schedule(), cancel() and firing are
+    O(1) per timer, and advancing costs O(ticks elapsed) regardless of how
+    many timers are pending, so there is never a scan over all timers.
+
+    Timers are stored as plain `key -> deadline_tick` dict entries (keys are
+    ints chosen by the caller), which keeps memory flat at millions of timers.
+
+    Args:
+        now_tick: the current tick when the wheel is created
+        bits: log2 of the number of slots per level (6 -> 64 slots)
+        levels: number of levels; span is 2 ** (bits * levels) ticks
+    """
+
+    def __init__(self, now_tick, bits=6, levels=4):
+        self.bits = bits
+        self.levels = levels
+        self.mask = (1 << bits) - 1
+        self.now = now_tick
+        # Slots are created lazily so an empty wheel costs almost nothing
+        self._wheel = [[None] * (1 << bits) for _ in range(levels)]
+        # key -> (level, slot), or (levels, 0) for the overflow bucket
+        self._where = {}
+        self._overflow = {}
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def schedule(self, key, deadline_tick):
+        """
+        Add or move a timer. Returns True if the deadline has already passed,
+        in which case the timer is NOT stored and the caller should fire it.
+        """
+        self.cancel(key)
+        if deadline_tick <= self.now:
+            return True
+        self._place(key, deadline_tick)
+        return False
+
+    def cancel(self, key):
+        where = self._where.pop(key, None)
+        if where is None:
+            return False
+        level, slot = where
+        if level == self.levels:
+            del self._overflow[key]
+        else:
+            bucket = self._wheel[level][slot]
+            del bucket[key]
+            if not bucket:
+                self._wheel[level][slot] = None
+        return True
+
+    def advance(self, target_tick):
+        """Move the wheel forward to target_tick and return the expired keys."""
+        expired = []
+        while self.now < target_tick:
+            self.now += 1
+            self._cascade()
+            slot = self.now & self.mask
+            bucket = self._wheel[0][slot]
+            if bucket:
+                self._wheel[0][slot] = None
+                for key in bucket:
+                    del self._where[key]
+                expired.extend(bucket)
+        return expired
+
+    def _place(self, key, deadline):
+        # Lowest level at which deadline and now share every higher bit
+        for level in range(self.levels):
+            shift = self.bits * (level + 1)
+            if (deadline >> shift) == (self.now >> shift):
+                slot = (deadline >> (self.bits * level)) & self.mask
+                bucket = self._wheel[level][slot]
+                if bucket is None:
+                    bucket = self._wheel[level][slot] = {}
+                bucket[key] = deadline
+                self._where[key] = (level, slot)
+                return
+        self._overflow[key] = deadline
+        self._where[key] = (self.levels, 0)
+
+    def _cascade(self):
+        # Find the highest level that just wrapped, then redistribute from
+        # the top down so entries can fall through several levels at once
+        top = 0
+        for level in range(1, self.levels + 1):
+            if self.now & ((1 << (self.bits * level)) - 1):
+                break
+            top = level
+
+        if top == self.levels and self._overflow:
+            pending = self._overflow
+            self._overflow = {}
+            for key, deadline in pending.items():
+                del self._where[key]
+                self._place(key, deadline)
+            top -= 1
+
+        for level in range(min(top, self.levels - 1), 0, -1):
+            slot = (self.now >> (self.bits * level)) & self.mask
+            bucket = self._wheel[level][slot]
+            if not bucket:
+                continue
+            self._wheel[level][slot] = None
+            for key, deadline in bucket.items():
+                del self._where[key]
+                self._place(key, deadline)
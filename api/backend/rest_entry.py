@@ -14,6 +14,23 @@ from backend.applications.applications_routes import applications
 from backend.admin.admin_routes import admin
 from backend.analytics.analytics_routes import analytics
 from backend.job_postings.job_postings_routes import job_postings
+from backend.reminders.reminders_routes import reminders
+from backend.graph.graph_routes import graph
+from backend.announcements.announcements_routes import announcements
+from backend.export.export_routes import export
+from backend.reminders.reminder_scheduler import reminder_scheduler, outbox_consumer
+from backend.sessions.session_sweeper import session_sweeper
+from backend.job_postings.job_posting_sweeper import job_posting_sweeper
+from backend.job_postings.job_matcher import job_matcher
+from backend.admin.report_queue import report_queue
+from backend.admin.report_dedup import report_deduplicator
+from backend.throttle import sliding_window
+from backend.formats import json_provider
+from backend.compression.response_compression import response_compressor
+from backend.cache.query_cache import query_cache
+from backend.cache.profile_cache import profile_cache
+from backend.cache.shared_cache import shared_cache
+from backend.cache.reference_data import reference_data
 
 def create_app():
     app = Flask(__name__)
@@ -31,9 +48,76 @@ def create_app():
     app.config["MYSQL_DATABASE_PORT"] = int(os.getenv("DB_PORT").strip())
     app.config["MYSQL_DATABASE_DB"] = os.getenv("DB_NAME").strip()
 
+    # Minutes before a session starts at which reminders are sent
+    app.config["REMINDER_OFFSETS_MINUTES"] = os.getenv("REMINDER_OFFSETS_MINUTES", "1440,60")
+
+    # How often past sessions are closed out, and how long after the start
+    # time a session is left alone before being marked completed/no_show
+    app.config["SESSION_SWEEP_INTERVAL_SECONDS"] = int(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "300"))
+    app.config["SESSION_SWEEP_GRACE_MINUTES"] = int(os.getenv("SESSION_SWEEP_GRACE_MINUTES", "60"))
+
+    # Default lifetime of a new job posting, and how often expired postings are closed
+    app.config["JOB_POSTING_TTL_DAYS"] = int(os.getenv("JOB_POSTING_TTL_DAYS", "60"))
+    app.config["JOB_POSTING_SWEEP_INTERVAL_SECONDS"] = int(os.getenv("JOB_POSTING_SWEEP_INTERVAL_SECONDS", "600"))
+
+    # How long an admin keeps a claimed application/report before others can take it
+    app.config["CLAIM_LEASE_SECONDS"] = int(os.getenv("CLAIM_LEASE_SECONDS", "900"))
+
+    # Recency time constant for the report triage queue
+    app.config["REPORT_QUEUE_DECAY_HOURS"] = float(os.getenv("REPORT_QUEUE_DECAY_HOURS", "72"))
+
+    # Similarity (0-1) at which report reasons count as near-duplicates, and how far back to look
+    app.config["REPORT_DUPLICATE_THRESHOLD"] = float(os.getenv("REPORT_DUPLICATE_THRESHOLD", "0.6"))
+    app.config["REPORT_DUPLICATE_WINDOW_HOURS"] = float(os.getenv("REPORT_DUPLICATE_WINDOW_HOURS", "24"))
+
+    # Per-account limits on report / connection creation (limit 0 disables)
+    app.config["REPORT_THROTTLE_LIMIT"] = int(os.getenv("REPORT_THROTTLE_LIMIT", "5"))
+    app.config["REPORT_THROTTLE_WINDOW_SECONDS"] = float(os.getenv("REPORT_THROTTLE_WINDOW_SECONDS", "600"))
+    app.config["CONNECTION_THROTTLE_LIMIT"] = int(os.getenv("CONNECTION_THROTTLE_LIMIT", "10"))
+    app.config["CONNECTION_THROTTLE_WINDOW_SECONDS"] = float(os.getenv("CONNECTION_THROTTLE_WINDOW_SECONDS", "3600"))
+
+    # Response compression: smallest body worth compressing, per-encoding levels,
+    # and how many compressed variants of ETagged responses to keep
+    app.config["COMPRESSION_MIN_SIZE"] = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    app.config["COMPRESSION_GZIP_LEVEL"] = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    app.config["COMPRESSION_BROTLI_QUALITY"] = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    app.config["COMPRESSION_ZSTD_LEVEL"] = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    app.config["COMPRESSION_CACHE_ENTRIES"] = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "256"))
+
+    # Query result cache: total size (0 disables) and default lifetime of a cached SELECT
+    app.config["QUERY_CACHE_MAX_BYTES"] = int(os.getenv("QUERY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    app.config["QUERY_CACHE_TTL_SECONDS"] = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "60"))
+
+    # Student/alumni profile cache: entries per kind, and a TTL backstop for edits made outside the API
+    app.config["PROFILE_CACHE_MAX_ENTRIES"] = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "5000"))
+    app.config["PROFILE_CACHE_TTL_SECONDS"] = float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "300"))
+
+    # Cache shared by all workers on the host: backing file (default under /dev/shm),
+    # data size (0 disables), entry slots, and default lifetime of an entry
+    app.config["SHARED_CACHE_PATH"] = os.getenv("SHARED_CACHE_PATH", "")
+    app.config["SHARED_CACHE_BYTES"] = int(os.getenv("SHARED_CACHE_BYTES", str(8 * 1024 * 1024)))
+    app.config["SHARED_CACHE_SLOTS"] = int(os.getenv("SHARED_CACHE_SLOTS", "512"))
+    app.config["SHARED_CACHE_TTL_SECONDS"] = float(os.getenv("SHARED_CACHE_TTL_SECONDS", "300"))
+
     # Initialize the database object with the settings above.
     app.logger.info("current_app(): starting the database connection")
     db.init_app(app)
+    query_cache.init_app(app)
+    profile_cache.init_app(app)
+    shared_cache.init_app(app)
+    # major / company / location snapshots (needs the database and the shared cache)
+    reference_data.init_app(app)
+
+    # ISO-8601 dates and TIME values in every JSON response, encoded by orjson when available
+    json_provider.init_app(app)
+
+    # Registered before anything else adds after_request hooks, so it runs
+    # last and compresses the final body
+    response_compressor.init_app(app)
+
+    report_queue.init_app(app)
+    report_deduplicator.init_app(app)
+    sliding_window.init_app(app)
 
     # Register all NU Connect blueprints
     app.logger.info("create_app(): registering blueprints with Flask app object.")
@@ -45,6 +129,18 @@ def create_app():
     app.register_blueprint(admin)
     app.register_blueprint(analytics)
     app.register_blueprint(job_postings)
+    app.register_blueprint(reminders)
+    app.register_blueprint(graph)
+    app.register_blueprint(announcements)
+    app.register_blueprint(export)
+
+    # Background workers start on the first request (see background_worker.py)
+    app.logger.info("create_app(): registering background workers.")
+    outbox_consumer.init_app(app)
+    reminder_scheduler.init_app(app, consumer=outbox_consumer)
+    session_sweeper.init_app(app)
+    job_posting_sweeper.init_app(app)
+    job_matcher.init_app(app)
 
     # Don't forget to return the app object
     return app
@@ -0,0 +1,70 @@
+#------------------------------------------------------------
+# Moves past-dated `scheduled` sessions to `completed`/`no_show`
+#------------------------------------------------------------
+from datetime import datetime, timedelta
+
+from backend.background.chunked_sweeper import ChunkedSweeper
+from backend.reminders.reminder_scheduler import session_start
+
+
+class SessionLifecycleSweeper(ChunkedSweeper):
+    """
+    A scheduled session whose start time is more than `grace_minutes` in the
+    past is closed out: `completed` if the mentor left notes, otherwise
+    `no_show`. Candidates are found through idx_session_status_id
+    (status, session_id), so each chunk is a short index range scan.
+    """
+
+    def __init__(self):
+        super().__init__("session-lifecycle-sweeper", interval=300, chunk_size=500)
+        self.grace_minutes = 60
+
+    def init_app(self, app):
+        self.interval = int(app.config.get("SESSION_SWEEP_INTERVAL_SECONDS", 300))
+        self.grace_minutes = int(app.config.get("SESSION_SWEEP_GRACE_MINUTES", 60))
+        super().init_app(app)
+
+    def row_id(self, row):
+        return row['session_id']
+
+    def select_chunk(self, cursor, last_id, limit):
+        cursor.execute(
+            """
+            SELECT session_id, session_date, session_time, notes
+            FROM session
+            WHERE status = 'scheduled' AND session_id > %s AND session_date <= CURDATE()
+            ORDER BY session_id
+            LIMIT %s
+            """,
+            (last_id, limit)
+        )
+        return cursor.fetchall()
+
+    def apply_chunk(self, cursor, rows):
+        cutoff = datetime.now() - timedelta(minutes=self.grace_minutes)
+        completed = []
+        no_show = []
+        for row in rows:
+            if session_start(row['session_date'], row['session_time']) > cutoff:
+                continue
+            if row['notes'] and row['notes'].strip():
+                completed.append(row['session_id'])
+            else:
+                no_show.append(row['session_id'])
+
+        updated = 0
+        for status, ids in (("completed", completed), ("no_show", no_show)):
+            if not ids:
+                continue
+            placeholders = ", ".join(["%s"] * len(ids))
+            # Re-check status so a concurrent user edit is never overwritten
+            cursor.execute(
+                f"UPDATE session SET status = %s "
+                f"WHERE session_id IN ({placeholders}) AND status = 'scheduled'",
+                [status] + ids
+            )
+            updated += cursor.rowcount
+        return updated
+
+
+session_sweeper = SessionLifecycleSweeper()
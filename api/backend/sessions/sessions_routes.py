@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
 from mysql.connector import Error
+from backend.formats.columnar import rows_response
+from backend.reminders.reminder_scheduler import reminder_scheduler
 
 sessions = Blueprint("sessions", __name__)
 
@@ -8,6 +10,7 @@ sessions = Blueprint("sessions", __name__)
 # Streamlit: Use requests.get('http://web-api:4000/sessions') to get all sessions
 #            Add ?student_id=5&status=scheduled for filtering
 #            Display in a calendar or table format
+#            Add ?format=arrow or ?format=parquet (or an Accept header) for columnar output
 @sessions.route("/sessions", methods=["GET"])
 def get_all_sessions():
     try:
@@ -43,15 +46,11 @@ def get_all_sessions():
         current_app.logger.debug(f'Executing query: {query} with params: {params}')
         cursor.execute(query, params)
         sessions = cursor.fetchall()
+        description = cursor.description
         cursor.close()
         
-        # Convert timedelta objects to strings for JSON serialization
-        for session in sessions:
-            if 'session_time' in session and session['session_time'] is not None:
-                session['session_time'] = str(session['session_time'])
-        
         current_app.logger.info(f'Successfully retrieved {len(sessions)} sessions')
-        return jsonify(sessions), 200
+        return rows_response(sessions, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_sessions: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -82,10 +81,6 @@ def get_session(session_id):
         
         cursor.close()
 
-        # Convert timedelta to string
-        if 'session_time' in session and session['session_time'] is not None:
-            session['session_time'] = str(session['session_time'])
-
         current_app.logger.info("Successfully retrieved session")
         return jsonify(session), 200
     except Error as e:
@@ -132,6 +127,8 @@ def create_session():
         new_session_id = cursor.lastrowid
         cursor.close()
 
+        reminder_scheduler.notify_session_changed(new_session_id)
+
         return jsonify({"message": "Session created successfully", "session_id": new_session_id}), 201
 
     except Error as e:
@@ -176,6 +173,8 @@ def update_session(session_id):
         db.get_db().commit()
         cursor.close()
 
+        reminder_scheduler.notify_session_changed(session_id)
+
         return jsonify({"message": "Session updated successfully"}), 200
 
     except Error as e:
@@ -198,6 +197,8 @@ def delete_session(session_id):
         cursor.execute("DELETE FROM session WHERE session_id = %s", (session_id,))
         db.get_db().commit()
         cursor.close()
+
+        reminder_scheduler.notify_session_changed(session_id)
         
         return jsonify({"message": "Session deleted successfully"}), 200
     except Error as e:
@@ -0,0 +1,36 @@
+#------------------------------------------------------------
+# Per-student {alumni_id: status} map, cached until one of the
+# student's connections changes
+#------------------------------------------------------------
+from backend.cache.lru_cache import LRUCache
+
+connection_map_cache = LRUCache(max_entries=10000)
+# Bumped on every invalidation so a read that raced a write doesn't cache stale data
+_generation = [0]
+
+
+def load_connection_map(cursor, student_id):
+    cached = connection_map_cache.get(student_id)
+    if cached is not None:
+        return cached
+
+    generation = _generation[0]
+    # Served by the unique_connection (student_id, alumni_id) index
+    cursor.execute("SELECT alumni_id, status FROM connection WHERE student_id = %s", (student_id,))
+    connection_map = {row['alumni_id']: row['status'] for row in cursor.fetchall()}
+    if generation == _generation[0]:
+        connection_map_cache.set(student_id, connection_map)
+    return connection_map
+
+
+def invalidate_connection_map(*student_ids):
+    # Call after committing any insert/update/delete on connection
+    _generation[0] += 1
+    for student_id in student_ids:
+        connection_map_cache.delete(int(student_id))
+
+
+def invalidate_all_connection_maps():
+    # For changes that can touch many students at once (e.g. deleting an alumni)
+    _generation[0] += 1
+    connection_map_cache.clear()
@@ -1,6 +1,12 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
 from mysql.connector import Error
+from backend.formats.columnar import rows_response
+from backend.cache.table_versions import conditional
+from backend.cache.profile_cache import profile_cache
+from backend.graph.mentorship_graph import mentorship_graph
+from backend.students.connection_map import load_connection_map, invalidate_connection_map
+from backend.job_postings.job_matcher import student_match_index
 
 students = Blueprint("students", __name__)
 
@@ -8,7 +14,9 @@ students = Blueprint("students", __name__)
 # Streamlit: Use requests.get('http://web-api:4000/students') to get all students
 #            Add ?major_id=1&graduation_year=2025 for filtering
 #            Display in a table or dropdown for selection
+#            Add ?format=arrow or ?format=parquet (or an Accept header) for columnar output
 @students.route("/students", methods=["GET"])
+@conditional("student")
 def get_all_students():
     try:
         current_app.logger.info('Starting get_all_students request')
@@ -39,10 +47,11 @@ def get_all_students():
         current_app.logger.debug(f'Executing query: {query} with params: {params}')
         cursor.execute(query, params)
         students = cursor.fetchall()
+        description = cursor.description
         cursor.close()
         
         current_app.logger.info(f'Successfully retrieved {len(students)} students')
-        return jsonify(students), 200
+        return rows_response(students, description)
     except Error as e:
         current_app.logger.error(f'Database error in get_all_students: {str(e)}')
         return jsonify({"error": str(e)}), 500
@@ -52,19 +61,20 @@ def get_all_students():
 #            to get detailed info for a specific student
 #            Display profile with st.write() or create a profile card
 @students.route("/students/<int:student_id>", methods=["GET"])
+@conditional("student", "major", "location")
 def get_student(student_id):
     try:
         current_app.logger.info('Starting get_student request')
-        cursor = db.get_db().cursor()
 
-        query = "SELECT s.*, m.major_name, l.city, l.state, l.country FROM student s LEFT JOIN major m ON s.major_id = m.major_id LEFT JOIN location l ON s.location_id = l.location_id WHERE s.student_id = %s"  # Changed to LEFT JOIN and s.student_id
-        cursor.execute(query, (student_id,))
-        student = cursor.fetchone()
+        # Served from the profile cache when possible; major and location come from the reference snapshots
+        student = profile_cache.get("student", student_id)
+        if student is None:
+            cursor = db.get_db().cursor()
+            student = profile_cache.load(cursor, "student", student_id)
+            cursor.close()
 
         if not student:
             return jsonify({"error": "Student not found"}), 404
-        
-        cursor.close()
 
         current_app.logger.info("Successfully retrieved student")
         return jsonify(student), 200
@@ -73,6 +83,24 @@ def get_student(student_id):
         return jsonify({"error": str(e)}), 500
     
     
+# Get this student's connection status for every alumni they've contacted
+# Streamlit: Use requests.get(f'http://web-api:4000/students/{student_id}/connection-map')
+#            once per page, then look up each alumni card's status in the returned
+#            {alumni_id: status} dict instead of calling /connections per card
+@students.route("/students/<int:student_id>/connection-map", methods=["GET"])
+def get_student_connection_map(student_id):
+    try:
+        cursor = db.get_db().cursor()
+        connection_map = load_connection_map(cursor, student_id)
+        cursor.close()
+
+        # JSON object keys are strings
+        return jsonify({str(alumni_id): status for alumni_id, status in connection_map.items()}), 200
+    except Error as e:
+        current_app.logger.error(f'Database error in get_student_connection_map: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
 # Create a new student
 # Streamlit: Use st.form() to collect input, then:
 #            requests.post('http://web-api:4000/students', json={
@@ -108,6 +136,7 @@ def create_student():
         db.get_db().commit()
         new_student_id = cursor.lastrowid
         cursor.close()
+        student_match_index.invalidate()
 
         return jsonify({"message": "Student created successfully", "student_id": new_student_id}), 201
 
@@ -149,7 +178,10 @@ def update_student(student_id):
         query = f"UPDATE student SET {', '.join(update_fields)} WHERE student_id = %s"
         cursor.execute(query, params)
         db.get_db().commit()
+        profile_cache.refresh(cursor, "student", student_id)
         cursor.close()
+        if "major_id" in data or "graduation_year" in data:
+            student_match_index.invalidate()
 
         return jsonify({"message": "Student updated successfully"}), 200
 
@@ -174,6 +206,11 @@ def delete_student(student_id):
 
         db.get_db().commit()
         cursor.close()
+        profile_cache.evict("student", student_id)
+        invalidate_connection_map(student_id)
+        student_match_index.invalidate()
+        # Cascading delete removes connections the graph can't see individually
+        mentorship_graph.invalidate()
         return jsonify({"message": f"Student deleted succesfully"}), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,130 @@
+#------------------------------------------------------------
+# In-process sliding-window throttles for write endpoints
+# (report and connection creation)
+#------------------------------------------------------------
+import math
+import time
+import threading
+from collections import OrderedDict
+
+# name -> SlidingWindowThrottle, read by the admin dashboard
+throttles = {}
+
+
+class SlidingWindowThrottle:
+    """
+    Allows at most `limit` events per key in any `window_seconds` window.
+
+    Each key owns a ring buffer of `buckets` counters, each covering
+    window_seconds / buckets seconds, plus a running total, so a check only
+    clears the buckets that expired since the key was last seen and then
+    compares one number: O(1) amortized. Keys are kept in LRU order and the
+    least recently active ones are dropped past `max_keys`, which bounds
+    memory; an evicted key was idle, so forgetting it only ever errs on the
+    side of allowing.
+
+    A limit of 0 disables the throttle.
+
+    Args:
+        name: label used in the admin stats
+        limit: events allowed per window
+        window_seconds: window length
+        buckets: ring buffer size (window resolution)
+        max_keys: most keys tracked at once
+    """
+
+    def __init__(self, name, limit, window_seconds, buckets=60, max_keys=100000):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._keys = OrderedDict()     # key -> [counts, total, last bucket index]
+        self.allowed = 0
+        self.throttled = 0
+        self.evicted = 0
+        throttles[name] = self
+
+    def configure(self, limit, window_seconds):
+        with self._lock:
+            self.limit = limit
+            self.window_seconds = window_seconds
+            self._keys.clear()
+
+    def _bucket_width(self):
+        return self.window_seconds / self.buckets
+
+    def _advance(self, state, tick):
+        counts, total, last = state
+        gap = tick - last
+        if gap >= self.buckets:
+            counts[:] = [0] * self.buckets
+            total = 0
+        else:
+            for t in range(last + 1, tick + 1):
+                i = t % self.buckets
+                total -= counts[i]
+                counts[i] = 0
+        state[1] = total
+        state[2] = tick
+
+    def _retry_after(self, counts, tick):
+        # Seconds until the oldest counted bucket leaves the window
+        for age in range(self.buckets - 1, -1, -1):
+            if counts[(tick - age) % self.buckets]:
+                return math.ceil((self.buckets - age) * self._bucket_width())
+        return 1
+
+    def check(self, key, now=None):
+        """
+        Count one event for `key`. Returns (allowed, retry_after_seconds);
+        rejected events are not counted against the window.
+        """
+        if self.limit <= 0:
+            return True, 0
+        tick = int((time.monotonic() if now is None else now) / self._bucket_width())
+        with self._lock:
+            state = self._keys.get(key)
+            if state is None:
+                state = self._keys[key] = [[0] * self.buckets, 0, tick]
+                while len(self._keys) > self.max_keys:
+                    self._keys.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._keys.move_to_end(key)
+                self._advance(state, tick)
+
+            counts = state[0]
+            if state[1] >= self.limit:
+                self.throttled += 1
+                return False, self._retry_after(counts, tick)
+            counts[tick % self.buckets] += 1
+            state[1] += 1
+            self.allowed += 1
+            return True, 0
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "window_seconds": self.window_seconds,
+            "tracked_keys": len(self._keys),
+            "allowed": self.allowed,
+            "throttled": self.throttled,
+            "evicted_keys": self.evicted,
+        }
+
+
+report_throttle = SlidingWindowThrottle("reports", limit=5, window_seconds=600)
+connection_throttle = SlidingWindowThrottle("connections", limit=10, window_seconds=3600)
+
+
+def init_app(app):
+    report_throttle.configure(
+        int(app.config.get("REPORT_THROTTLE_LIMIT", 5)),
+        float(app.config.get("REPORT_THROTTLE_WINDOW_SECONDS", 600)),
+    )
+    connection_throttle.configure(
+        int(app.config.get("CONNECTION_THROTTLE_LIMIT", 10)),
+        float(app.config.get("CONNECTION_THROTTLE_WINDOW_SECONDS", 3600)),
+    )
@@ -0,0 +1,30 @@
+# Conditional GETs against the API: remembers each response's ETag in
+# st.session_state and revalidates with If-None-Match on the next rerun,
+# so an unchanged payload comes back as an empty 304.
+
+import requests
+import streamlit as st
+
+# Cached responses kept per browser session
+MAX_CACHED = 200
+
+
+def get(url, params=None, **kwargs):
+    """Drop-in for requests.get() that reuses the cached body when the API answers 304."""
+    cache = st.session_state.setdefault("_api_etag_cache", {})
+    headers = dict(kwargs.pop("headers", None) or {})
+    key = (requests.Request("GET", url, params=params).prepare().url, headers.get("Accept", ""))
+
+    cached = cache.get(key)
+    if cached is not None:
+        headers["If-None-Match"] = cached.headers["ETag"]
+    response = requests.get(url, params=params, headers=headers, **kwargs)
+
+    if response.status_code == 304 and cached is not None:
+        return cached
+    if response.status_code == 200 and "ETag" in response.headers:
+        cache.pop(key, None)
+        cache[key] = response
+        while len(cache) > MAX_CACHED:
+            cache.pop(next(iter(cache)))
+    return response
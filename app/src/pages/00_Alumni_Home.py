@@ -4,6 +4,7 @@ logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
 import requests
+from modules import api_client
 
 st.set_page_config(layout='wide')
 
@@ -40,10 +41,8 @@ try:
         for s in all_sessions:
             try:
                 session_date_str = s.get('session_date', '')
-                if 'GMT' in session_date_str:
-                    session_date = datetime.strptime(session_date_str, '%a, %d %b %Y %H:%M:%S GMT').date()
-                else:
-                    session_date = datetime.strptime(session_date_str, '%Y-%m-%d').date()
+                # The API sends dates as ISO-8601 (YYYY-MM-DD)
+                session_date = datetime.fromisoformat(session_date_str).date()
                 if session_date >= today and s.get('status') != 'cancelled':
                     upcoming_sessions += 1
             except:
@@ -73,13 +72,30 @@ if pending_requests > 0:
     
     try:
         pending_conn = [c for c in all_connections if c.get('status') == 'pending']
+
+        # Respond to every pending request in a single API call
+        col_all_accept, col_all_decline = st.columns(2)
+        for col, status, label in ((col_all_accept, 'accepted', '✅ Accept all'),
+                                   (col_all_decline, 'rejected', '❌ Decline all')):
+            with col:
+                if st.button(f'{label} ({len(pending_conn)})', key=f'bulk_{status}', use_container_width=True):
+                    bulk_response = requests.post('http://web-api:4000/connections/bulk-update', json={
+                        'alumni_id': current_alumni_id,
+                        'connection_ids': [c['connection_id'] for c in pending_conn],
+                        'status': status
+                    })
+                    if bulk_response.status_code == 200:
+                        st.success(bulk_response.json().get('message', 'Requests updated'))
+                        st.rerun()
+                    else:
+                        st.error('Failed to update requests')
         
         for conn in pending_conn[:3]:  # Show first 3
             student_id = conn.get('student_id')
             
             # Fetch student details
             try:
-                student_response = requests.get(f'http://web-api:4000/students/{student_id}')
+                student_response = api_client.get(f'http://web-api:4000/students/{student_id}')
                 if student_response.status_code == 200:
                     student = student_response.json()
                     
@@ -152,6 +168,31 @@ if st.button(' Job Postings',
              use_container_width=True):
     st.switch_page('pages/04_Alumni_Job_Postings.py')
 
+# Announcements section
+st.write('')
+st.write('')
+st.write('###  Announcements')
+
+try:
+    ann_response = requests.get(f'http://web-api:4000/users/alumni/{current_alumni_id}/announcements')
+    if ann_response.status_code == 200:
+        feed = ann_response.json()
+        new_items = feed.get('announcements', [])
+        if new_items:
+            st.caption(f"{feed.get('unread_count', len(new_items))} new")
+            for item in new_items:
+                st.info(f"**{item.get('title')}** - {item.get('message')}")
+            if st.button('Mark announcements as read', key='mark_announcements_read'):
+                requests.put(
+                    f'http://web-api:4000/users/alumni/{current_alumni_id}/announcements/cursor',
+                    json={"announcement_id": new_items[-1]['announcement_id']}
+                )
+                st.rerun()
+        else:
+            st.caption('No new announcements')
+except:
+    st.caption('Unable to load announcements')
+
 # Recent activity section
 st.write('')
 st.write('')
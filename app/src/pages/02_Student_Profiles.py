@@ -4,6 +4,7 @@ logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
 import requests
+from modules import api_client
 
 st.set_page_config(layout='wide')
 SideBarLinks()
@@ -40,7 +41,7 @@ try:
     if year_filter != 'All Years':
         params['graduation_year'] = year_filter
     
-    response = requests.get('http://web-api:4000/students', params=params)
+    response = api_client.get('http://web-api:4000/students', params=params)
     
     if response.status_code == 200:
         students_list = response.json()
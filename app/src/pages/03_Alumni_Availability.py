@@ -4,6 +4,7 @@ logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
 import requests
+from modules import api_client
 from datetime import time
 
 st.set_page_config(layout='wide')
@@ -19,6 +20,17 @@ try:
     
     if response.status_code == 200:
         availability_slots = response.json()
+
+        # Every save sends the whole weekly schedule in one PUT; the API diffs
+        # it against what's stored and merges overlapping slots
+        def save_schedule(slots):
+            return requests.put(
+                f'http://web-api:4000/alumni/{current_alumni_id}/availability',
+                json={'slots': [
+                    {'day_of_week': s['day_of_week'], 'start_time': s['start_time'], 'end_time': s['end_time']}
+                    for s in slots
+                ]}
+            )
         
         st.write('### Current Availability Schedule')
         
@@ -44,8 +56,8 @@ try:
                             with col2:
                                 if st.button('🗑️ Delete', key=f"delete_{slot['schedule_id']}", 
                                            use_container_width=True):
-                                    delete_response = requests.delete(
-                                        f"http://web-api:4000/alumni/{current_alumni_id}/availability/{slot['schedule_id']}"
+                                    delete_response = save_schedule(
+                                        [s for s in availability_slots if s['schedule_id'] != slot['schedule_id']]
                                     )
                                     if delete_response.status_code == 200:
                                         st.success('Slot deleted!')
@@ -74,10 +86,8 @@ try:
                     for s in upcoming_sessions:
                         try:
                             session_date_str = s.get('session_date', '')
-                            if 'GMT' in session_date_str:
-                                session_date = datetime.strptime(session_date_str, '%a, %d %b %Y %H:%M:%S GMT').date()
-                            else:
-                                session_date = datetime.strptime(session_date_str, '%Y-%m-%d').date()
+                            # The API sends dates as ISO-8601 (YYYY-MM-DD)
+                            session_date = datetime.fromisoformat(session_date_str).date()
                             if session_date >= today:
                                 future_sessions.append(s)
                         except:
@@ -90,7 +100,7 @@ try:
                             student_id = session.get('student_id')
                             
                             try:
-                                student_response = requests.get(f'http://web-api:4000/students/{student_id}')
+                                student_response = api_client.get(f'http://web-api:4000/students/{student_id}')
                                 if student_response.status_code == 200:
                                     student = student_response.json()
                                     
@@ -149,11 +159,8 @@ try:
                     }
                     
                     try:
-                        create_response = requests.post(
-                            f'http://web-api:4000/alumni/{current_alumni_id}/availability',
-                            json=availability_data
-                        )
-                        if create_response.status_code == 201:
+                        create_response = save_schedule(availability_slots + [availability_data])
+                        if create_response.status_code == 200:
                             st.success('✅ Availability slot added!')
                             st.rerun()
                         else:
@@ -166,7 +173,7 @@ try:
         st.write('### Availability Status')
         
         try:
-            alumni_response = requests.get(f'http://web-api:4000/alumni/{current_alumni_id}')
+            alumni_response = api_client.get(f'http://web-api:4000/alumni/{current_alumni_id}')
             if alumni_response.status_code == 200:
                 alumni_data = alumni_response.json()
                 current_status = alumni_data.get('availability_status', 'unavailable')
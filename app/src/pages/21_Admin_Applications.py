@@ -18,80 +18,74 @@ st.write("Review and approve or reject student applications")
 current_admin_id = int(st.session_state.get('user_id', 1))
 
 try:
-    response = requests.get('http://web-api:4000/applications?status=pending')
+    # Lease a batch so other admins reviewing at the same time get different applications
+    response = requests.post('http://web-api:4000/applications/claim',
+                             params={'n': 10, 'admin_id': current_admin_id})
     
     if response.status_code == 200:
         applications = response.json()
         
         if applications:
-            st.write(f"**{len(applications)} pending applications**")
+            st.write(f"**{len(applications)} pending applications claimed for you**")
             st.write('')
+
+            def decide(application_ids, status):
+                # One request and one transaction for any number of applications
+                decision_response = requests.post('http://web-api:4000/applications/bulk-decision', json={
+                    'application_ids': application_ids,
+                    'status': status,
+                    'admin_id': current_admin_id
+                })
+                if decision_response.status_code == 200:
+                    st.success(decision_response.json().get('message', 'Applications updated'))
+                    st.rerun()
+                else:
+                    st.error('Failed to update applications')
             
+            selected_ids = []
             for app in applications:
-                student_id = app.get('student_id')
-                
-                try:
-                    student_response = requests.get(f'http://web-api:4000/students/{student_id}')
-                    if student_response.status_code == 200:
-                        student = student_response.json()
+                with st.container():
+                    col1, col2 = st.columns([3, 1])
+                    
+                    with col1:
+                        if st.checkbox(f"👤 {app.get('student_name', 'N/A')}", key=f"select_{app['application_id']}"):
+                            selected_ids.append(app['application_id'])
+                        st.write(f"**Email:** {app.get('student_email', 'N/A')}")
+                        st.write(f"**Major:** {app.get('major_name', 'N/A')}")
+                        st.write(f"**Graduation Year:** {app.get('graduation_year', 'N/A')}")
+                        st.caption(f"Applied: {app.get('submission_date', 'N/A')}")
+                        
+                        if app.get('profile_summary'):
+                            with st.expander('Profile Summary'):
+                                st.write(app['profile_summary'])
+                    
+                    with col2:
+                        st.write('')
+                        st.write('')
+                        
+                        col_approve, col_reject = st.columns(2)
                         
-                        with st.container():
-                            col1, col2 = st.columns([3, 1])
-                            
-                            with col1:
-                                st.subheader(f"👤 {student.get('name', 'N/A')}")
-                                st.write(f"**Email:** {student.get('email', 'N/A')}")
-                                st.write(f"**Major:** {student.get('major_name', 'N/A')}")
-                                st.write(f"**Graduation Year:** {student.get('graduation_year', 'N/A')}")
-                                st.caption(f"Applied: {app.get('submission_date', 'N/A')}")
-                                
-                                if student.get('profile_summary'):
-                                    with st.expander('Profile Summary'):
-                                        st.write(student['profile_summary'])
-                            
-                            with col2:
-                                st.write('')
-                                st.write('')
-                                
-                                col_approve, col_reject = st.columns(2)
-                                
-                                with col_approve:
-                                    if st.button('✅ Approve', key=f"approve_{app['application_id']}", 
-                                               use_container_width=True, type='primary'):
-                                        update_data = {
-                                            'status': 'approved',
-                                            'admin_id': current_admin_id
-                                        }
-                                        update_response = requests.put(
-                                            f"http://web-api:4000/applications/{app['application_id']}", 
-                                            json=update_data
-                                        )
-                                        if update_response.status_code == 200:
-                                            st.success('Application approved!')
-                                            st.rerun()
-                                        else:
-                                            st.error('Failed to approve')
-                                
-                                with col_reject:
-                                    if st.button('❌ Reject', key=f"reject_{app['application_id']}", 
-                                               use_container_width=True):
-                                        update_data = {
-                                            'status': 'rejected',
-                                            'admin_id': current_admin_id
-                                        }
-                                        update_response = requests.put(
-                                            f"http://web-api:4000/applications/{app['application_id']}", 
-                                            json=update_data
-                                        )
-                                        if update_response.status_code == 200:
-                                            st.success('Application rejected')
-                                            st.rerun()
-                                        else:
-                                            st.error('Failed to reject')
-                            
-                            st.divider()
-                except Exception as e:
-                    st.error(f'Error loading application details: {str(e)}')
+                        with col_approve:
+                            if st.button('✅ Approve', key=f"approve_{app['application_id']}", 
+                                       use_container_width=True, type='primary'):
+                                decide([app['application_id']], 'approved')
+                        
+                        with col_reject:
+                            if st.button('❌ Reject', key=f"reject_{app['application_id']}", 
+                                       use_container_width=True):
+                                decide([app['application_id']], 'rejected')
+                    
+                    st.divider()
+
+            col_bulk_approve, col_bulk_reject = st.columns(2)
+            with col_bulk_approve:
+                if st.button(f'✅ Approve selected ({len(selected_ids)})', type='primary',
+                             disabled=not selected_ids, use_container_width=True):
+                    decide(selected_ids, 'approved')
+            with col_bulk_reject:
+                if st.button(f'❌ Reject selected ({len(selected_ids)})',
+                             disabled=not selected_ids, use_container_width=True):
+                    decide(selected_ids, 'rejected')
         else:
             st.info('No pending applications')
     else:
@@ -24,7 +24,12 @@ try:
     if status_filter != 'All':
         params['status'] = status_filter
     
-    response = requests.get('http://web-api:4000/reports', params=params)
+    if status_filter == 'pending':
+        # Lease a batch so other admins reviewing at the same time get different reports
+        response = requests.post('http://web-api:4000/reports/claim',
+                                 params={'n': 10, 'admin_id': current_admin_id})
+    else:
+        response = requests.get('http://web-api:4000/reports', params=params)
     
     if response.status_code == 200:
         reports = response.json()
@@ -43,6 +43,17 @@ try:
             st.metric("Pending Applications", metrics.get('pending_applications', 0))
         with col2:
             st.metric("Pending Reports", metrics.get('pending_reports', 0))
+
+        throttles = metrics.get('throttles', {})
+        if throttles:
+            st.write('')
+            st.write('### Throttled Requests')
+            st.caption('Create requests rejected for exceeding per-account limits since the API started')
+            cols = st.columns(len(throttles))
+            for col, (name, stats) in zip(cols, throttles.items()):
+                with col:
+                    st.metric(f"Throttled {name.title()}", stats.get('throttled', 0),
+                              help=f"Limit: {stats.get('limit')} per {int(stats.get('window_seconds', 0))}s")
         
         st.write('')
         st.write('---')
@@ -35,10 +35,8 @@ try:
         for s in all_sessions:
             try:
                 session_date_str = s.get('session_date', '')
-                if 'GMT' in session_date_str:
-                    session_date = datetime.strptime(session_date_str, '%a, %d %b %Y %H:%M:%S GMT').date()
-                else:
-                    session_date = datetime.strptime(session_date_str, '%Y-%m-%d').date()
+                # The API sends dates as ISO-8601 (YYYY-MM-DD)
+                session_date = datetime.fromisoformat(session_date_str).date()
                 if session_date >= today and s.get('status') != 'cancelled':
                     upcoming_sessions += 1
             except:
@@ -81,6 +79,30 @@ if st.button(' Job Postings',
              use_container_width=True):
     st.switch_page('pages/34_Students_Job_Postings.py')
 
+st.write('')
+st.write('')
+st.write('###  Announcements')
+
+try:
+    ann_response = requests.get(f'http://web-api:4000/users/student/{current_student_id}/announcements')
+    if ann_response.status_code == 200:
+        feed = ann_response.json()
+        new_items = feed.get('announcements', [])
+        if new_items:
+            st.caption(f"{feed.get('unread_count', len(new_items))} new")
+            for item in new_items:
+                st.info(f"**{item.get('title')}** - {item.get('message')}")
+            if st.button('Mark announcements as read', key='mark_announcements_read'):
+                requests.put(
+                    f'http://web-api:4000/users/student/{current_student_id}/announcements/cursor',
+                    json={"announcement_id": new_items[-1]['announcement_id']}
+                )
+                st.rerun()
+        else:
+            st.caption('No new announcements')
+except:
+    st.caption('Unable to load announcements')
+
 st.write('')
 st.write('')
 st.write('###  Recent Activity')
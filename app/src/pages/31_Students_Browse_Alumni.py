@@ -4,6 +4,7 @@ logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
 import requests
+from modules import api_client
 from datetime import date, time as dt_time
 
 st.set_page_config(layout='wide')
@@ -31,7 +32,7 @@ try:
     if field_filter != 'All Fields':
         params['field'] = field_filter
     
-    response = requests.get('http://web-api:4000/alumni', params=params)
+    response = api_client.get('http://web-api:4000/alumni', params=params)
     
     if response.status_code == 200:
         alumni_list = response.json()
@@ -44,6 +45,15 @@ try:
                              search_query.lower() in a.get('field', '').lower() or
                              search_query.lower() in a.get('current_role', '').lower()]
         
+        # One request for this student's status with every alumni, instead of one per card
+        connection_map = {}
+        try:
+            map_response = requests.get(f'http://web-api:4000/students/{current_student_id}/connection-map')
+            if map_response.status_code == 200:
+                connection_map = map_response.json()
+        except:
+            pass
+        
         st.write(f'**{len(filtered_alumni)} results**')
         st.write('')
         
@@ -73,32 +83,26 @@ try:
                             st.rerun()
                     
                     try:
-                        conn_response = requests.get(f"http://web-api:4000/connections?student_id={current_student_id}&alumni_id={alumni['alumni_id']}")
-                        if conn_response.status_code == 200:
-                            connections = conn_response.json()
-                            
-                            accepted_conn = [c for c in connections if c.get('status') == 'accepted']
-                            pending_conn = [c for c in connections if c.get('status') == 'pending']
-                            
-                            if accepted_conn:
-                                st.success('Connected ✓')
-                            elif pending_conn:
-                                st.warning('Request Pending ⏳')
-                            else:
-                                if st.button('Connect', key=f"connect_{alumni['alumni_id']}", 
-                                           use_container_width=True):
-                                    connection_data = {
-                                        'student_id': current_student_id,
-                                        'alumni_id': alumni['alumni_id'],
-                                        'status': 'pending'
-                                    }
-                                    create_response = requests.post('http://web-api:4000/connections', 
-                                                                   json=connection_data)
-                                    if create_response.status_code == 201:
-                                        st.success('Connection request sent!')
-                                        st.rerun()
-                                    else:
-                                        st.error('Failed to send connection request')
+                        connection_status = connection_map.get(str(alumni['alumni_id']))
+                        if connection_status == 'accepted':
+                            st.success('Connected ✓')
+                        elif connection_status == 'pending':
+                            st.warning('Request Pending ⏳')
+                        else:
+                            if st.button('Connect', key=f"connect_{alumni['alumni_id']}", 
+                                       use_container_width=True):
+                                connection_data = {
+                                    'student_id': current_student_id,
+                                    'alumni_id': alumni['alumni_id'],
+                                    'status': 'pending'
+                                }
+                                create_response = requests.post('http://web-api:4000/connections', 
+                                                               json=connection_data)
+                                if create_response.status_code == 201:
+                                    st.success('Connection request sent!')
+                                    st.rerun()
+                                else:
+                                    st.error('Failed to send connection request')
                     except:
                         pass
                 
@@ -4,6 +4,7 @@ logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
 import requests
+from modules import api_client
 from datetime import datetime, date, time
 
 st.set_page_config(layout='wide')
@@ -31,12 +32,8 @@ try:
             # Parse session date - handle different formats
             session_date_str = s.get('session_date', '')
             try:
-                # Try parsing as GMT format first
-                if 'GMT' in session_date_str:
-                    session_date = datetime.strptime(session_date_str, '%a, %d %b %Y %H:%M:%S GMT').date()
-                else:
-                    # Try standard format
-                    session_date = datetime.strptime(session_date_str, '%Y-%m-%d').date()
+                # The API sends dates as ISO-8601 (YYYY-MM-DD)
+                session_date = datetime.fromisoformat(session_date_str).date()
                 
                 if session_date >= today:
                     upcoming.append(s)
@@ -76,7 +73,7 @@ try:
                     alumni_name = 'Unknown'
                     alumni_role = 'N/A'
                     try:
-                        alumni_response = requests.get(f'http://web-api:4000/alumni/{alumni_id}')
+                        alumni_response = api_client.get(f'http://web-api:4000/alumni/{alumni_id}')
                         if alumni_response.status_code == 200:
                             alumni = alumni_response.json()
                             alumni_name = alumni.get('name', 'Unknown')
@@ -142,7 +139,7 @@ try:
                     alumni_name = 'Unknown'
                     alumni_role = 'N/A'
                     try:
-                        alumni_response = requests.get(f'http://web-api:4000/alumni/{alumni_id}')
+                        alumni_response = api_client.get(f'http://web-api:4000/alumni/{alumni_id}')
                         if alumni_response.status_code == 200:
                             alumni = alumni_response.json()
                             alumni_name = alumni.get('name', 'Unknown')
@@ -4,6 +4,7 @@ logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
 import requests
+from modules import api_client
 
 st.set_page_config(layout='wide')
 SideBarLinks()
@@ -13,7 +14,7 @@ st.title(' My Profile')
 current_student_id = int(st.session_state.get('user_id', 1))
 
 try:
-    response = requests.get(f'http://web-api:4000/students/{current_student_id}')
+    response = api_client.get(f'http://web-api:4000/students/{current_student_id}')
     
     if response.status_code == 200:
         student = response.json()
@@ -29,7 +30,7 @@ try:
             
             majors = []
             try:
-                majors_response = requests.get('http://web-api:4000/majors')
+                majors_response = api_client.get('http://web-api:4000/majors')
                 if majors_response.status_code == 200:
                     majors = majors_response.json()
             except:
@@ -37,7 +38,7 @@ try:
             
             locations = []
             try:
-                locations_response = requests.get('http://web-api:4000/locations')
+                locations_response = api_client.get('http://web-api:4000/locations')
                 if locations_response.status_code == 200:
                     locations = locations_response.json()
             except:
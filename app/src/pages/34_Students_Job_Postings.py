@@ -13,11 +13,48 @@ if 'user_id' not in st.session_state:
 st.title("💼 Job Postings")
 st.markdown("Browse job and internship opportunities posted by alumni mentors")
 
+if st.button("🔄 Refresh postings"):
+    st.session_state.pop('job_feed', None)
+
+try:
+    matches_response = requests.get(
+        f"{API_BASE_URL}/students/{st.session_state['user_id']}/job-matches", params={"unread": "true"}
+    )
+    if matches_response.status_code == 200:
+        new_matches = matches_response.json()
+        if new_matches:
+            with st.expander(f"✨ {len(new_matches)} new posting(s) matching your major and year", expanded=True):
+                for match in new_matches:
+                    st.markdown(f"**{match.get('title')}** - {match.get('preferred_major') or 'Any major'}")
+                if st.button("Mark as seen"):
+                    requests.put(f"{API_BASE_URL}/students/{st.session_state['user_id']}/job-matches/read")
+                    st.rerun()
+except requests.exceptions.RequestException:
+    pass
+
+
+def load_feed_page(next_cursor=None):
+    # Newest live postings first; next_cursor continues where the last page ended
+    params = {"limit": 20}
+    if next_cursor:
+        params.update(next_cursor)
+    page_response = requests.get(f"{API_BASE_URL}/job-postings/feed", params=params)
+    if page_response.status_code == 200:
+        page = page_response.json()
+        st.session_state['job_feed']['postings'].extend(page.get('postings', []))
+        st.session_state['job_feed']['next_cursor'] = page.get('next_cursor')
+    return page_response
+
+
 try:
-    response = requests.get(f"{API_BASE_URL}/job-postings")
+    if 'job_feed' not in st.session_state:
+        st.session_state['job_feed'] = {"postings": [], "next_cursor": None}
+        response = load_feed_page()
+    else:
+        response = None
     
-    if response.status_code == 200:
-        job_postings = response.json()
+    if response is None or response.status_code == 200:
+        job_postings = st.session_state['job_feed']['postings']
         
         if not job_postings:
             st.info("No job postings available at this time. Check back soon!")
@@ -97,9 +134,16 @@ try:
                             st.caption(f"📅 Posted: {job['created_at']}")
                     
                     st.markdown("---")
+
+            if st.session_state['job_feed']['next_cursor']:
+                if st.button("Load more postings", use_container_width=True):
+                    load_feed_page(st.session_state['job_feed']['next_cursor'])
+                    st.rerun()
     else:
+        del st.session_state['job_feed']
         st.error(f"Failed to load job postings. Status code: {response.status_code}")
 
 except requests.exceptions.RequestException as e:
+    st.session_state.pop('job_feed', None)
     st.error(f"Error connecting to the server: {str(e)}")
     st.info("Please make sure the API server is running.")
\ No newline at end of file
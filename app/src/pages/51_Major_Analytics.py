@@ -3,8 +3,9 @@ logger = logging.getLogger(__name__)
 
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
+from modules import api_client
 import pandas as pd
+import pyarrow as pa
 
 st.set_page_config(layout='wide')
 
@@ -17,7 +18,7 @@ except Exception:
 
 def api_get(path, params=None, default=None):
     try:
-        r = requests.get(f"{API_BASE}{path}", params=params, timeout=5)
+        r = api_client.get(f"{API_BASE}{path}", params=params, timeout=5)
         if r.status_code == 200:
             return r.json()
         logger.info(f"GET {path} -> {r.status_code}")
@@ -25,6 +26,21 @@ def api_get(path, params=None, default=None):
         logger.info(f"GET {path} failed: {e}")
     return default
 
+def api_get_df(path, params=None):
+    # Ask for a columnar Arrow stream and read it straight into a DataFrame,
+    # which keeps date/time column types; falls back to JSON if the API can't
+    try:
+        r = api_client.get(f"{API_BASE}{path}", params=params, timeout=5,
+                         headers={"Accept": "application/vnd.apache.arrow.stream"})
+        if r.status_code == 200 and r.headers.get("Content-Type", "").startswith("application/vnd.apache.arrow.stream"):
+            return pa.ipc.open_stream(r.content).read_pandas(date_as_object=False)
+        if r.status_code in (200, 406):
+            return pd.DataFrame(api_get(path, params=params, default=[]))
+        logger.info(f"GET {path} -> {r.status_code}")
+    except Exception as e:
+        logger.info(f"GET {path} failed: {e}")
+    return pd.DataFrame()
+
 # Personalize page with the user's name from session state
 first_name = st.session_state.get('first_name', 'Data Analyst')
 st.title(f"Majors & Location Analytics")
@@ -32,39 +48,23 @@ st.write('')
 st.write('### Major Participation across Students & Alumni')
 
 # Pull data for majors, students, and alumni from the API
-majors = api_get("/majors", default=[])
-students = api_get("/students", default=[])
-alumni = api_get("/alumni", default=[])
-
-if majors and (students or alumni):
-     # Convert majors list to DataFrame:
-    majors_df = pd.DataFrame(majors)  # expect major_id, major_name, department
-
-  # Build counts of students and alumni per major_id
-    counts = {}
-    for s in students or []:
-        mid = s.get("major_id")
-        if mid is not None:
-            counts.setdefault(mid, {"students": 0, "alumni": 0})
-            counts[mid]["students"] += 1
-
-    for a in alumni or []:
-        mid = a.get("major_id")
-        if mid is not None:
-            counts.setdefault(mid, {"students": 0, "alumni": 0})
-            counts[mid]["alumni"] += 1
-
-    counts_df = pd.DataFrame(
-        [
-            {
-                "major_id": mid,
-                "student_count": v["students"],
-                "alumni_count": v["alumni"],
-                "total": v["students"] + v["alumni"],
-            }
-            for mid, v in counts.items()
-        ]
+majors_df = api_get_df("/majors")  # expect major_id, major_name, department
+students_df = api_get_df("/students")
+alumni_df = api_get_df("/alumni")
+
+if not majors_df.empty and (not students_df.empty or not alumni_df.empty):
+    # Build counts of students and alumni per major_id
+    student_counts = students_df["major_id"].value_counts() if "major_id" in students_df.columns else pd.Series(dtype=int)
+    alumni_counts = alumni_df["major_id"].value_counts() if "major_id" in alumni_df.columns else pd.Series(dtype=int)
+
+    counts_df = (
+        pd.DataFrame({"student_count": student_counts, "alumni_count": alumni_counts})
+        .fillna(0)
+        .astype(int)
+        .rename_axis("major_id")
+        .reset_index()
     )
+    counts_df["total"] = counts_df["student_count"] + counts_df["alumni_count"]
 
     merged = majors_df.merge(counts_df, on="major_id", how="left").fillna(0)
     merged = merged.sort_values("total", ascending=False)
@@ -83,10 +83,9 @@ st.write('')
 st.write('---')
 st.write('### Locations of Users')
 
-locations = api_get("/locations", default=[])
+loc_df = api_get_df("/locations")
 
-if locations:
-    loc_df = pd.DataFrame(locations)
+if not loc_df.empty:
     st.dataframe(loc_df, use_container_width=True)
 else:
     st.info("No location data returned from /locations yet.")
@@ -3,8 +3,9 @@ logger = logging.getLogger(__name__)
 
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
+from modules import api_client
 import pandas as pd
+import pyarrow as pa
 
 st.set_page_config(layout='wide')
 
@@ -17,7 +18,7 @@ except Exception:
 
 def api_get(path, params=None, default=None):
     try:
-        r = requests.get(f"{API_BASE}{path}", params=params, timeout=5)
+        r = api_client.get(f"{API_BASE}{path}", params=params, timeout=5)
         if r.status_code == 200:
             return r.json()
         logger.info(f"GET {path} -> {r.status_code}")
@@ -25,28 +26,37 @@ def api_get(path, params=None, default=None):
         logger.info(f"GET {path} failed: {e}")
     return default
 
+def api_get_df(path, params=None):
+    # Ask for a columnar Arrow stream and read it straight into a DataFrame,
+    # which keeps date/time column types; falls back to JSON if the API can't
+    try:
+        r = api_client.get(f"{API_BASE}{path}", params=params, timeout=5,
+                         headers={"Accept": "application/vnd.apache.arrow.stream"})
+        if r.status_code == 200 and r.headers.get("Content-Type", "").startswith("application/vnd.apache.arrow.stream"):
+            return pa.ipc.open_stream(r.content).read_pandas(date_as_object=False)
+        if r.status_code in (200, 406):
+            return pd.DataFrame(api_get(path, params=params, default=[]))
+        logger.info(f"GET {path} -> {r.status_code}")
+    except Exception as e:
+        logger.info(f"GET {path} failed: {e}")
+    return pd.DataFrame()
+
 first_name = st.session_state.get('first_name', 'Data Analyst')
 st.title(f"Match & Engagement Analytics")
 st.write('')
 st.write('### Overall Connections & Session Activity')
 
 # Pull data for students, connections, and sessions
-students = api_get("/students", default=[])
-connections = api_get("/connections", default=[])
-sessions = api_get("/sessions", default=[])
+students_df = api_get_df("/students")
+conn_df = api_get_df("/connections")
+sess_df = api_get_df("/sessions")
 
-total_students = len(students) if isinstance(students, list) else 0
-total_connections = len(connections) if isinstance(connections, list) else 0
-total_sessions = len(sessions) if isinstance(sessions, list) else 0
+total_students = len(students_df)
+total_connections = len(conn_df)
+total_sessions = len(sess_df)
 
 # Compute how many unique studnets have at least one connection
-matched_students = set()
-for c in connections or []:
-    sid = c.get("student_id")
-    if sid is not None:
-        matched_students.add(sid)
-
-num_matched_students = len(matched_students)
+num_matched_students = int(conn_df["student_id"].nunique()) if "student_id" in conn_df.columns else 0
 match_rate_pct = round((num_matched_students / total_students) * 100, 1) if total_students > 0 else 0.0
 
 # Show core metrics in a grid
@@ -64,9 +74,7 @@ st.write('')
 st.write('---')
 st.write('### Session Trends')
 
-if sessions:
-    sess_df = pd.DataFrame(sessions)  
-
+if not sess_df.empty:
     if "session_date" in sess_df.columns:
         sess_df["session_date"] = pd.to_datetime(sess_df["session_date"], errors="coerce")
         sess_df["month"] = sess_df["session_date"].dt.to_period("M").astype(str)
@@ -3,8 +3,9 @@ logger = logging.getLogger(__name__)
 
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
+from modules import api_client
 import pandas as pd
+import pyarrow as pa
 
 st.set_page_config(layout='wide')
 
@@ -17,7 +18,7 @@ except Exception:
 
 def api_get(path, params=None, default=None):
     try:
-        r = requests.get(f"{API_BASE}{path}", params=params, timeout=5)
+        r = api_client.get(f"{API_BASE}{path}", params=params, timeout=5)
         if r.status_code == 200:
             return r.json()
         logger.info(f"GET {path} -> {r.status_code}")
@@ -25,19 +26,30 @@ def api_get(path, params=None, default=None):
         logger.info(f"GET {path} failed: {e}")
     return default
 
+def api_get_df(path, params=None):
+    # Ask for a columnar Arrow stream and read it straight into a DataFrame,
+    # which keeps date/time column types; falls back to JSON if the API can't
+    try:
+        r = api_client.get(f"{API_BASE}{path}", params=params, timeout=5,
+                         headers={"Accept": "application/vnd.apache.arrow.stream"})
+        if r.status_code == 200 and r.headers.get("Content-Type", "").startswith("application/vnd.apache.arrow.stream"):
+            return pa.ipc.open_stream(r.content).read_pandas(date_as_object=False)
+        if r.status_code in (200, 406):
+            return pd.DataFrame(api_get(path, params=params, default=[]))
+        logger.info(f"GET {path} -> {r.status_code}")
+    except Exception as e:
+        logger.info(f"GET {path} failed: {e}")
+    return pd.DataFrame()
+
 first_name = st.session_state.get('first_name', 'Data Analyst')
 st.title(f"Mentors & Companies Analytics")
 st.write('')
 st.write('### Alumni Mentors Supporting the Most Students')
 
 # Pull data for alumni, connections, and sessions
-alumni = api_get("/alumni", default=[])
-connections = api_get("/connections", default=[])
-sessions = api_get("/sessions", default=[])
-
-alum_df = pd.DataFrame(alumni) if alumni else pd.DataFrame()
-conn_df = pd.DataFrame(connections) if connections else pd.DataFrame()
-sess_df = pd.DataFrame(sessions) if sessions else pd.DataFrame()
+alum_df = api_get_df("/alumni")
+conn_df = api_get_df("/connections")
+sess_df = api_get_df("/sessions")
 
 if not alum_df.empty and (not conn_df.empty or not sess_df.empty):
     # count unique students per alumni_id from connections
@@ -90,9 +102,8 @@ st.write('')
 st.write('---')
 st.write('### Companies & Where Alumni Work')
 
-companies = api_get("/companies", default=[])
-if companies and not alum_df.empty:
-    comp_df = pd.DataFrame(companies)  # expect company_id, company_name, industry
+comp_df = api_get_df("/companies")  # expect company_id, company_name, industry
+if not comp_df.empty and not alum_df.empty:
 
     if "company_id" in alum_df.columns:
         comp_counts = (
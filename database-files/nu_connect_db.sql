@@ -92,6 +92,18 @@ CREATE TABLE IF NOT EXISTS connection (
    UNIQUE KEY unique_connection (student_id, alumni_id)
 );
 
+-- Connection event table (append-only log of connection status changes)
+DROP TABLE IF EXISTS connection_event;
+CREATE TABLE IF NOT EXISTS connection_event (
+   event_id INT PRIMARY KEY AUTO_INCREMENT,
+   connection_id INT NOT NULL,
+   student_id INT NOT NULL,
+   alumni_id INT NOT NULL,
+   old_status VARCHAR(20),
+   new_status VARCHAR(20) NOT NULL,
+   event_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Session table
 DROP TABLE IF EXISTS session;
 CREATE TABLE IF NOT EXISTS session (
@@ -108,6 +120,33 @@ CREATE TABLE IF NOT EXISTS session (
    FOREIGN KEY (alumni_id) REFERENCES alumni(alumni_id) ON DELETE CASCADE
 );
 
+-- Reminder outbox table (written by the session reminder scheduler)
+DROP TABLE IF EXISTS reminder_outbox;
+CREATE TABLE IF NOT EXISTS reminder_outbox (
+   outbox_id INT PRIMARY KEY AUTO_INCREMENT,
+   session_id INT NOT NULL,
+   recipient_type VARCHAR(20) NOT NULL,
+   recipient_id INT NOT NULL,
+   offset_minutes INT NOT NULL,
+   remind_at DATETIME NOT NULL,
+   message VARCHAR(300) NOT NULL,
+   status VARCHAR(20) DEFAULT 'pending',
+   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   sent_at TIMESTAMP NULL,
+   FOREIGN KEY (session_id) REFERENCES session(session_id) ON DELETE CASCADE,
+   UNIQUE KEY unique_reminder (session_id, recipient_type, offset_minutes, remind_at)
+);
+
+-- Sweeper checkpoint table (resume point for background batch jobs)
+DROP TABLE IF EXISTS sweeper_checkpoint;
+CREATE TABLE IF NOT EXISTS sweeper_checkpoint (
+   sweeper_name VARCHAR(50) PRIMARY KEY,
+   last_id INT NOT NULL DEFAULT 0,
+   rows_updated INT NOT NULL DEFAULT 0,
+   passes_completed INT NOT NULL DEFAULT 0,
+   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
 -- Application table
 DROP TABLE IF EXISTS application;
 CREATE TABLE IF NOT EXISTS application (
@@ -116,6 +155,8 @@ CREATE TABLE IF NOT EXISTS application (
    status VARCHAR(20) DEFAULT 'pending',
    submission_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
    admin_id INT,
+   claimed_by INT,
+   claim_expires_at DATETIME,
    FOREIGN KEY (student_id) REFERENCES student(student_id) ON DELETE CASCADE,
    FOREIGN KEY (admin_id) REFERENCES admin(admin_id) ON DELETE SET NULL
 );
@@ -132,6 +173,9 @@ CREATE TABLE IF NOT EXISTS report (
    status VARCHAR(20) DEFAULT 'pending',
    date_reported TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
    admin_id INT,
+   claimed_by INT,
+   claim_expires_at DATETIME,
+   cluster_id INT,
    FOREIGN KEY (admin_id) REFERENCES admin(admin_id) ON DELETE SET NULL
 );
 
@@ -157,6 +201,19 @@ CREATE TABLE IF NOT EXISTS announcement (
    FOREIGN KEY (admin_id) REFERENCES admin(admin_id) ON DELETE CASCADE
 );
 
+-- Announcement read cursor table (newest announcement each user has read)
+DROP TABLE IF EXISTS announcement_cursor;
+CREATE TABLE IF NOT EXISTS announcement_cursor (
+   user_role VARCHAR(20) NOT NULL,
+   user_id INT NOT NULL,
+   last_date_sent TIMESTAMP NOT NULL,
+   last_announcement_id INT NOT NULL,
+   read_count INT NOT NULL DEFAULT 0,
+   counted_version INT NOT NULL DEFAULT 0,
+   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+   PRIMARY KEY (user_role, user_id)
+);
+
 -- Availability Schedule table
 DROP TABLE IF EXISTS availability_schedule;
 CREATE TABLE IF NOT EXISTS availability_schedule (
@@ -178,19 +235,47 @@ CREATE TABLE IF NOT EXISTS job_posting (
    preferred_major VARCHAR(100),
    preferred_year INT,
    date_posted TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   expires_at DATETIME,
+   matched_at DATETIME,
    status VARCHAR(20) DEFAULT 'active',
    FOREIGN KEY (alumni_id) REFERENCES alumni(alumni_id) ON DELETE CASCADE
 );
 
+-- Job match inbox table (postings pushed to students whose major/year fit)
+DROP TABLE IF EXISTS job_match_inbox;
+CREATE TABLE IF NOT EXISTS job_match_inbox (
+   inbox_id INT PRIMARY KEY AUTO_INCREMENT,
+   student_id INT NOT NULL,
+   posting_id INT NOT NULL,
+   is_read BOOLEAN DEFAULT FALSE,
+   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   UNIQUE KEY uq_job_match_inbox (student_id, posting_id),
+   FOREIGN KEY (student_id) REFERENCES student(student_id) ON DELETE CASCADE,
+   FOREIGN KEY (posting_id) REFERENCES job_posting(posting_id) ON DELETE CASCADE
+);
+
 -- Create indexes for better query performance
 CREATE INDEX idx_student_email ON student(email);
 CREATE INDEX idx_alumni_email ON alumni(email);
 CREATE INDEX idx_alumni_field ON alumni(field);
 CREATE INDEX idx_connection_status ON connection(status);
+CREATE INDEX idx_connection_event_connection ON connection_event(connection_id, event_time);
+CREATE INDEX idx_connection_event_transition ON connection_event(old_status, new_status);
 CREATE INDEX idx_session_date ON session(session_date);
 CREATE INDEX idx_session_status ON session(status);
+CREATE INDEX idx_session_status_id ON session(status, session_id, session_date);
 CREATE INDEX idx_application_status ON application(status);
+CREATE INDEX idx_application_claim ON application(status, application_id, claim_expires_at);
 CREATE INDEX idx_report_status ON report(status);
+CREATE INDEX idx_report_claim ON report(status, report_id, claim_expires_at);
+CREATE INDEX idx_report_date ON report(date_reported);
+CREATE INDEX idx_report_cluster ON report(cluster_id);
+CREATE INDEX idx_job_posting_feed ON job_posting(status, date_posted, posting_id);
+CREATE INDEX idx_job_posting_status_id ON job_posting(status, posting_id, expires_at);
+CREATE INDEX idx_job_posting_unmatched ON job_posting(matched_at, status);
+CREATE INDEX idx_announcement_feed ON announcement(target_audience, date_sent);
+CREATE INDEX idx_reminder_outbox_status ON reminder_outbox(status, outbox_id);
+CREATE INDEX idx_reminder_outbox_recipient ON reminder_outbox(recipient_type, recipient_id);
 
 -- Sample data for location 
 insert into location (city, state, country) values ('Irvine', 'California', 'United States');
@@ -1026,3 +1111,14 @@ insert into session (student_id, alumni_id, session_date, session_time, topic, n
 insert into session (student_id, alumni_id, session_date, session_time, topic, notes, status, created_at) values (4, 8, '2025/11/25', '12:32', 'Resume review and career story', 'The student demonstrated a good understanding of the material we covered in our session.', 'scheduled', '2025/07/31');
 insert into session (student_id, alumni_id, session_date, session_time, topic, notes, status, created_at) values (32, 32, '2025/01/02', '16:29', 'Time management and balance', 'The student seemed engaged and interested in the topic we discussed today.', 'completed', '2025/05/25');
 insert into session (student_id, alumni_id, session_date, session_time, topic, notes, status, created_at) values (29, 39, '2025/11/25', '20:55', 'Job offer or negotiation questions', 'The student''s analysis of the session topic was thorough and well-reasoned.', 'cancelled', '2025/09/14');
+
+-- Backfill a creation event for every seeded connection
+insert into connection_event (connection_id, student_id, alumni_id, old_status, new_status, event_time)
+select connection_id, student_id, alumni_id, NULL, 'pending', date_connected from connection;
+
+-- Give postings that predate expiry a full lifetime from now, so the sweeper doesn't close them all at once
+update job_posting set expires_at = NOW() + INTERVAL 60 DAY where status = 'active' and expires_at is null;
+update job_posting set expires_at = date_posted where expires_at is null;
+
+-- Seeded postings were published before matching existed; don't notify for them
+update job_posting set matched_at = date_posted where matched_at is null;